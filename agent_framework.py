@@ -10,6 +10,20 @@ from dataclasses import dataclass
 from datetime import datetime
 import json
 
+from utils import llm_client, model_router
+from utils.model_health import FailoverModel
+from utils.concurrency import LIMITER
+from utils.prompt_prefixes import PromptPrefix
+
+# Agent names whose registry key is not the lowercased name
+AGENT_KEY_ALIASES = {'seo_optimization': 'seo_optimizer'}
+
+
+def agent_key(agent_name: str) -> str:
+    """Registry key for an agent name ('Copywriting_Agent' → 'copywriting', 'SEO_Optimization_Agent' → 'seo_optimizer')"""
+    key = agent_name.lower().replace('_agent', '')
+    return AGENT_KEY_ALIASES.get(key, key)
+
 
 @dataclass
 class AgentMessage:
@@ -91,6 +105,49 @@ class BaseAgent(ABC):
         """Log incoming message"""
         self.message_history.append(message.to_dict())
 
+    def fallback_data(self, message: AgentMessage) -> Optional[Dict[str, Any]]:
+        """
+        Response data for a task that missed its deadline (utils.deadlines)
+
+        None marks the agent as critical: its tasks are never cut short.
+        """
+        return None
+
+    def generate_json(self, prompt: str, schema_name: str, max_output_tokens: int,
+                      temperature: float, retries: int = 1, prefix: PromptPrefix = None) -> Any:
+        """
+        Call this agent's Gemini model in JSON mode and validate against a response schema
+
+        prefix carries the agent's static brand context, placed at the start of
+        the prompt so repeated calls share leading tokens (implicit caching).
+        Inside an AgentManager task the active route (utils.model_router) may
+        switch the model for this page's pattern and cap/override parameters,
+        and calls fail over along the route's fallbacks (utils.model_health).
+        Slow calls may be hedged against the agent's p95 (utils.hedging), and
+        every call waits for a slot under the adaptive limit (utils.concurrency).
+
+        Raises:
+            llm_client.StructuredOutputError: Response still invalid after a targeted retry
+        """
+        model = self.genai_model
+        route = model_router.active_route()
+        if route is not None:
+            max_output_tokens, temperature = route.apply(max_output_tokens, temperature)
+            if route.model != (self.model or model_router.DEFAULT_MODEL):
+                model = model_router.shared_model(route.model)
+            if route.fallbacks:
+                model = FailoverModel(
+                    [(route.model, model)] + [(name, model_router.shared_model(name)) for name in route.fallbacks],
+                    on_failover=LIMITER.record_error
+                )
+
+        return llm_client.generate_json(
+            model, prompt, schema_name,
+            max_output_tokens=max_output_tokens, temperature=temperature, retries=retries,
+            prefix=prefix,
+            hedge_key=route.agent if route is not None else agent_key(self.name)
+        )
+
     def create_response(self, message: AgentMessage, status: str, data: Dict[str, Any],
                        sources: List[Dict] = None, execution_time: float = 0.0,
                        confidence: float = 1.0) -> AgentResponse:
@@ -208,6 +265,7 @@ class PageOutput:
     faq_json: List[Dict[str, str]] = None
     final_cta: str = ""
     schema_markup: List[Dict[str, Any]] = None
+    related_pages: List[Dict[str, Any]] = None
 
     # Metadata
     pseo_variables: Dict[str, str] = None
@@ -217,6 +275,8 @@ class PageOutput:
     generated_at: str = None
     generation_model: str = ""
     agents_used: List[str] = None
+    token_usage: Dict[str, Any] = None  # Prompt/output tokens by agent (utils.token_accounting)
+    degraded_agents: List[str] = None  # Agents that missed their deadline and used fallback output
 
     def __post_init__(self):
         if self.generated_at is None:
@@ -235,6 +295,12 @@ class PageOutput:
             self.faq_json = []
         if self.schema_markup is None:
             self.schema_markup = []
+        if self.related_pages is None:
+            self.related_pages = []
+        if self.token_usage is None:
+            self.token_usage = {}
+        if self.degraded_agents is None:
+            self.degraded_agents = []
 
     def to_dict_public(self):
         """
@@ -254,10 +320,12 @@ class PageOutput:
             'problem_agitation': self.problem_agitation,
             'solution_overview': self.solution_overview,
             'comparison_table_json': self.comparison_table_json,
+            'comparison_competitor': self.pseo_variables.get('competitor', ''),  # Comparison table column header
             'feature_sections': self.feature_sections,
             'faq_json': self.faq_json,
             'final_cta': self.final_cta,
             'schema_markup': self.schema_markup,
+            'related_pages': self.related_pages,
             'generated_at': self.generated_at
         }
 
@@ -282,6 +350,7 @@ class PageOutput:
             'faq_json': self.faq_json,
             'final_cta': self.final_cta,
             'schema_markup': self.schema_markup,
+            'related_pages': self.related_pages,
             'generated_at': self.generated_at,
             # Internal metadata (for debugging/analytics only)
             'pseo_variables': self.pseo_variables,
@@ -289,7 +358,9 @@ class PageOutput:
             'quality_score': self.quality_score,
             'uniqueness_check': self.uniqueness_check,
             'generation_model': self.generation_model,
-            'agents_used': self.agents_used
+            'agents_used': self.agents_used,
+            'degraded_agents': self.degraded_agents,
+            'token_usage': self.token_usage
         }
 
     def to_json(self, indent=2, public_only=False):
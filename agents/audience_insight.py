@@ -172,15 +172,7 @@ class AudienceInsightAgent(ResearchAgent):
 Return ONLY valid JSON. Be specific and actionable."""
 
         try:
-            response = self.genai_model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=3000,
-                    temperature=0.7
-                )
-            )
-
-            insights = json.loads(response.text)
+            insights = self.generate_json(prompt, 'audience_insights', max_output_tokens=3000, temperature=0.7)
             print(f"  ✓ Audience insights generated for {audience}")
             print(f"    - {len(insights.get('pain_points', []))} pain points")
             print(f"    - {len(insights.get('desires', []))} desires")
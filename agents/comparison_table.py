@@ -9,10 +9,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agent_framework import BaseAgent, AgentMessage, AgentResponse
+from utils.llm_client import StructuredOutputError
 import google.generativeai as genai
 import time
 import json
-import re
 
 
 class ComparisonTableAgent(BaseAgent):
@@ -32,12 +32,6 @@ class ComparisonTableAgent(BaseAgent):
         # Load competitor knowledge base
         self.competitor_profiles = self._load_competitor_profiles()
 
-    def _strip_markdown_json(self, text: str) -> str:
-        """Strip markdown code blocks from JSON response"""
-        text = re.sub(r'^```(?:json)?\s*\n', '', text.strip(), flags=re.MULTILINE)
-        text = re.sub(r'\n```\s*$', '', text.strip(), flags=re.MULTILINE)
-        return text.strip()
-
     def _load_competitor_profiles(self) -> dict:
         """Load competitor knowledge base from config"""
         config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'competitor_profiles.json')
@@ -81,6 +75,10 @@ class ComparisonTableAgent(BaseAgent):
             confidence=0.95
         )
 
+    def fallback_data(self, message: AgentMessage) -> dict:
+        """Knowledge base comparison table when the task misses its deadline"""
+        return {'comparison_table': self._get_fallback_comparison_table(message.task.get('competitor', ''))}
+
     def _generate_comparison_table(self, pattern_id: str, competitor: str,
                                    audience: str, competitor_data: dict) -> list:
         """Generate structured comparison table using competitor research data"""
@@ -155,38 +153,22 @@ Return ONLY valid JSON array with 6-8 comparison rows. NO markdown code blocks.
 Prioritize features where Sozee has clear advantages for {audience}."""
 
         try:
-            response = self.genai_model.generate_content(
+            comparison_table = self.generate_json(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=2000,
-                    temperature=0.3  # Lower temp for factual accuracy
-                )
+                'comparison_table',
+                max_output_tokens=2000,
+                temperature=0.3  # Lower temp for factual accuracy
             )
 
-            # Strip markdown and parse JSON
-            cleaned_text = self._strip_markdown_json(response.text)
-            comparison_table = json.loads(cleaned_text)
-
-            # Validate table structure
-            if not isinstance(comparison_table, list):
-                raise ValueError("Comparison table must be an array")
-
             if len(comparison_table) < 6 or len(comparison_table) > 8:
                 print(f"  ⚠️ Comparison table has {len(comparison_table)} rows (expected 6-8)")
 
-            # Ensure all rows have required fields
-            for row in comparison_table:
-                required_fields = ['feature', 'sozee', 'competitor']
-                for field in required_fields:
-                    if field not in row:
-                        raise ValueError(f"Missing required field: {field}")
-
             print(f"  ✓ Generated comparison table with {len(comparison_table)} features")
             return comparison_table
 
-        except json.JSONDecodeError as e:
-            print(f"  ❌ JSON parsing error in comparison table: {e}")
-            print(f"  📄 Raw response (first 300 chars): {response.text[:300] if 'response' in locals() else 'No response'}")
+        except StructuredOutputError as e:
+            print(f"  ❌ {e}")
+            print(f"  📄 Raw response (first 300 chars): {e.text[:300]}")
             # Return fallback comparison table with KB data
             return self._get_fallback_comparison_table(competitor)
         except Exception as e:
@@ -9,11 +9,11 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agent_framework import ResearchAgent, AgentMessage, AgentResponse
+from utils.llm_client import StructuredOutputError
+from utils.deadlines import DeadlineExceeded
 from utils.competitor_kb import CompetitorKnowledgeBase
 import google.generativeai as genai
 import time
-import json
-import re
 
 
 class CompetitorResearchAgent(ResearchAgent):
@@ -73,6 +73,16 @@ class CompetitorResearchAgent(ResearchAgent):
         # No KB or cache - perform fresh research
         print(f"  🔍 Researching {competitor} (not in KB)...")
         research_data = self._research_competitor(competitor, audience, required_data)
+        if research_data is None:
+            # Fallback profile for this page only: never saved to the KB or cached
+            return self.create_response(
+                message,
+                status="completed",
+                data={'competitor_data': self._create_fallback_profile(competitor)},
+                sources=[],
+                execution_time=time.time() - start_time,
+                confidence=0.5
+            )
 
         # Save to Knowledge Base (structured profile)
         try:
@@ -94,14 +104,8 @@ class CompetitorResearchAgent(ResearchAgent):
             confidence=0.85
         )
 
-    def _strip_markdown_json(self, text: str) -> str:
-        """Strip markdown code blocks from JSON response"""
-        text = re.sub(r'^```(?:json)?\s*\n', '', text.strip(), flags=re.MULTILINE)
-        text = re.sub(r'\n```\s*$', '', text.strip(), flags=re.MULTILINE)
-        return text.strip()
-
     def _research_competitor(self, competitor: str, audience: str, required_data: list) -> dict:
-        """Use Gemini to research competitor and structure as KB profile"""
+        """Use Gemini to research competitor and structure as KB profile (None if research failed)"""
 
         prompt = f"""You are researching {competitor} as a competitive AI content tool.
 
@@ -154,18 +158,13 @@ If you're unsure about specific details:
 - Be honest about unknowns but provide reasonable category-level info"""
 
         try:
-            response = self.genai_model.generate_content(
+            result = self.generate_json(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=2000,
-                    temperature=0.3  # Low temp for factual accuracy
-                )
+                'competitor_profile',
+                max_output_tokens=2000,
+                temperature=0.3  # Low temp for factual accuracy
             )
 
-            # Strip markdown and parse JSON
-            cleaned_text = self._strip_markdown_json(response.text)
-            result = json.loads(cleaned_text)
-
             print(f"  ✓ Competitor research complete: {competitor}")
             print(f"    Category: {result.get('category')}")
             print(f"    NSFW Support: {result.get('features', {}).get('nsfw_support')}")
@@ -173,15 +172,17 @@ If you're unsure about specific details:
 
             return result
 
-        except json.JSONDecodeError as e:
-            print(f"  ❌ JSON parsing error for {competitor}: {e}")
-            print(f"  📄 Raw response (first 300 chars): {response.text[:300]}")
-            return self._create_fallback_profile(competitor)
+        except DeadlineExceeded:
+            raise  # Abandoned at its deadline: nothing to save or cache
+        except StructuredOutputError as e:
+            print(f"  ❌ {competitor}: {e}")
+            print(f"  📄 Raw response (first 300 chars): {e.text[:300]}")
+            return None
         except Exception as e:
             print(f"  ⚠️ Error researching {competitor}: {e}")
             import traceback
             traceback.print_exc()
-            return self._create_fallback_profile(competitor)
+            return None
 
     def _create_fallback_profile(self, competitor: str) -> dict:
         """Create minimal fallback profile if research fails"""
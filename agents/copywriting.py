@@ -9,34 +9,107 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agent_framework import BaseAgent, AgentMessage, AgentResponse
+from utils.llm_client import StructuredOutputError
+from utils.response_schemas import validate
+from utils.research_context import ResearchContext
+from utils.prompt_prefixes import PromptPrefix
 import google.generativeai as genai
 import time
 import json
-import re
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Output schema for pattern sections in combined-copy mode (one entry per section ID)
+COMBINED_SECTIONS_SCHEMA = """,
+  "pattern_sections": {
+    "<section_id>": {
+      "heading": "Section heading (8-12 words, benefit-focused)",
+      "subheading": "Optional subheading or intro (2-3 sentences)" | null,
+      "content": [
+        {
+          "item_heading": "Heading for this item" | null,
+          "item_body": "Body content for this item (markdown supported)",
+          "icon_suggestion": "icon name" | null
+        }
+      ],
+      "visual_style": "visual_style from the section requirements",
+      "cta_text": "Optional CTA text" | null
+    }
+  }"""
+
+
+# Static brand context shared by every copy prompt
+BRAND_PREFIX = PromptPrefix('copywriting-brand', """**SOZEE KEY DIFFERENTIATORS:**
+- **3 PHOTOS MINIMUM** - Instant likeness reconstruction, no training, no waiting
+- **THE CONTENT CRISIS SOLUTION** - Solves the 100:1 demand ratio (fans want 100x more content)
+- **HYPER-REALISTIC** - Indistinguishable from real photoshoots, not "AI art"
+- **TOTAL PRIVACY** - Your likeness is yours alone, isolated models never used for training
+- **INFINITE CONTENT ENGINE** - 3 photos → unlimited photos/videos forever
+- **MONETIZATION-FIRST DESIGN** - Built for creator businesses, not AI art hobbyists
+- **SFW & NSFW CAPABILITIES** - Complete creative freedom, no censorship
+- **AGENCY WORKFLOWS** - Team access, approval flows, multi-creator support
+- 1-Click TikTok Cloning (replicate viral content instantly)
+- Built specifically for OnlyFans/Fansly/FanVue creator platforms
+- No technical skills required
+- Instant custom fan request fulfillment
+
+**THE CONTENT CRISIS (Core Problem Framework):**
+Traditional creator economy: Fans demand 100 pieces of content, creators can produce 1.
+This 100:1 ratio creates burnout, unstable revenue, and business failure.
+Sozee breaks the link between physical availability and content production.
+- Traditional: 1 photoshoot → 10-20 photos
+- Sozee: 3 photos → infinite content forever
+- Result: Creators scale without burnout, agencies never run out, virtual influencers stay consistent
+
+**BRAND VOICE:**
+Direct, confident, slightly edgy. Speak to the Content Crisis and creator burnout.
+Use "you" language. Be specific with numbers (3 photos, 100:1 ratio, infinite content).
+Phrases to use: "The Content Crisis", "We multiply creators, not replace them", "Content that never dries up", "Your likeness is yours alone"
+""")
+
+SECTION_FACTS_PREFIX = PromptPrefix('copywriting-section-facts', """**SOZEE KEY FACTS:**
+- 3 photos minimum - instant likeness reconstruction (no training, no waiting)
+- Hyper-realistic AI content generation (indistinguishable from real photoshoots)
+- 1-Click TikTok Cloning (replicate viral content instantly)
+- Built specifically for OnlyFans/creator platforms
+- SFW & NSFW capabilities (complete flexibility)
+- Solves the "100:1 content crisis" (fans want 100x more content than creators can produce)
+- Total privacy - your likeness is yours alone, isolated models never used for training
+- No technical skills required
+- Pricing: Creators $15/week, Agencies $33/week""")
 
 
 class CopywritingAgent(BaseAgent):
     """Expert conversion copywriter"""
 
-    def __init__(self, viral_hooks: list, model=None):
+    # Estimated-token budgets for the research block of each prompt
+    MAIN_RESEARCH_BUDGET = 800
+    SECTION_RESEARCH_BUDGET = 400
+
+    def __init__(self, viral_hooks: list, model=None, max_concurrent_calls: int = 4,
+                 combined_copy: bool = False):
+        """
+        Args:
+            viral_hooks: Manifesto hooks to open the problem section
+            model: Gemini model name (default gemini-2.0-flash-exp)
+            max_concurrent_calls: Gemini calls in flight per page (main copy + pattern sections)
+            combined_copy: Write main copy and all pattern sections in one call, so
+                           research data and brand facts are sent once per page
+        """
         super().__init__(
             name="Copywriting_Agent",
             role="Expert Conversion Copywriter",
             model=model
         )
         self.viral_hooks = viral_hooks
+        self.max_concurrent_calls = max(1, max_concurrent_calls)
+        self.combined_copy = combined_copy
         if model:
             self.genai_model = genai.GenerativeModel(model)
         else:
             self.genai_model = genai.GenerativeModel('gemini-2.0-flash-exp')
 
-    def _strip_markdown_json(self, text: str) -> str:
-        """Strip markdown code blocks from JSON response"""
-        # Remove ```json ... ``` or ``` ... ``` blocks
-        text = re.sub(r'^```(?:json)?\s*\n', '', text.strip(), flags=re.MULTILINE)
-        text = re.sub(r'\n```\s*$', '', text.strip(), flags=re.MULTILINE)
-        return text.strip()
-
     def execute(self, message: AgentMessage) -> AgentResponse:
         """Generate compelling landing page copy"""
         start_time = time.time()
@@ -47,11 +120,12 @@ class CopywritingAgent(BaseAgent):
         blueprint = message.context.get('blueprint', {})
         research_data = message.context.get('research_data', {})
 
-        # Generate content
+        # Generate content (a speed profile may cap the pattern sections)
         content = self._generate_content(
             blueprint=blueprint,
             research_data=research_data,
-            sections=sections
+            sections=sections,
+            max_pattern_sections=task.get('max_pattern_sections')
         )
 
         execution_time = time.time() - start_time
@@ -64,8 +138,9 @@ class CopywritingAgent(BaseAgent):
             confidence=0.9
         )
 
-    def _generate_content(self, blueprint: dict, research_data: dict, sections: list) -> dict:
-        """Generate all content sections using pattern-specific templates"""
+    def _generate_content(self, blueprint: dict, research_data: dict, sections: list,
+                          max_pattern_sections: int = None) -> dict:
+        """Generate all content sections using pattern-specific templates (the first max_pattern_sections pattern sections)"""
 
         # Load pattern configuration
         pattern_config = self._load_pattern_config(blueprint.get('pattern_id'))
@@ -77,9 +152,18 @@ class CopywritingAgent(BaseAgent):
 
         # Get pattern-specific context
         pattern_angle = self._get_pattern_angle(pattern_id, variables)
+        pattern_emphasis = self._get_pattern_emphasis(blueprint.get('pattern_id'), variables)
 
-        # Generate pattern-specific sections
-        pattern_sections = self._generate_pattern_sections(pattern_id, variables, research_data, h1, pattern_config)
+        # Serialize research once; each prompt renders its own budgeted slice
+        research_context = ResearchContext(research_data)
+
+        # Pattern sections from section_templates.json (folded into the main prompt in combined mode)
+        section_configs = self._get_pattern_section_configs(pattern_id)
+        if max_pattern_sections is not None:
+            section_configs = section_configs[:max_pattern_sections]
+        combined = self.combined_copy and bool(section_configs)
+        combined_brief = self._format_combined_section_briefs(section_configs, variables) if combined else ''
+        combined_schema = COMBINED_SECTIONS_SCHEMA if combined else ''
 
         # Select viral hook
         import random
@@ -104,40 +188,13 @@ class CopywritingAgent(BaseAgent):
 (Use this as the opening sentence or headline of the problem section)
 
 **RESEARCH DATA:**
-{self._format_research_data(research_data)}
+{research_context.render(self.MAIN_RESEARCH_BUDGET, focus=pattern_angle + pattern_emphasis)}
 
 **PATTERN-SPECIFIC COPYWRITING STRATEGY:**
 {pattern_angle}
 
 For this pattern, emphasize:
-{self._get_pattern_emphasis(blueprint.get('pattern_id'), variables)}
-
-**SOZEE KEY DIFFERENTIATORS:**
-- **3 PHOTOS MINIMUM** - Instant likeness reconstruction, no training, no waiting
-- **THE CONTENT CRISIS SOLUTION** - Solves the 100:1 demand ratio (fans want 100x more content)
-- **HYPER-REALISTIC** - Indistinguishable from real photoshoots, not "AI art"
-- **TOTAL PRIVACY** - Your likeness is yours alone, isolated models never used for training
-- **INFINITE CONTENT ENGINE** - 3 photos → unlimited photos/videos forever
-- **MONETIZATION-FIRST DESIGN** - Built for creator businesses, not AI art hobbyists
-- **SFW & NSFW CAPABILITIES** - Complete creative freedom, no censorship
-- **AGENCY WORKFLOWS** - Team access, approval flows, multi-creator support
-- 1-Click TikTok Cloning (replicate viral content instantly)
-- Built specifically for OnlyFans/Fansly/FanVue creator platforms
-- No technical skills required
-- Instant custom fan request fulfillment
-
-**THE CONTENT CRISIS (Core Problem Framework):**
-Traditional creator economy: Fans demand 100 pieces of content, creators can produce 1.
-This 100:1 ratio creates burnout, unstable revenue, and business failure.
-Sozee breaks the link between physical availability and content production.
-- Traditional: 1 photoshoot → 10-20 photos
-- Sozee: 3 photos → infinite content forever
-- Result: Creators scale without burnout, agencies never run out, virtual influencers stay consistent
-
-**BRAND VOICE:**
-Direct, confident, slightly edgy. Speak to the Content Crisis and creator burnout.
-Use "you" language. Be specific with numbers (3 photos, 100:1 ratio, infinite content).
-Phrases to use: "The Content Crisis", "We multiply creators, not replace them", "Content that never dries up", "Your likeness is yours alone"
+{pattern_emphasis}
 
 **WRITING GUIDELINES:**
 - Keep paragraphs SHORT (2-4 sentences max)
@@ -146,7 +203,7 @@ Phrases to use: "The Content Crisis", "We multiply creators, not replace them",
 - Emphasize OUTCOMES over features ("scale without burnout" not "AI generation")
 - Vary sentence structure (avoid template-itis)
 - Natural keyword integration (no stuffing)
-
+{combined_brief}
 **CTAs FROM PATTERN:**
 - Primary: {pattern_config.get('primary_cta', 'Get Started Free')}
 - Secondary: {pattern_config.get('secondary_cta', 'See How It Works')}
@@ -167,23 +224,39 @@ Phrases to use: "The Content Crisis", "We multiply creators, not replace them",
     {{"title": "Feature 2", "content": "Benefit-focused description"}}
   ],
   "comparison_table": {self._get_comparison_table_instruction(blueprint.get('pattern_id'))},
-  "final_cta": "Final call to action section (reinforce pattern angle)"
+  "final_cta": "Final call to action section (reinforce pattern angle)"{combined_schema}
 }}
 
 Return ONLY valid JSON."""
 
+        if combined:
+            return self._generate_combined_content(
+                prompt, section_configs, variables, research_context, h1, viral_hook, pattern_config
+            )
+
+        # Main copy and pattern sections don't depend on each other, so they
+        # share one bounded pool instead of running back to back
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent_calls, thread_name_prefix='copywriting')
         try:
-            response = self.genai_model.generate_content(
+            # copy_context keeps the page's model route in the worker thread
+            main_future = executor.submit(
+                copy_context().run,
+                self.generate_json,
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=4000,
-                    temperature=0.8  # Higher for creative variety
-                )
+                'page_copy',
+                max_output_tokens=4000,
+                temperature=0.8,  # Higher for creative variety
+                prefix=BRAND_PREFIX
             )
+            pattern_sections = self._generate_pattern_sections(
+                pattern_id, variables, research_context, h1, pattern_config,
+                executor=executor, section_configs=section_configs
+            )
+        finally:
+            executor.shutdown(wait=False)
 
-            # Strip markdown code blocks before parsing
-            cleaned_text = self._strip_markdown_json(response.text)
-            content = json.loads(cleaned_text)
+        try:
+            content = main_future.result()
 
             # Add pattern-specific sections
             content['pattern_sections'] = pattern_sections
@@ -191,9 +264,9 @@ Return ONLY valid JSON."""
             print(f"  ✓ Content generation complete ({len(pattern_sections)} pattern-specific sections)")
             return content
 
-        except json.JSONDecodeError as e:
-            print(f"  ❌ JSON parsing error: {e}")
-            print(f"  📄 Raw response (first 500 chars): {response.text[:500]}")
+        except StructuredOutputError as e:
+            print(f"  ❌ {e}")
+            print(f"  📄 Raw response (first 500 chars): {e.text[:500]}")
             return self._create_fallback_content(h1, variables, research_data, viral_hook, pattern_config)
         except Exception as e:
             print(f"  ❌ Error generating content: {e}")
@@ -201,6 +274,85 @@ Return ONLY valid JSON."""
             traceback.print_exc()
             return self._create_fallback_content(h1, variables, research_data, viral_hook, pattern_config)
 
+    def _generate_combined_content(self, prompt: str, section_configs: list, variables: dict,
+                                   research_context: ResearchContext, h1: str, viral_hook: str,
+                                   pattern_config: dict) -> dict:
+        """
+        Generate main copy and pattern sections in a single call, then split the response
+
+        Sections missing from the response are generated individually; if the
+        call fails outright the usual fallback copy is used for the main sections.
+        """
+        content = None
+        returned_sections = {}
+
+        try:
+            content = self.generate_json(
+                prompt,
+                'combined_copy',
+                # Room for the main copy plus every section, within the model's output cap
+                max_output_tokens=min(8192, 4000 + 1000 * len(section_configs)),
+                temperature=0.8,
+                prefix=BRAND_PREFIX
+            )
+            returned_sections = content.pop('pattern_sections', None) or {}
+
+        except StructuredOutputError as e:
+            print(f"  ❌ {e}")
+            print(f"  📄 Raw response (first 500 chars): {e.text[:500]}")
+        except Exception as e:
+            print(f"  ❌ Error generating combined copy: {e}")
+            import traceback
+            traceback.print_exc()
+
+        pattern_sections = {}
+        for section_config in section_configs:
+            section_id = section_config.get('id')
+            section_content = returned_sections.get(section_id)
+            if section_content is not None and not validate('pattern_section', section_content):
+                pattern_sections[section_id] = section_content
+
+        missing = [c for c in section_configs if c.get('id') not in pattern_sections]
+        if missing:
+            print(f"  ⚠️ Combined copy missing {len(missing)} sections, generating them individually")
+            pattern_sections.update(self._generate_pattern_sections(
+                None, variables, research_context, h1, pattern_config, section_configs=missing
+            ))
+            # Restore template order
+            pattern_sections = {
+                c.get('id'): pattern_sections[c.get('id')]
+                for c in section_configs if c.get('id') in pattern_sections
+            }
+
+        if content is None:
+            content = self._create_fallback_content(
+                h1, variables, research_context.research_data, viral_hook, pattern_config
+            )
+
+        content['pattern_sections'] = pattern_sections
+        print(f"  ✓ Content generation complete (combined copy, {len(pattern_sections)} pattern-specific sections)")
+        return content
+
+    def _format_combined_section_briefs(self, section_configs: list, variables: dict) -> str:
+        """Format every pattern section's task for the combined prompt"""
+        briefs = [
+            "",
+            "**PATTERN SECTIONS TO WRITE:**",
+            "Also write each section below into \"pattern_sections\", keyed by its ID.",
+            "Pricing (if relevant): Creators $15/week, Agencies $33/week",
+        ]
+
+        for section_config in section_configs:
+            requirements = section_config.get('content_requirements', {})
+            briefs.append(f"\n### {section_config.get('name')} (ID: {section_config.get('id')})")
+            briefs.append(self._replace_variables(section_config.get('generation_prompt', ''), variables))
+            if requirements:
+                briefs.append(f"Requirements: {json.dumps(requirements)}")
+            if section_config.get('components'):
+                briefs.append(f"Components: {', '.join(section_config['components'])}")
+
+        return '\n'.join(briefs) + '\n'
+
     def _create_fallback_content(self, h1: str, variables: dict, research_data: dict, viral_hook: str, pattern_config: dict) -> dict:
         """Create improved fallback content using research data and correct H1"""
 
@@ -281,8 +433,8 @@ Sozee breaks the link between physical availability and content production. Uplo
             "final_cta": f"Ready to solve the Content Crisis? Start your free trial and see why {audience} are switching to Sozee."
         }
 
-    def _generate_pattern_sections(self, pattern_id: str, variables: dict, research_data: dict, h1: str, pattern_config: dict) -> dict:
-        """Generate pattern-specific sections based on section_templates.json"""
+    def _get_pattern_section_configs(self, pattern_id: str) -> list:
+        """Section configs from section_templates.json that this agent writes, in template order"""
 
         # Load section templates
         section_templates = self._load_section_templates()
@@ -290,13 +442,11 @@ Sozee breaks the link between physical availability and content production. Uplo
 
         if not pattern_sections_config:
             print(f"  ⚠️ No section templates found for pattern {pattern_id}")
-            return {}
-
-        sections_config = pattern_sections_config.get('sections', [])
-        generated_sections = {}
+            return []
 
-        # Generate each pattern-specific section (excluding hero, faq, final_cta which are handled elsewhere)
-        for section_config in sections_config:
+        # Pattern-specific sections only (hero, faq, final_cta are handled elsewhere)
+        to_generate = []
+        for section_config in pattern_sections_config.get('sections', []):
             section_id = section_config.get('id')
 
             # Skip sections handled by other agents or already generated
@@ -307,21 +457,61 @@ Sozee breaks the link between physical availability and content production. Uplo
             if 'generation_prompt' not in section_config:
                 continue
 
-            # Generate section content
-            section_content = self._generate_section_content(
-                section_config,
-                variables,
-                research_data,
-                pattern_config
+            to_generate.append(section_config)
+
+        return to_generate
+
+    def _generate_pattern_sections(self, pattern_id: str, variables: dict, research_data, h1: str,
+                                   pattern_config: dict, executor: ThreadPoolExecutor = None,
+                                   section_configs: list = None) -> dict:
+        """
+        Generate pattern-specific sections based on section_templates.json
+
+        Sections are requested concurrently (bounded by max_concurrent_calls, or
+        by the caller's executor) and returned in template order. research_data
+        may be raw research or a ResearchContext already built for the page.
+        """
+        research_context = ResearchContext.ensure(research_data)
+        to_generate = section_configs if section_configs is not None else self._get_pattern_section_configs(pattern_id)
+        generated_sections = {}
+
+        if not to_generate:
+            print("  ✓ Generated 0 pattern-specific sections")
+            return generated_sections
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(
+                max_workers=min(self.max_concurrent_calls, len(to_generate)),
+                thread_name_prefix='copywriting'
             )
 
-            if section_content:
-                generated_sections[section_id] = section_content
+        try:
+            futures = [
+                (section_config.get('id'), executor.submit(
+                    copy_context().run,
+                    self._generate_section_content,
+                    section_config,
+                    variables,
+                    research_context,
+                    pattern_config
+                ))
+                for section_config in to_generate
+            ]
+
+            # Collect in template order so page layout is deterministic
+            for section_id, future in futures:
+                section_content = future.result()
+                if section_content:
+                    generated_sections[section_id] = section_content
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True)
 
         print(f"  ✓ Generated {len(generated_sections)} pattern-specific sections")
         return generated_sections
 
-    def _generate_section_content(self, section_config: dict, variables: dict, research_data: dict, pattern_config: dict) -> dict:
+    def _generate_section_content(self, section_config: dict, variables: dict, research_data, pattern_config: dict) -> dict:
         """Generate content for a specific section"""
 
         section_id = section_config.get('id')
@@ -332,6 +522,9 @@ Sozee breaks the link between physical availability and content production. Uplo
 
         # Replace variables in prompts
         generation_prompt = self._replace_variables(generation_prompt, variables)
+        research_block = ResearchContext.ensure(research_data).render(
+            self.SECTION_RESEARCH_BUDGET, focus=f"{section_name} {generation_prompt}"
+        )
 
         # Build prompt for AI
         prompt = f"""You are an expert copywriter for Sozee.ai creating a specific landing page section.
@@ -351,18 +544,7 @@ Sozee breaks the link between physical availability and content production. Uplo
 {self._format_variables(variables)}
 
 **RESEARCH DATA:**
-{self._format_research_data(research_data)}
-
-**SOZEE KEY FACTS:**
-- 3 photos minimum - instant likeness reconstruction (no training, no waiting)
-- Hyper-realistic AI content generation (indistinguishable from real photoshoots)
-- 1-Click TikTok Cloning (replicate viral content instantly)
-- Built specifically for OnlyFans/creator platforms
-- SFW & NSFW capabilities (complete flexibility)
-- Solves the "100:1 content crisis" (fans want 100x more content than creators can produce)
-- Total privacy - your likeness is yours alone, isolated models never used for training
-- No technical skills required
-- Pricing: Creators $15/week, Agencies $33/week
+{research_block}
 
 **OUTPUT FORMAT (JSON):**
 {{
@@ -382,22 +564,13 @@ Sozee breaks the link between physical availability and content production. Uplo
 Return ONLY valid JSON matching this structure."""
 
         try:
-            response = self.genai_model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=2000,
-                    temperature=0.8
-                )
+            return self.generate_json(
+                prompt, 'pattern_section', max_output_tokens=2000, temperature=0.8, prefix=SECTION_FACTS_PREFIX
             )
 
-            # Strip markdown code blocks before parsing
-            cleaned_text = self._strip_markdown_json(response.text)
-            section_content = json.loads(cleaned_text)
-            return section_content
-
-        except json.JSONDecodeError as e:
-            print(f"  ❌ JSON parsing error in section {section_id}: {e}")
-            print(f"  📄 Raw response (first 300 chars): {response.text[:300]}")
+        except StructuredOutputError as e:
+            print(f"  ❌ Section {section_id}: {e}")
+            print(f"  📄 Raw response (first 300 chars): {e.text[:300]}")
             return {}
         except Exception as e:
             print(f"  ❌ Error generating section {section_id}: {e}")
@@ -451,6 +624,10 @@ Return ONLY valid JSON matching this structure."""
             print(f"  ⚠️ Could not load content templates: {e}")
         return {}
 
+    def build_h1(self, pattern_id: str, variables: dict) -> str:
+        """H1 for a page from its pattern's h1_formula (same H1 the copy prompt uses)"""
+        return self._build_h1(self._load_pattern_config(pattern_id), variables)
+
     def _build_h1(self, pattern_config: dict, variables: dict) -> str:
         """Build H1 from pattern formula"""
         h1_formula = pattern_config.get('h1_formula', 'Sozee AI Content Studio')
@@ -520,15 +697,3 @@ Return ONLY valid JSON matching this structure."""
     def _format_variables(self, variables: dict) -> str:
         """Format variables for prompt"""
         return '\n'.join([f"- {key.replace('_', ' ').title()}: {value}" for key, value in variables.items()])
-
-    def _format_research_data(self, research_data: dict) -> str:
-        """Format research data for prompt"""
-        if not research_data:
-            return "No research data available"
-
-        formatted = []
-        for agent_name, data in research_data.items():
-            formatted.append(f"\n**From {agent_name}:**")
-            formatted.append(json.dumps(data, indent=2)[:1000])
-
-        return '\n'.join(formatted)
@@ -9,9 +9,44 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agent_framework import BaseAgent, AgentMessage, AgentResponse
+from utils.prompt_prefixes import PromptPrefix
+from utils.response_schemas import validate
 import google.generativeai as genai
 import time
 import json
+import threading
+
+
+# Shared by the per-page and batched prompts
+FAQ_GUIDELINES = PromptPrefix('faq-guidelines', """**Requirements:**
+1. Questions MUST be natural language queries users would actually search
+2. Include long-tail keywords in questions
+3. Answers should be 2-3 sentences, informative and helpful
+4. Address common objections and concerns specific to this pattern
+5. Mention Sozee naturally where appropriate
+6. Be FACTUAL - don't hallucinate features or pricing
+
+**Sozee Key Facts to Reference:**
+- **Setup:** Upload 3 photos minimum - instant likeness reconstruction, NO training required
+- **Content generation:** 30 seconds per photo/video
+- **Quality:** Hyper-realistic - indistinguishable from real photoshoots
+- **Privacy:** Your likeness is yours alone - isolated models never used for training other users
+- **Content type:** SFW & NSFW full support - complete creative freedom
+- **Platform focus:** Built specifically for OnlyFans/Fansly/FanVue creator platforms
+- **Pricing:** Creators $15/week, Agencies $33/week
+- **Free trial:** Available (no credit card required)
+- **Technical skills:** None required - instant setup
+- **Special features:** 1-Click TikTok cloning, instant fan request fulfillment
+- **The Content Crisis:** Solves the 100:1 demand ratio - 3 photos → infinite content forever
+- **Volume:** Unlimited content generation from just 3 photos
+- **Consistency:** Perfect likeness consistency across all generated content
+- **Agency features:** Team access, approval workflows, multi-creator support""")
+
+# Output budget of a batched FAQ request: per-pair tokens at least the per-page call's
+# (4000 for 10 FAQs), within the model's output cap
+BATCH_MAX_OUTPUT_TOKENS = 8192
+BATCH_OVERHEAD_TOKENS = 500
+BATCH_TOKENS_PER_FAQ = 400
 
 
 class FAQGeneratorAgent(BaseAgent):
@@ -28,6 +63,10 @@ class FAQGeneratorAgent(BaseAgent):
         else:
             self.genai_model = genai.GenerativeModel('gemini-2.0-flash-exp')
 
+        # FAQs generated ahead of time by prefetch(), keyed by (pattern, variables, count)
+        self.prefetched = {}
+        self.prefetch_lock = threading.Lock()
+
     def execute(self, message: AgentMessage) -> AgentResponse:
         """Generate FAQ section"""
         start_time = time.time()
@@ -39,8 +78,14 @@ class FAQGeneratorAgent(BaseAgent):
         blueprint = message.context.get('blueprint', {})
         variables = blueprint.get('pseo_variables', {})
 
-        # Generate FAQs
-        faqs = self._generate_faqs(pattern_id, variables, count)
+        # Use FAQs from a batched prefetch if available, else generate for this page
+        with self.prefetch_lock:
+            faqs = self.prefetched.pop(self._page_key(pattern_id, variables, count), None)
+
+        if faqs is not None:
+            print(f"  ✓ Using {len(faqs)} prefetched FAQ pairs")
+        else:
+            faqs = self._generate_faqs(pattern_id, variables, count)
 
         execution_time = time.time() - start_time
 
@@ -72,29 +117,7 @@ class FAQGeneratorAgent(BaseAgent):
 **PATTERN-SPECIFIC QUESTION TYPES** (use these as templates):
 {question_types}
 
-**Requirements:**
-1. Questions MUST be natural language queries users would actually search
-2. Include long-tail keywords in questions
-3. Answers should be 2-3 sentences, informative and helpful
-4. Address common objections and concerns specific to this pattern
-5. Mention Sozee naturally where appropriate
-6. Be FACTUAL - don't hallucinate features or pricing
-
-**Sozee Key Facts to Reference:**
-- **Setup:** Upload 3 photos minimum - instant likeness reconstruction, NO training required
-- **Content generation:** 30 seconds per photo/video
-- **Quality:** Hyper-realistic - indistinguishable from real photoshoots
-- **Privacy:** Your likeness is yours alone - isolated models never used for training other users
-- **Content type:** SFW & NSFW full support - complete creative freedom
-- **Platform focus:** Built specifically for OnlyFans/Fansly/FanVue creator platforms
-- **Pricing:** Creators $15/week, Agencies $33/week
-- **Free trial:** Available (no credit card required)
-- **Technical skills:** None required - instant setup
-- **Special features:** 1-Click TikTok cloning, instant fan request fulfillment
-- **The Content Crisis:** Solves the 100:1 demand ratio - 3 photos → infinite content forever
-- **Volume:** Unlimited content generation from just 3 photos
-- **Consistency:** Perfect likeness consistency across all generated content
-- **Agency features:** Team access, approval workflows, multi-creator support
+Follow the FAQ requirements and Sozee key facts above.
 
 **Output as JSON array:**
 [
@@ -107,16 +130,14 @@ class FAQGeneratorAgent(BaseAgent):
 Return ONLY valid JSON array with exactly {count} Q&A pairs."""
 
         try:
-            response = self.genai_model.generate_content(
+            faqs = self.generate_json(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=4000,  # Increased from 2000 to support 10 FAQs
-                    temperature=0.6
-                )
+                'faqs',
+                max_output_tokens=4000,  # Increased from 2000 to support 10 FAQs
+                temperature=0.6,
+                prefix=FAQ_GUIDELINES
             )
 
-            faqs = json.loads(response.text)
-
             if len(faqs) != count:
                 print(f"  ⚠️ Expected {count} FAQs, got {len(faqs)}")
 
@@ -126,53 +147,160 @@ Return ONLY valid JSON array with exactly {count} Q&A pairs."""
         except Exception as e:
             print(f"  ⚠️ Error generating FAQs: {e}")
             # Return fallback FAQs
-            fallback_faqs = [
-                {
-                    "question": "What is Sozee?",
-                    "answer": "Sozee is the AI Content Studio for the creator economy. Upload just 3 photos and instantly generate unlimited hyper-realistic photos and videos. Built specifically for OnlyFans, Fansly, and FanVue creators."
-                },
-                {
-                    "question": "How many photos do I need to upload?",
-                    "answer": "Just 3 photos minimum. Sozee instantly reconstructs your likeness with hyper-realistic accuracy - no training, no waiting, no technical setup required."
-                },
-                {
-                    "question": "Does Sozee offer a free trial?",
-                    "answer": "Yes, Sozee offers a free trial with no credit card required. Test the instant 3-photo setup and unlimited content generation before committing to a paid plan."
-                },
-                {
-                    "question": "How realistic is Sozee-generated content?",
-                    "answer": "Sozee generates hyper-realistic content that's indistinguishable from real photoshoots. From just 3 photos, you get perfect likeness consistency across unlimited content - not \"AI art,\" but professional-grade realism."
-                },
-                {
-                    "question": "Does Sozee support NSFW content?",
-                    "answer": "Yes, Sozee fully supports both SFW and NSFW content creation, making it ideal for OnlyFans creators and adult content professionals who need unrestricted creative capabilities."
-                },
-                {
-                    "question": "How much does Sozee cost?",
-                    "answer": "Sozee offers two pricing tiers: Creators plan at $15/week and Agencies plan at $33/week. Both include unlimited content generation from just 3 photos, with instant setup and all features."
-                },
-                {
-                    "question": "Do I need technical skills to use Sozee?",
-                    "answer": "No technical skills required. Upload 3 photos and start generating instantly - no training, no setup, no waiting. Built for creators, not developers."
-                },
-                {
-                    "question": "How fast can I generate content with Sozee?",
-                    "answer": "Instant setup with just 3 photos. Then generate new photos and videos in approximately 30 seconds each. No training time, no delays - start creating content immediately."
-                },
-                {
-                    "question": "What is the Content Crisis?",
-                    "answer": "The Content Crisis is the 100:1 demand ratio - fans want 100 pieces of content, creators can produce 1. This gap causes burnout and business failure. Sozee solves it: 3 photos → infinite content forever."
-                },
-                {
-                    "question": "Is my likeness private on Sozee?",
-                    "answer": "Your likeness is yours alone. Sozee uses isolated AI models that are never used to train other users' models. Total privacy, total control - your face belongs only to you."
-                },
-                {
-                    "question": "Can I use Sozee for multiple platforms?",
-                    "answer": "Yes, Sozee-generated content can be used across all platforms including OnlyFans, Instagram, TikTok, and other creator platforms. The content is optimized for various aspect ratios and platform requirements."
-                }
-            ]
-            return fallback_faqs[:count]
+            return self._fallback_faqs(count)
+
+    def fallback_data(self, message: AgentMessage) -> dict:
+        """Fallback FAQs when the task misses its deadline"""
+        return {'faqs': self._fallback_faqs(message.task.get('count', 10))}
+
+    def _fallback_faqs(self, count: int) -> list:
+        """General Sozee FAQs (used when generation fails)"""
+        fallback_faqs = [
+            {
+                "question": "What is Sozee?",
+                "answer": "Sozee is the AI Content Studio for the creator economy. Upload just 3 photos and instantly generate unlimited hyper-realistic photos and videos. Built specifically for OnlyFans, Fansly, and FanVue creators."
+            },
+            {
+                "question": "How many photos do I need to upload?",
+                "answer": "Just 3 photos minimum. Sozee instantly reconstructs your likeness with hyper-realistic accuracy - no training, no waiting, no technical setup required."
+            },
+            {
+                "question": "Does Sozee offer a free trial?",
+                "answer": "Yes, Sozee offers a free trial with no credit card required. Test the instant 3-photo setup and unlimited content generation before committing to a paid plan."
+            },
+            {
+                "question": "How realistic is Sozee-generated content?",
+                "answer": "Sozee generates hyper-realistic content that's indistinguishable from real photoshoots. From just 3 photos, you get perfect likeness consistency across unlimited content - not \"AI art,\" but professional-grade realism."
+            },
+            {
+                "question": "Does Sozee support NSFW content?",
+                "answer": "Yes, Sozee fully supports both SFW and NSFW content creation, making it ideal for OnlyFans creators and adult content professionals who need unrestricted creative capabilities."
+            },
+            {
+                "question": "How much does Sozee cost?",
+                "answer": "Sozee offers two pricing tiers: Creators plan at $15/week and Agencies plan at $33/week. Both include unlimited content generation from just 3 photos, with instant setup and all features."
+            },
+            {
+                "question": "Do I need technical skills to use Sozee?",
+                "answer": "No technical skills required. Upload 3 photos and start generating instantly - no training, no setup, no waiting. Built for creators, not developers."
+            },
+            {
+                "question": "How fast can I generate content with Sozee?",
+                "answer": "Instant setup with just 3 photos. Then generate new photos and videos in approximately 30 seconds each. No training time, no delays - start creating content immediately."
+            },
+            {
+                "question": "What is the Content Crisis?",
+                "answer": "The Content Crisis is the 100:1 demand ratio - fans want 100 pieces of content, creators can produce 1. This gap causes burnout and business failure. Sozee solves it: 3 photos → infinite content forever."
+            },
+            {
+                "question": "Is my likeness private on Sozee?",
+                "answer": "Your likeness is yours alone. Sozee uses isolated AI models that are never used to train other users' models. Total privacy, total control - your face belongs only to you."
+            },
+            {
+                "question": "Can I use Sozee for multiple platforms?",
+                "answer": "Yes, Sozee-generated content can be used across all platforms including OnlyFans, Instagram, TikTok, and other creator platforms. The content is optimized for various aspect ratios and platform requirements."
+            }
+        ]
+        return fallback_faqs[:count]
+
+    @staticmethod
+    def max_batch_pages(count: int) -> int:
+        """Pages whose FAQs fit in one batched reply without truncation"""
+        return max(1, (BATCH_MAX_OUTPUT_TOKENS - BATCH_OVERHEAD_TOKENS) // (BATCH_TOKENS_PER_FAQ * count))
+
+    def prefetch(self, pattern_id: str, variables_list: list, count: int) -> int:
+        """
+        Generate FAQs for several pages of one pattern in as few requests as fit
+
+        Pages are split into requests of at most max_batch_pages(count) pages.
+        Results are held until execute() runs for each page. Pages whose slice
+        is missing or malformed are not cached and fall back to a per-page call.
+
+        Args:
+            pattern_id: Pattern shared by all pages
+            variables_list: pseo_variables for each page
+            count: FAQs per page
+
+        Returns:
+            Number of pages cached
+        """
+        pattern_id = str(pattern_id)
+        with self.prefetch_lock:
+            pending = [v for v in variables_list if self._page_key(pattern_id, v, count) not in self.prefetched]
+        if not pending:
+            return 0
+
+        size = self.max_batch_pages(count)
+        return sum(self._prefetch_batch(pattern_id, pending[start:start + size], count)
+                   for start in range(0, len(pending), size))
+
+    def _prefetch_batch(self, pattern_id: str, pending: list, count: int) -> int:
+        """One batched FAQ request for pages that fit in a single reply; returns pages cached"""
+        page_ids = [f"page_{i + 1}" for i in range(len(pending))]
+        page_briefs = []
+        for page_id, variables in zip(page_ids, pending):
+            page_briefs.append(f"""### {page_id}
+**Page Context**: {self._get_pattern_context(pattern_id, variables)}
+**Variables**: {json.dumps(variables)}
+**Question types** (use these as templates):
+{self._get_pattern_question_types(pattern_id, variables)}""")
+
+        briefs = '\n\n'.join(page_briefs)
+        prompt = f"""You are creating FAQ content for {len(pending)} Sozee landing pages (Pattern {pattern_id}).
+
+**Task**: For EACH page below, create {count} frequently asked questions and answers specific to that page.
+Follow the FAQ requirements and Sozee key facts above.
+
+**PAGES:**
+
+{briefs}
+
+**Output as a JSON object keyed by page id:**
+{{
+  "page_1": [
+    {{
+      "question": "Natural question with keywords?",
+      "answer": "Helpful 2-3 sentence answer mentioning Sozee."
+    }}
+  ]
+}}
+
+Return ONLY a valid JSON object with exactly {count} Q&A pairs for each of: {', '.join(page_ids)}."""
+
+        try:
+            # No whole-batch retry: bad slices fall back to per-page calls
+            batch = self.generate_json(
+                prompt,
+                'faq_batch',
+                max_output_tokens=min(BATCH_MAX_OUTPUT_TOKENS,
+                                      BATCH_TOKENS_PER_FAQ * count * len(pending) + BATCH_OVERHEAD_TOKENS),
+                temperature=0.6,
+                retries=0,
+                prefix=FAQ_GUIDELINES
+            )
+        except Exception as e:
+            print(f"  ⚠️ Batched FAQ generation failed, pages will generate individually: {e}")
+            return 0
+
+        cached = 0
+        with self.prefetch_lock:
+            for page_id, variables in zip(page_ids, pending):
+                faqs = batch.get(page_id)
+                if faqs is not None and not validate('faqs', faqs):
+                    self.prefetched[self._page_key(pattern_id, variables, count)] = faqs[:count]
+                    cached += 1
+
+        print(f"  ✓ Prefetched FAQs for {cached}/{len(pending)} pattern {pattern_id} pages in one request")
+        return cached
+
+    def is_prefetched(self, pattern_id: str, variables: dict, count: int) -> bool:
+        """Whether FAQs for this page are already cached"""
+        with self.prefetch_lock:
+            return self._page_key(pattern_id, variables, count) in self.prefetched
+
+    def _page_key(self, pattern_id: str, variables: dict, count: int) -> tuple:
+        """Cache key for a page's FAQs"""
+        return (str(pattern_id), json.dumps(variables, sort_keys=True), count)
 
     def _get_pattern_context(self, pattern_id: str, variables: dict) -> str:
         """Generate context description for pattern"""
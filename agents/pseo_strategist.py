@@ -9,7 +9,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agent_framework import BaseAgent, AgentMessage, AgentResponse, ContentBlueprint
-from typing import Dict, Any
+from typing import Dict
 import time
 
 
@@ -80,15 +80,15 @@ class PSEOStrategistAgent(BaseAgent):
         # Build page ID
         page_id = self._build_page_id(pattern_id, variables)
 
-        # Determine required agents
-        required_agents = self._get_required_agents(pattern_id, generation_model)
-
         # Define sections needed
         sections_needed = self._get_sections_for_pattern(pattern_id)
 
         # Identify research requirements
         research_requirements = self._get_research_needs(pattern_id, variables)
 
+        # Determine required agents
+        required_agents = self._get_required_agents(pattern_id, research_requirements)
+
         # Determine priority
         priority = pattern.get('priority', 'MEDIUM')
 
@@ -118,38 +118,14 @@ class PSEOStrategistAgent(BaseAgent):
         # Default
         return ('top', 'Model 1')
 
-    def _get_required_agents(self, pattern_id: str, generation_model: str) -> list:
-        """Determine which agents are needed"""
+    def _get_required_agents(self, pattern_id: str, research_requirements: list) -> list:
+        """Determine which agents are needed (the agents of the page's task list)"""
 
         agents = ['PSEO_Strategist_Agent']  # Always include self
 
-        if generation_model == 'Model 2':
-            # Research-intensive patterns
-            if pattern_id in ['1', '4']:  # Comparison, Alternative
-                agents.extend([
-                    'Competitor_Research_Agent',
-                    'Audience_Insight_Agent',
-                    'Copywriting_Agent',
-                    'FAQ_Generator_Agent',
-                    'SEO_Optimization_Agent',
-                    'Quality_Control_Agent'
-                ])
-            elif pattern_id == '6':  # Content Crisis
-                agents.extend([
-                    'Market_Statistics_Agent',
-                    'Audience_Insight_Agent',
-                    'Copywriting_Agent',
-                    'FAQ_Generator_Agent',
-                    'SEO_Optimization_Agent',
-                    'Quality_Control_Agent'
-                ])
-        else:
-            # Model 1 - simpler generation
-            agents.extend([
-                'Copywriting_Agent',
-                'FAQ_Generator_Agent',
-                'SEO_Optimization_Agent'
-            ])
+        for task in self._build_tasks(pattern_id, research_requirements, {}, []):
+            if task['agent'] not in agents:
+                agents.append(task['agent'])
 
         return agents
 
@@ -235,16 +211,31 @@ class PSEOStrategistAgent(BaseAgent):
 
     def _create_agent_tasks(self, blueprint: ContentBlueprint, variables: Dict) -> list:
         """Create task list for each agent"""
+        return self._build_tasks(blueprint.pattern_id, blueprint.research_requirements,
+                                 variables, blueprint.sections_needed, blueprint.pattern_name)
+
+    def _build_tasks(self, pattern_id: str, research_requirements: list, variables: Dict,
+                     sections: list, pattern_name: str = '') -> list:
+        """
+        Agent tasks in execution order
+
+        'stage' groups the tasks the orchestrator runs together: research
+        (parallel), content, supplementary (parallel, after content), schema
+        (after FAQ and metadata) and review. Params the orchestrator only
+        knows at run time (H1, FAQs, page data) are filled in by it.
+        """
 
         tasks = []
 
-        for research_req in blueprint.research_requirements:
+        for research_req in research_requirements:
             if research_req['type'] == 'competitor_analysis':
                 tasks.append({
                     'agent': 'Competitor_Research_Agent',
                     'action': 'research_competitor',
+                    'stage': 'research',
                     'params': {
                         'competitor': research_req['target'],
+                        'audience': variables.get('audience', ''),
                         'required_data': research_req['required_data']
                     },
                     'priority': 'high',
@@ -255,6 +246,7 @@ class PSEOStrategistAgent(BaseAgent):
                 tasks.append({
                     'agent': 'Audience_Insight_Agent',
                     'action': 'research_audience',
+                    'stage': 'research',
                     'params': {
                         'audience': research_req['target'],
                         'required_data': research_req['required_data']
@@ -263,12 +255,29 @@ class PSEOStrategistAgent(BaseAgent):
                     'parallel': True
                 })
 
+        # Statistics back up any research (market statistics for Pattern 6)
+        if research_requirements:
+            tasks.append({
+                'agent': 'Statistics_Agent',
+                'action': 'research_statistics',
+                'stage': 'research',
+                'params': {
+                    'pattern_id': pattern_id,
+                    'topic': pattern_name,
+                    'audience': variables.get('audience', 'creators'),
+                    'platform': variables.get('platform', 'social media')
+                },
+                'priority': 'medium',
+                'parallel': True
+            })
+
         # Copywriting task (sequential, after research)
         tasks.append({
             'agent': 'Copywriting_Agent',
             'action': 'generate_content',
+            'stage': 'content',
             'params': {
-                'sections': blueprint.sections_needed,
+                'sections': sections,
                 'variables': variables
             },
             'priority': 'high',
@@ -276,12 +285,13 @@ class PSEOStrategistAgent(BaseAgent):
             'depends_on': ['research_complete']
         })
 
-        # FAQ and SEO can run in parallel after copywriting
+        # FAQ, SEO and comparison table can run in parallel after copywriting
         tasks.append({
             'agent': 'FAQ_Generator_Agent',
             'action': 'generate_faqs',
+            'stage': 'supplementary',
             'params': {
-                'pattern_id': blueprint.pattern_id,
+                'pattern_id': pattern_id,
                 'count': 5
             },
             'priority': 'medium',
@@ -291,18 +301,48 @@ class PSEOStrategistAgent(BaseAgent):
         tasks.append({
             'agent': 'SEO_Optimization_Agent',
             'action': 'generate_metadata',
+            'stage': 'supplementary',
             'params': {
                 'h1': '',  # Will be filled by orchestrator
-                'pattern_id': blueprint.pattern_id
+                'pattern_id': pattern_id
             },
             'priority': 'medium',
             'parallel': True
         })
 
+        # Comparison, Alternative
+        if pattern_id in ['1', '4']:
+            tasks.append({
+                'agent': 'Comparison_Table_Agent',
+                'action': 'generate_comparison_table',
+                'stage': 'supplementary',
+                'params': {
+                    'pattern_id': pattern_id,
+                    'competitor': variables.get('competitor', ''),
+                    'audience': variables.get('audience', 'creators')
+                },
+                'priority': 'high',
+                'parallel': True
+            })
+
+        # Schema markup needs the FAQs and metadata
+        tasks.append({
+            'agent': 'Schema_Markup_Agent',
+            'action': 'generate_schemas',
+            'stage': 'schema',
+            'params': {
+                'pattern_id': pattern_id  # page_data, faqs and meta filled by orchestrator
+            },
+            'priority': 'medium',
+            'parallel': False,
+            'depends_on': ['supplementary_complete']
+        })
+
         # Final QC
         tasks.append({
             'agent': 'Quality_Control_Agent',
             'action': 'review_page',
+            'stage': 'review',
             'params': {},
             'priority': 'high',
             'parallel': False,
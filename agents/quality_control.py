@@ -15,6 +15,32 @@ import json
 import re
 
 
+# SEO metadata length rules (inclusive), shared with SEOOptimizationAgent
+META_TITLE_LENGTH = (50, 60)
+META_DESCRIPTION_LENGTH = (150, 160)
+
+
+def check_meta_lengths(metadata: dict) -> list:
+    """
+    Check meta_title / meta_description against the QC length and brand rules
+
+    Returns:
+        List of problems (empty if the metadata is in spec)
+    """
+    problems = []
+    meta_title = metadata.get('meta_title') or ''
+    meta_desc = metadata.get('meta_description') or ''
+
+    if not META_TITLE_LENGTH[0] <= len(meta_title) <= META_TITLE_LENGTH[1]:
+        problems.append(f"meta_title is {len(meta_title)} chars (should be {META_TITLE_LENGTH[0]}-{META_TITLE_LENGTH[1]})")
+    if 'Sozee' not in meta_title:
+        problems.append("meta_title missing 'Sozee'")
+    if not META_DESCRIPTION_LENGTH[0] <= len(meta_desc) <= META_DESCRIPTION_LENGTH[1]:
+        problems.append(f"meta_description is {len(meta_desc)} chars (should be {META_DESCRIPTION_LENGTH[0]}-{META_DESCRIPTION_LENGTH[1]})")
+
+    return problems
+
+
 class QualityControlAgent(BaseAgent):
     """Content quality assurance specialist"""
 
@@ -107,8 +133,8 @@ class QualityControlAgent(BaseAgent):
         if not meta_title:
             errors.append("Missing meta_title")
             score -= 0.3
-        elif len(meta_title) < 50 or len(meta_title) > 60:
-            warnings.append(f"Meta title length {len(meta_title)} chars (should be 50-60)")
+        elif not META_TITLE_LENGTH[0] <= len(meta_title) <= META_TITLE_LENGTH[1]:
+            warnings.append(f"Meta title length {len(meta_title)} chars (should be {META_TITLE_LENGTH[0]}-{META_TITLE_LENGTH[1]})")
             score -= 0.1
         if meta_title and 'Sozee' not in meta_title:
             warnings.append("Meta title missing 'Sozee' brand mention")
@@ -118,8 +144,8 @@ class QualityControlAgent(BaseAgent):
         if not meta_desc:
             errors.append("Missing meta_description")
             score -= 0.3
-        elif len(meta_desc) < 150 or len(meta_desc) > 160:
-            warnings.append(f"Meta description length {len(meta_desc)} chars (should be 150-160)")
+        elif not META_DESCRIPTION_LENGTH[0] <= len(meta_desc) <= META_DESCRIPTION_LENGTH[1]:
+            warnings.append(f"Meta description length {len(meta_desc)} chars (should be {META_DESCRIPTION_LENGTH[0]}-{META_DESCRIPTION_LENGTH[1]})")
             score -= 0.1
 
         # URL slug validation
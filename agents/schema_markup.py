@@ -66,6 +66,10 @@ class SchemaMarkupAgent(BaseAgent):
             confidence=0.95
         )
 
+    def fallback_data(self, message: AgentMessage) -> dict:
+        """Organization schema only when the task misses its deadline"""
+        return {'schemas': [self._get_organization_schema()]}
+
     def _generate_schemas(self, pattern_id: str, page_data: dict,
                          faqs: list, meta: dict) -> list:
         """Generate all appropriate schema types for this page"""
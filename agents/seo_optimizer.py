@@ -9,10 +9,40 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agent_framework import BaseAgent, AgentMessage, AgentResponse
+from agents.quality_control import check_meta_lengths
+from utils.llm_client import StructuredOutputError
+from utils.response_schemas import validate
+from utils.prompt_prefixes import PromptPrefix
 import google.generativeai as genai
 import time
 import json
-import re
+import threading
+
+
+# Rules shared by the per-page and batched prompts
+SEO_RULES = PromptPrefix('seo-rules', """**CRITICAL Requirements (for EVERY page):**
+1. **meta_title**: EXACTLY 50-60 characters (count carefully!)
+   - Must include "Sozee"
+   - Include primary keyword naturally
+   - Compelling for click-through
+   - Front-load important keywords
+
+2. **meta_description**: EXACTLY 150-160 characters (count carefully!)
+   - Include main benefit or hook
+   - Natural keyword integration
+   - Must include CTA phrase (e.g., "Start free trial", "Compare features", "Learn more")
+   - Make it click-worthy
+
+3. **focus_keyword**: Primary keyword phrase from H1
+
+**SEO Best Practices:**
+- Front-load important keywords in both title and description
+- Include target audience/competitor naturally
+- Create urgency or curiosity in description
+- Match page intent (comparison, review, alternative, etc.)
+- Avoid keyword stuffing - keep natural
+- Include power words: "best", "vs", "alternative", "review", "solution"
+""")
 
 
 class SEOOptimizationAgent(BaseAgent):
@@ -29,11 +59,9 @@ class SEOOptimizationAgent(BaseAgent):
         else:
             self.genai_model = genai.GenerativeModel('gemini-2.0-flash-exp')
 
-    def _strip_markdown_json(self, text: str) -> str:
-        """Strip markdown code blocks from JSON response"""
-        text = re.sub(r'^```(?:json)?\s*\n', '', text.strip(), flags=re.MULTILINE)
-        text = re.sub(r'\n```\s*$', '', text.strip(), flags=re.MULTILINE)
-        return text.strip()
+        # Metadata generated ahead of time by prefetch(), keyed by (pattern, variables)
+        self.prefetched = {}
+        self.prefetch_lock = threading.Lock()
 
     def execute(self, message: AgentMessage) -> AgentResponse:
         """Generate SEO metadata"""
@@ -45,8 +73,14 @@ class SEOOptimizationAgent(BaseAgent):
         pattern_id = task.get('pattern_id', '')
         variables = message.context.get('pseo_variables', {})
 
-        # Generate metadata
-        metadata = self._generate_metadata(h1, pattern_id, variables)
+        # Use metadata from a batched prefetch if available, else generate for this page
+        with self.prefetch_lock:
+            metadata = self.prefetched.pop(self._page_key(pattern_id, variables), None)
+
+        if metadata is not None:
+            print("  ✓ Using prefetched SEO metadata")
+        else:
+            metadata = self._generate_metadata(h1, pattern_id, variables)
 
         execution_time = time.time() - start_time
 
@@ -58,6 +92,12 @@ class SEOOptimizationAgent(BaseAgent):
             confidence=0.95
         )
 
+    def fallback_data(self, message: AgentMessage) -> dict:
+        """Pattern-specific fallback metadata when the task misses its deadline"""
+        return self._create_fallback_metadata(
+            message.task.get('h1', ''), message.task.get('pattern_id', ''), message.context.get('pseo_variables', {})
+        )
+
     def _generate_metadata(self, h1: str, pattern_id: str, variables: dict) -> dict:
         """Generate meta title and description with pattern-specific guidance"""
 
@@ -70,32 +110,11 @@ class SEOOptimizationAgent(BaseAgent):
 **Pattern**: {pattern_id}
 **Variables**: {json.dumps(variables)}
 
-**CRITICAL Requirements:**
-1. **meta_title**: EXACTLY 50-60 characters (count carefully!)
-   - Must include "Sozee"
-   - Include primary keyword naturally
-   - Compelling for click-through
-   - Front-load important keywords
-
-2. **meta_description**: EXACTLY 150-160 characters (count carefully!)
-   - Include main benefit or hook
-   - Natural keyword integration
-   - Must include CTA phrase (e.g., "Start free trial", "Compare features", "Learn more")
-   - Make it click-worthy
-
-3. **focus_keyword**: Primary keyword phrase from H1
+Follow the SEO requirements and best practices above.
 
 **PATTERN-SPECIFIC GUIDANCE:**
 {pattern_examples}
 
-**SEO Best Practices:**
-- Front-load important keywords in both title and description
-- Include target audience/competitor naturally
-- Create urgency or curiosity in description
-- Match page intent (comparison, review, alternative, etc.)
-- Avoid keyword stuffing - keep natural
-- Include power words: "best", "vs", "alternative", "review", "solution"
-
 **Output as JSON:**
 {{
   "meta_title": "Exact 50-60 char title with Sozee",
@@ -107,30 +126,20 @@ CRITICAL: Count characters! Titles must be 50-60 chars, descriptions 150-160 cha
 Return ONLY valid JSON."""
 
         try:
-            response = self.genai_model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=500,
-                    temperature=0.5
-                )
+            metadata = self.generate_json(
+                prompt, 'seo_metadata', max_output_tokens=500, temperature=0.5, prefix=SEO_RULES
             )
 
-            # Strip markdown code blocks before parsing
-            cleaned_text = self._strip_markdown_json(response.text)
-            metadata = json.loads(cleaned_text)
-
-            # Validate character counts
-            if len(metadata['meta_title']) < 50 or len(metadata['meta_title']) > 60:
-                print(f"  ⚠️ Meta title length: {len(metadata['meta_title'])} (should be 50-60)")
-            if len(metadata['meta_description']) < 150 or len(metadata['meta_description']) > 160:
-                print(f"  ⚠️ Meta description length: {len(metadata['meta_description'])} (should be 150-160)")
+            # Validate character counts (same rules as Quality Control)
+            for problem in check_meta_lengths(metadata):
+                print(f"  ⚠️ {problem}")
 
             print(f"  ✓ SEO metadata generated")
             return metadata
 
-        except json.JSONDecodeError as e:
-            print(f"  ❌ SEO JSON parsing error: {e}")
-            print(f"  📄 Raw response (first 300 chars): {response.text[:300]}")
+        except StructuredOutputError as e:
+            print(f"  ❌ {e}")
+            print(f"  📄 Raw response (first 300 chars): {e.text[:300]}")
             return self._create_fallback_metadata(h1, pattern_id, variables)
         except Exception as e:
             print(f"  ❌ Error generating SEO metadata: {e}")
@@ -138,6 +147,134 @@ Return ONLY valid JSON."""
             traceback.print_exc()
             return self._create_fallback_metadata(h1, pattern_id, variables)
 
+    def prefetch(self, items: list, batch_size: int = 25, max_rounds: int = 3) -> int:
+        """
+        Generate metadata for many pages with a few batched calls
+
+        Each item is validated against the Quality Control length rules; only
+        out-of-spec items are re-requested (with their problems as feedback).
+        Items still out of spec after max_rounds keep their closest attempt;
+        items with no usable attempt are left to the per-page call.
+
+        Args:
+            items: Dicts with 'h1', 'pattern_id' and 'variables'
+            batch_size: Items per request
+            max_rounds: Request rounds (1 initial + re-requests)
+
+        Returns:
+            Number of pages cached
+        """
+        with self.prefetch_lock:
+            pending = {
+                f"item_{i + 1}": item for i, item in enumerate(items)
+                if self._page_key(item['pattern_id'], item['variables']) not in self.prefetched
+            }
+        if not pending:
+            return 0
+
+        accepted = {}
+        closest = {}
+        feedback = {}
+        calls = 0
+
+        for _ in range(max_rounds):
+            if not pending:
+                break
+            item_ids = list(pending)
+            for start in range(0, len(item_ids), batch_size):
+                chunk = {item_id: pending[item_id] for item_id in item_ids[start:start + batch_size]}
+                calls += 1
+                for item_id, metadata in self._request_metadata_batch(chunk, feedback).items():
+                    problems = check_meta_lengths(metadata)
+                    if problems:
+                        closest[item_id] = metadata
+                        feedback[item_id] = problems
+                    else:
+                        accepted[item_id] = metadata
+                        pending.pop(item_id)
+
+        out_of_spec = [item_id for item_id in pending if item_id in closest]
+        for item_id in out_of_spec:
+            accepted[item_id] = closest[item_id]
+
+        with self.prefetch_lock:
+            for item_id, metadata in accepted.items():
+                item = items[int(item_id.split('_')[1]) - 1]
+                self.prefetched[self._page_key(item['pattern_id'], item['variables'])] = metadata
+
+        print(f"  ✓ Prefetched SEO metadata for {len(accepted)}/{len(items)} pages in {calls} requests"
+              + (f" ({len(out_of_spec)} still out of spec)" if out_of_spec else ""))
+        return len(accepted)
+
+    def _request_metadata_batch(self, chunk: dict, feedback: dict) -> dict:
+        """One structured call for several pages; returns item_id → metadata for well-formed items"""
+        pattern_ids = sorted({str(item['pattern_id']) for item in chunk.values()})
+        guidance = '\n\n'.join(self._get_pattern_meta_examples(pid, {}) for pid in pattern_ids)
+
+        page_briefs = []
+        for item_id, item in chunk.items():
+            brief = f"""### {item_id}
+**H1**: {item['h1']}
+**Pattern**: {item['pattern_id']}
+**Variables**: {json.dumps(item['variables'])}"""
+            if item_id in feedback:
+                brief += f"\n**Previous attempt was out of spec**: {'; '.join(feedback[item_id])}"
+            page_briefs.append(brief)
+
+        briefs = '\n\n'.join(page_briefs)
+        prompt = f"""You are an SEO expert creating metadata for {len(chunk)} Sozee landing pages.
+
+Follow the SEO requirements and best practices above for EVERY page.
+
+**PATTERN-SPECIFIC GUIDANCE** (fill placeholders with each page's variables):
+{guidance}
+
+**PAGES:**
+
+{briefs}
+
+**Output as a JSON object keyed by page id:**
+{{
+  "item_1": {{
+    "meta_title": "Exact 50-60 char title with Sozee",
+    "meta_description": "Exact 150-160 char description with benefit and CTA",
+    "focus_keyword": "primary keyword phrase"
+  }}
+}}
+
+CRITICAL: Count characters! Titles must be 50-60 chars, descriptions 150-160 chars.
+Return ONLY a valid JSON object with an entry for each of: {', '.join(chunk)}."""
+
+        try:
+            # No whole-batch retry: malformed items are re-requested by prefetch()
+            batch = self.generate_json(
+                prompt,
+                'seo_metadata_batch',
+                max_output_tokens=min(8192, 150 * len(chunk) + 200),
+                temperature=0.5,
+                retries=0,
+                prefix=SEO_RULES
+            )
+        except Exception as e:
+            print(f"  ⚠️ Batched SEO metadata request failed: {e}")
+            return {}
+
+        results = {}
+        for item_id in chunk:
+            metadata = batch.get(item_id)
+            if metadata is not None and not validate('seo_metadata', metadata):
+                results[item_id] = {field: metadata[field] for field in ('meta_title', 'meta_description', 'focus_keyword')}
+        return results
+
+    def is_prefetched(self, pattern_id: str, variables: dict) -> bool:
+        """Whether metadata for this page is already cached"""
+        with self.prefetch_lock:
+            return self._page_key(pattern_id, variables) in self.prefetched
+
+    def _page_key(self, pattern_id: str, variables: dict) -> tuple:
+        """Cache key for a page's metadata"""
+        return (str(pattern_id), json.dumps(variables, sort_keys=True))
+
     def _create_fallback_metadata(self, h1: str, pattern_id: str, variables: dict) -> dict:
         """Create pattern-specific fallback metadata"""
         competitor = variables.get('competitor', '')
@@ -21,6 +21,8 @@ Features:
 - Checkpoint system (saves every 10 pages)
 - Resume from interruption
 - Failed task logging
+- Per-page and per-agent deadlines (fallback output for non-critical agents)
+- Speed profiles: which agents run and how many pattern sections per funnel stage
 - CSV and JSON export
 - Variable combination generation
 
@@ -36,15 +38,51 @@ Usage:
 
     # Resume from checkpoint
     python batch_generator.py --phase week_2 --start-index 10
+
+    # Estimate calls, tokens, time and cost before committing to a phase (no API calls)
+    python batch_generator.py --phase week_4_6 --plan --workers 8
+
+    # Overnight: stop starting pages at $20 or 06:30, resume from the checkpoint next time
+    python batch_generator.py --phase week_4_6 --workers 8 --max-cost 20 --deadline 06:30 --yes
+
+    # Mid/top-funnel pages without research and with one pattern section (config/speed_profiles.json)
+    python batch_generator.py --phase week_4_6 --profile fast --plan
+
+    # Generate 8 pages at a time; Gemini concurrency adapts to the sustainable rate and each
+    # agent runs at most its agent_limits tasks at once (config/model_routing.json)
+    python batch_generator.py --phase week_3 --workers 8
+
+    # Stream one JSON record per page to stdout (progress goes to stderr)
+    python batch_generator.py --phase week_1 --jsonl | jq -c '{url_slug, meta_title}'
 """
 
 import asyncio
 import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
 import pandas as pd
 from typing import List, Dict
 from datetime import datetime
 import argparse
 from pseo_orchestrator import PSEOOrchestrator
+from agents.faq_generator import FAQGeneratorAgent
+from utils.html_renderer import StaticSiteRenderer
+from utils.sitemap import SitemapGenerator
+from utils.link_graph import LinkGraphBuilder
+from utils.wordpress_publisher import WordPressPublisher
+from utils.jsonl_stream import JSONLStream
+from utils.model_health import HEALTH
+from utils.hedging import HEDGER
+from utils.concurrency import LIMITER
+from utils.api_key_pool import KEY_POOL, load_api_keys
+from utils.call_scheduler import SCHEDULER
+from utils import token_accounting
+from utils.token_accounting import USAGE, PriceTable
+from utils.batch_planner import BatchPlanner, checkpoint_index, print_plan
+from utils.budget import BatchBudget, parse_deadline
+from utils.speed_profiles import SpeedProfile
 import os
 from dotenv import load_dotenv
 
@@ -86,6 +124,11 @@ PATTERN_DEFINITIONS = {
     }
 }
 
+# Page score = pattern priority weight + mean tier weight of the page's variables
+# (variables only listed under 'all' in config/variables.json count as low)
+PRIORITY_WEIGHTS = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+TIER_WEIGHTS = {"high_priority": 3, "medium_priority": 2, "low_priority": 1}
+
 # Phased Rollout Schedule
 ROLLOUT_PHASES = {
     "week_1": {
@@ -145,19 +188,33 @@ class PSEOMatrixGenerator:
             with open(config_path, 'r') as f:
                 variables_config = json.load(f)
 
+        categories = {
+            "competitor": 'competitors',
+            "platform": 'platforms',
+            "audience": 'audiences',
+            "use_case": 'use_cases',
+            "tool_type": 'tool_types'
+        }
+
         # Extract 'all' lists from each variable category in config
         self.variables = {
-            "competitor": variables_config.get('competitors', {}).get('all', []),
-            "platform": variables_config.get('platforms', {}).get('all', []),
-            "audience": variables_config.get('audiences', {}).get('all', []),
-            "use_case": variables_config.get('use_cases', {}).get('all', []),
-            "tool_type": variables_config.get('tool_types', {}).get('all', []),
+            **{var: variables_config.get(category, {}).get('all', []) for var, category in categories.items()},
             # Note: pain_points not in variables.json, keeping minimal default
             "pain_point": [
                 "Creator Burnout", "Content Bottleneck", "Revenue Instability"
             ]
         }
 
+        # Tier weight of each variable value (a value listed in several tiers gets the highest)
+        self.tiers = {
+            var: {
+                value: weight
+                for tier, weight in sorted(TIER_WEIGHTS.items(), key=lambda item: item[1])
+                for value in variables_config.get(category, {}).get(tier, [])
+            }
+            for var, category in categories.items()
+        }
+
         # Validate that we loaded variables successfully
         if not self.variables.get("competitor"):
             print("⚠️ Warning: No competitors loaded from config")
@@ -240,6 +297,26 @@ class PSEOMatrixGenerator:
 
         return combos
 
+    def score_page(self, row: Dict) -> float:
+        """Value of a page: pattern priority weight + mean tier weight of its variables"""
+        pattern = PATTERN_DEFINITIONS.get(str(row.get('pattern_id')), {})
+        score = PRIORITY_WEIGHTS.get(row.get('priority') or pattern.get('priority'), 1)
+        tier_weights = [
+            self.tiers.get(var, {}).get(row.get(var), TIER_WEIGHTS['low_priority'])
+            for var in pattern.get('variables', [])
+        ]
+        if tier_weights:
+            score += sum(tier_weights) / len(tier_weights)
+        return score
+
+    def prioritize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Highest-value pages first (stable, so equal scores keep matrix order)"""
+        if df.empty:
+            return df
+        scores = pd.Series([self.score_page(row) for row in df.to_dict('records')], index=df.index)
+        order = scores.sort_values(ascending=False, kind='mergesort').index
+        return df.loc[order].reset_index(drop=True)
+
     def filter_matrix(
         self,
         df: pd.DataFrame,
@@ -272,6 +349,9 @@ class PSEOMatrixGenerator:
                 mask |= combo_mask
             filtered = filtered[mask]
 
+        # Highest-value pages first, so limits, budgets and interruptions keep the pages that matter most
+        filtered = self.prioritize(filtered)
+
         # Apply limit
         if limit and len(filtered) > limit:
             filtered = filtered.head(limit)
@@ -283,10 +363,38 @@ class PSEOMatrixGenerator:
 class BatchProcessor:
     """Processes batches of PSEO pages with progress tracking and error handling"""
 
-    def __init__(self, orchestrator: PSEOOrchestrator, output_dir: str = "output"):
+    def __init__(self, orchestrator: PSEOOrchestrator, output_dir: str = "output",
+                 publisher: WordPressPublisher = None, stream: JSONLStream = None,
+                 faq_batch_size: int = 0, seo_batch_size: int = 0, workers: int = 1,
+                 prices: PriceTable = None, budget: BatchBudget = None):
         self.orchestrator = orchestrator
         self.output_dir = output_dir
+        # Optional publisher: pages are streamed to WordPress as they complete
+        self.publisher = publisher
+        # Optional JSONL stream: one record per completed page for downstream pipes
+        self.stream = stream
+        # Pages of the same pattern whose FAQs are generated in one request (0/1 = per page)
+        self.faq_batch_size = faq_batch_size
+        self.faq_prefetch_attempted = set()
+        # Pages per batched SEO metadata request, prefetched for the whole run (0 = per page)
+        self.seo_batch_size = seo_batch_size
+        # Pages generated concurrently (Gemini calls are still bounded by the adaptive LIMITER)
+        self.workers = workers
+        self.prefetch_lock = threading.Lock()
+        # Token usage per page (PageOutput.token_usage) and the price table for token_usage.json
+        self.page_usage = {}
+        # Pages assembled with fallback output from agents that missed their deadline
+        self.degraded_pages = []
+        self.prices = prices or PriceTable.load()
+        # Optional token/cost/deadline limits checked before each page is started
+        self.budget = budget
+        self.page_seconds = {}
         self.checkpoint_file = f"{output_dir}/checkpoint.json"
+        self.token_usage_file = f"{output_dir}/token_usage.json"
+        self.link_index_file = f"{output_dir}/link_index.json"
+
+        # Link graph nodes for pages generated in this run (page_id → pattern, variables, slug, title)
+        self.link_nodes = {}
 
         os.makedirs(output_dir, exist_ok=True)
 
@@ -303,55 +411,162 @@ class BatchProcessor:
         print(f"   Total tasks: {len(tasks_df)}")
         print(f"   Starting at index: {start_index}")
         print(f"   Save checkpoint every: {save_every} pages")
+        if self.workers > 1:
+            print(f"   Page workers: {self.workers}")
+        if self.budget and self.budget.enabled:
+            limits = self.budget.snapshot()
+            print(f"   Budget: {limits['max_tokens'] or '-'} tokens, "
+                  f"${limits['max_cost_usd'] or '-'}, deadline {limits['deadline'] or '-'}")
         print(f"{'='*80}\n")
 
-        generated_pages = []
         failed_tasks = []
+        # Matrix index → public page dict (None when the page failed), filled as pages complete
+        results = {}
+
+        # Pages are started in matrix order but handled as they complete: saved, published and
+        # streamed without waiting on slower pages ahead of them. The returned list (link graph,
+        # CSV) keeps matrix order and checkpoints only cover the completed prefix. With a budget,
+        # each page is admitted only when the projected spend allows (a couple of pages per worker
+        # queued ahead); without one every page is queued up front.
+        executor = None
+        if self.workers > 1:
+            executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='page')
+        budgeted = self.budget is not None and self.budget.enabled
+        window = self.workers * 2 if executor and budgeted else (len(tasks_df) if executor else 1)
+        futures = {}
+        next_index = start_index
+        completed_until = start_index
+        seo_prefetched_until = start_index
+
+        def prefetch_metadata(idx):
+            """SEO metadata for the next seo_batch_size pages, once the first of them is admitted"""
+            nonlocal seo_prefetched_until
+            if self.seo_batch_size <= 0 or idx < seo_prefetched_until:
+                return
+            seo_prefetched_until = min(idx + self.seo_batch_size, len(tasks_df))
+            print(f"🏷️  Prefetching SEO metadata for pages {idx + 1}-{seo_prefetched_until}...")
+            self.orchestrator.prefetch_metadata(
+                [
+                    {'pattern_id': tasks_df.iloc[i]['pattern_id'], 'variables': self._row_variables(tasks_df.iloc[i])}
+                    for i in range(idx, seo_prefetched_until)
+                ],
+                batch_size=self.seo_batch_size
+            )
+
+        def start_pages():
+            nonlocal next_index
+            while next_index < len(tasks_df) and len(futures) < window:
+                if budgeted and not self.budget.admit(in_flight=len(futures)):
+                    return
+                prefetch_metadata(next_index)
+                print(f"\n[{next_index + 1}/{len(tasks_df)}] Processing task...")
+                futures[next_index] = (
+                    executor.submit(copy_context().run, self._generate_page, tasks_df, next_index)
+                    if executor else None
+                )
+                next_index += 1
 
-        for idx in range(start_index, len(tasks_df)):
+        def finish_page(idx, future):
             row = tasks_df.iloc[idx]
 
-            print(f"\n[{idx + 1}/{len(tasks_df)}] Processing task...")
-
             # Create variables dict
-            variables = {k: v for k, v in row.items() if k not in ['pattern_id', 'priority']}
+            variables = self._row_variables(row)
 
             try:
                 # Generate page
-                page = self.orchestrator.generate_page(
-                    pattern_id=row['pattern_id'],
-                    variables=variables
-                )
+                page = future.result() if future else self._generate_page(tasks_df, idx)
 
                 # Convert to dict (use public export - excludes internal metadata)
                 page_dict = page.to_dict_public()
-                generated_pages.append(page_dict)
+                results[idx] = page_dict
+
+                # Public export drops pseo_variables, so keep them for the link graph
+                self.link_nodes[page.page_id] = {
+                    'pattern_id': page.pattern_id,
+                    'pseo_variables': page.pseo_variables,
+                    'url_slug': page.url_slug,
+                    'title': page.post_title
+                }
+                self.page_usage[page.page_id] = {'pattern_id': page.pattern_id, **page.token_usage}
+                if page.degraded_agents:
+                    self.degraded_pages.append({
+                        "index": idx,
+                        "page_id": page.page_id,
+                        "pattern_id": page.pattern_id,
+                        "variables": variables,
+                        "degraded_agents": page.degraded_agents
+                    })
+                if self.budget:
+                    total = page.token_usage.get('total', {})
+                    self.budget.page_finished(
+                        tokens=total.get('prompt_tokens', 0) + total.get('output_tokens', 0),
+                        cost_usd=USAGE.cost_for(self.prices, page.page_id),
+                        seconds=self.page_seconds.pop(idx, 0.0)
+                    )
 
                 # Save individual page
                 page_file = f"{self.output_dir}/page_{page.page_id}.json"
                 with open(page_file, 'w') as f:
                     json.dump(page_dict, f, indent=2)
 
-                # Checkpoint progress
-                if (idx + 1) % save_every == 0:
-                    self._save_checkpoint(idx + 1, generated_pages)
-                    print(f"\n💾 Checkpoint saved at index {idx + 1}")
+                # Publish while the next page generates
+                if self.publisher:
+                    self.publisher.submit(page_dict)
+
+                if self.stream:
+                    self.stream.write(page_dict)
 
             except Exception as e:
-                print(f"\n❌ Failed to generate page: {str(e)}")
+                print(f"\n❌ Failed to generate page {idx + 1}: {str(e)}")
                 import traceback
                 traceback.print_exc()
 
+                results[idx] = None
                 failed_tasks.append({
                     "index": idx,
                     "pattern_id": row['pattern_id'],
                     "variables": variables,
                     "error": str(e)
                 })
-                continue
 
-        # Final save
-        self._save_checkpoint(len(tasks_df), generated_pages)
+        while True:
+            start_pages()
+            if not futures:
+                break
+
+            if executor:
+                done, _ = wait(futures.values(), return_when=FIRST_COMPLETED)
+                finished = sorted(idx for idx, future in futures.items() if future in done)
+            else:
+                finished = [next(iter(futures))]
+            for idx in finished:
+                finish_page(idx, futures.pop(idx))
+
+            # Checkpoint progress (only the prefix with every page handled)
+            checkpoint_due = False
+            while completed_until in results:
+                completed_until += 1
+                checkpoint_due = checkpoint_due or completed_until % save_every == 0
+            if checkpoint_due:
+                self._save_checkpoint(completed_until, [p for p in results.values() if p])
+                print(f"\n💾 Checkpoint saved at index {completed_until}")
+
+        if executor:
+            executor.shutdown(wait=True)
+
+        generated_pages = [results[idx] for idx in sorted(results) if results[idx] is not None]
+        failed_tasks.sort(key=lambda task: task['index'])
+        self.degraded_pages.sort(key=lambda page: page['index'])
+
+        end_index = next_index
+        if end_index < len(tasks_df):
+            # Not admitted: in-flight pages are done, the rest stays after the checkpoint
+            print(f"\n⏸️  Stopped admitting pages ({self.budget.stop_reason})")
+            print(f"   {len(tasks_df) - end_index} tasks left; resume with --start-index {end_index}")
+
+        # Final save (a budget stop leaves the unadmitted tasks after the checkpoint)
+        self._save_checkpoint(end_index, generated_pages)
+        self._save_token_usage()
 
         # Save failed tasks log
         if failed_tasks:
@@ -359,8 +574,126 @@ class BatchProcessor:
                 json.dump(failed_tasks, f, indent=2)
             print(f"\n⚠️ {len(failed_tasks)} tasks failed. See failed_tasks.json")
 
+        # Pages that met their deadline with fallback output (candidates for regeneration)
+        if self.degraded_pages:
+            with open(f"{self.output_dir}/degraded_pages.json", 'w') as f:
+                json.dump(self.degraded_pages, f, indent=2)
+            print(f"\n⏱️ {len(self.degraded_pages)} pages used fallback output. See degraded_pages.json")
+
         return generated_pages
 
+    def _generate_page(self, tasks_df: pd.DataFrame, idx: int):
+        """Generate one matrix row (FAQ prefetch first when batching FAQs)"""
+        row = tasks_df.iloc[idx]
+        started = time.time()
+        if self.faq_batch_size > 1:
+            with self.prefetch_lock:
+                self._prefetch_faqs(tasks_df, idx)
+        page = self.orchestrator.generate_page(
+            pattern_id=row['pattern_id'],
+            variables=self._row_variables(row)
+        )
+        self.page_seconds[idx] = time.time() - started
+        return page
+
+    def _prefetch_faqs(self, tasks_df: pd.DataFrame, idx: int):
+        """Batch FAQ generation for this page and the next pending pages of its pattern"""
+        row = tasks_df.iloc[idx]
+        pattern_id = row['pattern_id']
+
+        if idx in self.faq_prefetch_attempted:
+            return
+        if self.orchestrator.has_prefetched_faqs(pattern_id, self._row_variables(row)):
+            return
+
+        group = []
+        for next_idx in range(idx, len(tasks_df)):
+            next_row = tasks_df.iloc[next_idx]
+            if next_row['pattern_id'] != pattern_id or next_idx in self.faq_prefetch_attempted:
+                continue
+            group.append(next_idx)
+            if len(group) == self.faq_batch_size:
+                break
+
+        # Don't retry a group that failed; those pages generate FAQs individually
+        self.faq_prefetch_attempted.update(group)
+        if len(group) > 1:
+            print(f"\n❓ Prefetching FAQs for {len(group)} pattern {pattern_id} pages...")
+            self.orchestrator.prefetch_faqs(
+                pattern_id,
+                [self._row_variables(tasks_df.iloc[i]) for i in group]
+            )
+
+    def _row_variables(self, row: pd.Series) -> Dict:
+        """Page variables from a matrix row (columns of other patterns are NaN and dropped)"""
+        return {k: v for k, v in row.items() if k not in ['pattern_id', 'priority'] and not pd.isna(v)}
+
+    def build_link_graph(self, pages: List[Dict], top_k: int = 5) -> Dict[str, List[Dict]]:
+        """
+        Compute related-page links and write them into page output.
+
+        Nodes from earlier runs are kept in link_index.json so new pages can link
+        to (and be linked from) previously published pages. Pages from this run
+        get related_pages set in-place; earlier page files are rewritten only if
+        their related links changed.
+        """
+        nodes = {}
+        if os.path.exists(self.link_index_file):
+            with open(self.link_index_file, 'r') as f:
+                nodes = json.load(f)
+        nodes.update(self.link_nodes)
+
+        builder = LinkGraphBuilder(top_k=top_k)
+        for page_id, node in nodes.items():
+            builder.add_page(page_id, node['pattern_id'], node['pseo_variables'],
+                             node['url_slug'], node.get('title', ''))
+        graph = builder.build()
+
+        # Current run: update in-memory dicts and their page files
+        current_ids = set()
+        for page in pages:
+            current_ids.add(page['page_id'])
+            page['related_pages'] = graph.get(page['page_id'], [])
+            with open(f"{self.output_dir}/page_{page['page_id']}.json", 'w') as f:
+                json.dump(page, f, indent=2)
+
+        # Earlier runs: only rewrite files whose links changed
+        updated = 0
+        for page_id in nodes:
+            page_file = f"{self.output_dir}/page_{page_id}.json"
+            if page_id in current_ids or not os.path.exists(page_file):
+                continue
+            with open(page_file, 'r') as f:
+                existing = json.load(f)
+            if existing.get('related_pages') != graph.get(page_id, []):
+                existing['related_pages'] = graph.get(page_id, [])
+                with open(page_file, 'w') as f:
+                    json.dump(existing, f, indent=2)
+                updated += 1
+
+        with open(self.link_index_file, 'w') as f:
+            json.dump(nodes, f)
+
+        print(f"\n🔗 Related links written: {len(pages)} new pages, {updated} earlier pages updated")
+        return graph
+
+    def _save_token_usage(self):
+        """Write tokens and cost by agent, pattern and model, plus each page's breakdown"""
+        report = {
+            'generated_at': datetime.now().isoformat(),
+            'by_agent': USAGE.totals('agent'),
+            'by_pattern': USAGE.totals('pattern_id'),
+            'by_model': USAGE.totals('model'),
+            'cost_usd': {
+                'by_agent': USAGE.cost(self.prices, 'agent'),
+                'by_model': USAGE.cost(self.prices, 'model'),
+                'total': sum(USAGE.cost(self.prices, 'model').values())
+            },
+            'pages': self.page_usage
+        }
+        with open(self.token_usage_file, 'w') as f:
+            json.dump(report, f, indent=2)
+
     def _save_checkpoint(self, last_index: int, pages: List[Dict]):
         """Save progress checkpoint"""
         checkpoint = {
@@ -368,6 +701,8 @@ class BatchProcessor:
             "timestamp": datetime.now().isoformat(),
             "pages_generated": len(pages)
         }
+        if self.budget and self.budget.stop_reason:
+            checkpoint["budget"] = self.budget.snapshot()
 
         with open(self.checkpoint_file, 'w') as f:
             json.dump(checkpoint, f, indent=2)
@@ -409,6 +744,7 @@ class BatchProcessor:
                 "comparison_table_json": json.dumps(page.get("comparison_table_json", [])),
                 "feature_sections_json": json.dumps(page.get("feature_sections", [])),
                 "schema_markup_json": json.dumps(page.get("schema_markup", [])),
+                "related_pages_json": json.dumps(page.get("related_pages", [])),
                 "final_cta": page["final_cta"],
                 "generated_at": page["generated_at"]
             }
@@ -423,19 +759,57 @@ class BatchProcessor:
         return csv_path
 
 
-def main():
-    """Main execution function"""
+def select_tasks(matrix_gen: PSEOMatrixGenerator, args) -> pd.DataFrame:
+    """Task matrix for the requested phase/patterns/limit"""
+    print("\n📊 Generating PSEO matrix...")
 
-    parser = argparse.ArgumentParser(description="PSEO Batch Generator")
-    parser.add_argument("--phase", choices=["week_1", "week_2", "week_3", "week_4_6", "all"],
-                       default="week_1", help="Rollout phase")
-    parser.add_argument("--pattern", nargs="+", help="Specific patterns to generate")
-    parser.add_argument("--limit", type=int, help="Limit number of pages")
-    parser.add_argument("--start-index", type=int, default=0, help="Start from index (resume)")
-    parser.add_argument("--save-every", type=int, default=10, help="Save checkpoint every N pages")
-    parser.add_argument("--output-dir", default="output", help="Output directory")
+    if args.phase == "all":
+        # Generate all patterns, highest-value pages first
+        return matrix_gen.prioritize(matrix_gen.generate_matrix())
+
+    # Use phase configuration
+    phase_config = ROLLOUT_PHASES[args.phase]
+    patterns = args.pattern if args.pattern else phase_config["patterns"]
+
+    # Generate and filter
+    full_matrix = matrix_gen.generate_matrix(patterns=patterns)
+    return matrix_gen.filter_matrix(
+        full_matrix,
+        patterns=patterns,
+        priority=phase_config.get("priority_filter"),
+        limit=args.limit or phase_config.get("limit"),
+        specific_combos=phase_config.get("specific_combos")
+    )
 
-    args = parser.parse_args()
+
+def plan_batch(args, patterns_data: Dict, variables_data: Dict):
+    """--plan: estimate calls, tokens, time and cost for the batch without calling the API"""
+    tasks_df = select_tasks(PSEOMatrixGenerator(variables_config=variables_data), args)
+    start_index = args.start_index or checkpoint_index(args.output_dir)
+    planner = BatchPlanner(
+        patterns_data,
+        prices=PriceTable.load(args.pricing),
+        telemetry_path=os.path.join(args.output_dir, 'token_usage.json'),
+        combined_copy=args.combined_copy,
+        faq_batch_size=args.faq_batch_size,
+        seo_batch_size=args.seo_batch_size,
+        workers=args.workers,
+        max_llm_concurrency=args.max_llm_concurrency,
+        profile=SpeedProfile.load(args.profile)
+    )
+    plan = planner.plan(tasks_df, start_index=start_index)
+    print_plan(plan)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    plan_path = os.path.join(args.output_dir, 'plan.json')
+    with open(plan_path, 'w') as f:
+        json.dump(plan, f, indent=2)
+    print(f"📝 Plan saved to {plan_path}")
+    return plan
+
+
+def run(args, stream: JSONLStream = None):
+    """Run the batch described by the parsed command line"""
 
     print("""
     ╔═══════════════════════════════════════════════════════════════╗
@@ -465,16 +839,24 @@ def main():
             # Use manifesto_hooks (brand-specific), NOT generic hooks
             viral_hooks = hooks_data.get('manifesto_hooks', [])
 
+    if args.plan:
+        plan_batch(args, patterns_data, variables_data)
+        return
+
     # Create orchestrator config
+    api_keys = load_api_keys()
     config = {
         'pattern_library': patterns_data,
         'variables': variables_data,
         'viral_hooks': viral_hooks,
-        'gemini_api_key': os.environ.get('GEMINI_API_KEY')
+        'gemini_api_key': api_keys[0] if api_keys else None,
+        'gemini_api_keys': api_keys,
+        'combined_copy': args.combined_copy,
+        'speed_profile': args.profile
     }
 
     if not config['gemini_api_key']:
-        print("❌ Error: GEMINI_API_KEY not found in environment")
+        print("❌ Error: GEMINI_API_KEY (or GEMINI_API_KEYS) not found in environment")
         print("   Please set it in .env file or export it")
         return
 
@@ -482,39 +864,87 @@ def main():
     print("🔧 Initializing orchestrator...")
     orchestrator = PSEOOrchestrator(config)
 
+    max_faq_pages = FAQGeneratorAgent.max_batch_pages(orchestrator.faq_count)
+    if args.faq_batch_size > max_faq_pages:
+        print(f"⚠️ --faq-batch-size {args.faq_batch_size}: only {max_faq_pages} pages of {orchestrator.faq_count} "
+              f"FAQs fit in one reply; larger groups are split into several requests")
+
+    if args.max_llm_concurrency:
+        LIMITER.configure(max_limit=args.max_llm_concurrency)
+
+    if args.page_deadline:
+        orchestrator.agent_manager.router.deadlines['page_seconds'] = args.page_deadline
+
+    if args.hedge:
+        HEDGER.configure(enabled=True, max_hedge_rate=args.hedge_rate)
+
+    # WordPress publisher (pooled session, batched upserts keyed by url_slug)
+    publisher = None
+    if args.publish:
+        wp_url = os.environ.get('WP_URL')
+        wp_username = os.environ.get('WP_USERNAME')
+        wp_app_password = os.environ.get('WP_APP_PASSWORD')
+        if not (wp_url and wp_username and wp_app_password):
+            print("❌ Error: --publish requires WP_URL, WP_USERNAME and WP_APP_PASSWORD in environment")
+            return
+        publisher = WordPressPublisher(
+            base_url=wp_url,
+            username=wp_username,
+            app_password=wp_app_password,
+            renderer=StaticSiteRenderer(patterns_data, base_url=args.site_url),
+            status=args.publish_status,
+            batch_size=args.publish_batch_size,
+            max_concurrency=args.publish_concurrency
+        )
+
     # Initialize generators (pass variables_data to avoid duplication)
     matrix_gen = PSEOMatrixGenerator(variables_config=variables_data)
-    processor = BatchProcessor(orchestrator, output_dir=args.output_dir)
+    # Related links are computed after the batch, so publish afterwards when --link-graph is set
+    processor = BatchProcessor(
+        orchestrator,
+        output_dir=args.output_dir,
+        publisher=publisher if not args.link_graph else None,
+        stream=stream,
+        faq_batch_size=args.faq_batch_size,
+        seo_batch_size=args.seo_batch_size,
+        workers=args.workers,
+        prices=PriceTable.load(args.pricing)
+    )
 
     # Check for checkpoint
     start_index = args.start_index
     if start_index == 0:
         checkpoint_index = processor.load_checkpoint()
         if checkpoint_index > 0:
-            resume = input(f"Resume from checkpoint index {checkpoint_index}? (y/n): ")
+            resume = 'y' if args.yes else input(f"Resume from checkpoint index {checkpoint_index}? (y/n): ")
             if resume.lower() == 'y':
                 start_index = checkpoint_index
 
-    # Generate matrix
-    print("\n📊 Generating PSEO matrix...")
-
-    if args.phase == "all":
-        # Generate all patterns
-        full_matrix = matrix_gen.generate_matrix()
-        tasks_df = full_matrix
-    else:
-        # Use phase configuration
-        phase_config = ROLLOUT_PHASES[args.phase]
-        patterns = args.pattern if args.pattern else phase_config["patterns"]
-
-        # Generate and filter
-        full_matrix = matrix_gen.generate_matrix(patterns=patterns)
-        tasks_df = matrix_gen.filter_matrix(
-            full_matrix,
-            patterns=patterns,
-            priority=phase_config.get("priority_filter"),
-            limit=args.limit or phase_config.get("limit"),
-            specific_combos=phase_config.get("specific_combos")
+    tasks_df = select_tasks(matrix_gen, args)
+
+    # Budget: the dry-run plan's per-page estimate stands in until the first page finishes
+    if args.max_tokens is not None or args.max_cost is not None or args.deadline:
+        plan = BatchPlanner(
+            patterns_data, prices=processor.prices,
+            telemetry_path=processor.token_usage_file,
+            combined_copy=args.combined_copy,
+            faq_batch_size=args.faq_batch_size,
+            seo_batch_size=args.seo_batch_size,
+            workers=args.workers,
+            max_llm_concurrency=args.max_llm_concurrency,
+            profile=orchestrator.profile
+        ).plan(tasks_df, start_index=start_index)
+        pages = max(plan['pages'], 1)
+        processor.budget = BatchBudget(
+            max_tokens=args.max_tokens,
+            max_cost_usd=args.max_cost,
+            deadline=parse_deadline(args.deadline) if args.deadline else None,
+            prices=processor.prices,
+            estimate={
+                'tokens': (plan['totals']['prompt_tokens'] + plan['totals']['output_tokens']) / pages,
+                'cost_usd': plan['totals']['cost_usd'] / pages,
+                'seconds': plan['totals']['seconds'] / pages
+            }
         )
 
     print(f"\n✓ Tasks to process: {len(tasks_df)}")
@@ -529,7 +959,7 @@ def main():
             print(f"  {i + 1}. Pattern {row['pattern_id']}: {vars_str}")
 
     # Confirm before proceeding
-    proceed = input("\nProceed with generation? (y/n): ")
+    proceed = 'y' if args.yes else input("\nProceed with generation? (y/n): ")
     if proceed.lower() != 'y':
         print("Cancelled.")
         return
@@ -545,10 +975,41 @@ def main():
 
     execution_time = (datetime.now() - start_time).total_seconds()
 
+    # Internal linking (before export so CSV/HTML include related pages)
+    if args.link_graph and generated_pages:
+        processor.build_link_graph(generated_pages, top_k=args.related_pages)
+
     # Save to CSV
     csv_filename = f"sozee_landing_pages_{args.phase}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     csv_path = processor.save_to_csv(generated_pages, csv_filename)
 
+    # Render static HTML site tree
+    site_dir = None
+    if args.render_site and generated_pages:
+        site_dir = os.path.join(args.output_dir, 'site')
+        print(f"\n🖨️  Rendering static HTML to {site_dir}...")
+        renderer = StaticSiteRenderer(patterns_data, site_dir=site_dir, base_url=args.site_url)
+        renderer.render_site(generated_pages)
+
+    # Update sitemaps with this run's pages only (unchanged shards are left alone)
+    if args.sitemap and generated_pages:
+        sitemap_dir = os.path.join(args.output_dir, 'site')
+        print(f"\n🗺️  Updating sitemaps in {sitemap_dir}...")
+        SitemapGenerator(sitemap_dir, base_url=args.site_url).update(generated_pages)
+
+    # Finish publishing (streamed pages are already in flight)
+    publish_results = None
+    if publisher:
+        if args.link_graph:
+            for page in generated_pages:
+                publisher.submit(page)
+        print("\n📤 Finishing WordPress publish...")
+        publish_results = publisher.close()
+        if publish_results['failed']:
+            with open(f"{args.output_dir}/failed_publish.json", 'w') as f:
+                json.dump(publish_results['failed'], f, indent=2)
+            print(f"⚠️ {len(publish_results['failed'])} pages failed to publish. See failed_publish.json")
+
     # Print summary
     print(f"\n{'='*80}")
     print(f"✅ Batch Complete")
@@ -559,9 +1020,112 @@ def main():
         print(f"  Average time per page: {execution_time / len(generated_pages):.1f}s")
     print(f"  Output CSV: {csv_path}")
     print(f"  Individual JSON files: {args.output_dir}/")
-    print(f"\n🚀 Ready for WordPress import!")
+    if site_dir:
+        print(f"  Static HTML site: {site_dir}/")
+    if publish_results:
+        print(f"  WordPress: {publish_results['created']} created, {publish_results['updated']} updated")
+    else:
+        print("\n🚀 Ready for WordPress import!")
+    if stream:
+        print(f"  JSONL records streamed: {stream.records}")
+    for model, stats in HEALTH.snapshot().items():
+        if stats['failures']:
+            print(f"  Model {model}: {stats['failures']}/{stats['calls']} calls failed "
+                  f"({stats['rate_limited']} rate-limited), {stats['trips']} failover windows")
+    for label, stats in (KEY_POOL.snapshot().items() if KEY_POOL.size > 1 else []):
+        print(f"  API {label}: {stats['calls']} calls, {stats['rate_limited']} rate-limited")
+    limiter = LIMITER.snapshot()
+    print(f"  LLM concurrency limit: {limiter['limit']} (peak {limiter['peak_limit']}, "
+          f"{limiter['decreases']} cuts over {limiter['calls']} calls)")
+    if processor.degraded_pages:
+        print(f"  Pages with fallback output (missed deadline): {len(processor.degraded_pages)}")
+    for agent, stats in SCHEDULER.snapshot().items():
+        if stats['waited']:
+            print(f"  Agent {agent}: {stats['waited']}/{stats['tasks']} tasks queued "
+                  f"(avg {stats['avg_wait_seconds']:.1f}s, limit {stats['limit']})")
+    hedges = HEDGER.snapshot()
+    if hedges['hedged']:
+        print(f"  Hedged calls: {hedges['hedged']}/{hedges['calls']} ({hedges['hedge_wins']} won by the hedge)")
+    if processor.budget and processor.budget.stop_reason:
+        print(f"  ⏸️  Stopped early ({processor.budget.stop_reason}); resume to continue")
+    token_accounting.print_summary(prices=processor.prices, pages=len(generated_pages))
+    print(f"  Token usage by agent, pattern and page: {processor.token_usage_file}")
     print(f"{'='*80}\n")
 
 
+def main():
+    """Main execution function"""
+
+    parser = argparse.ArgumentParser(description="PSEO Batch Generator")
+    parser.add_argument("--phase", choices=["week_1", "week_2", "week_3", "week_4_6", "all"],
+                       default="week_1", help="Rollout phase")
+    parser.add_argument("--pattern", nargs="+", help="Specific patterns to generate")
+    parser.add_argument("--limit", type=int, help="Limit number of pages")
+    parser.add_argument("--start-index", type=int, default=0, help="Start from index (resume)")
+    parser.add_argument("--save-every", type=int, default=10, help="Save checkpoint every N pages")
+    parser.add_argument("--output-dir", default="output", help="Output directory")
+    parser.add_argument("--link-graph", action="store_true",
+                       help="Compute related-page links and write them into page output")
+    parser.add_argument("--related-pages", type=int, default=5,
+                       help="Related pages per page for --link-graph")
+    parser.add_argument("--render-site", action="store_true",
+                       help="Render generated pages to static HTML in {output-dir}/site")
+    parser.add_argument("--sitemap", action="store_true",
+                       help="Incrementally update sharded sitemaps in {output-dir}/site")
+    parser.add_argument("--site-url", default="https://sozee.ai",
+                       help="Public site URL used for canonical links and JSON-LD")
+    parser.add_argument("--publish", action="store_true",
+                       help="Publish pages to WordPress (WP_URL, WP_USERNAME, WP_APP_PASSWORD)")
+    parser.add_argument("--publish-status", default="draft", help="WordPress post status for published pages")
+    parser.add_argument("--publish-concurrency", type=int, default=4, help="WordPress batch requests in flight")
+    parser.add_argument("--publish-batch-size", type=int, default=10, help="Pages per WordPress batch request")
+    parser.add_argument("--combined-copy", action="store_true",
+                       help="Write main copy and all pattern sections in one Gemini call per page")
+    parser.add_argument("--faq-batch-size", type=int, default=0,
+                       help="Generate FAQs for up to N pages of the same pattern in one request (0 = per page)")
+    parser.add_argument("--seo-batch-size", type=int, default=0,
+                       help="Prefetch SEO metadata in one request per N pages, as pages are admitted (0 = per page)")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Fire a duplicate Gemini call when a call outlives its agent's p95 latency")
+    parser.add_argument("--hedge-rate", type=float, default=None,
+                        help="Max fraction of calls that may be hedged (default from config/model_routing.json)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Pages generated concurrently (Gemini calls adapt to the sustainable rate)")
+    parser.add_argument("--max-llm-concurrency", type=int, default=None,
+                        help="Upper bound for the adaptive Gemini concurrency limit")
+    parser.add_argument("--pricing", default=token_accounting.DEFAULT_PRICING_PATH,
+                        help="Price table (USD per million tokens per model) for the token/cost summary")
+    parser.add_argument("--profile", choices=["fast", "balanced", "quality"], default=None,
+                        help="Speed profile: agents and pattern sections per funnel stage, and acceptable "
+                             "fallbacks (default from config/speed_profiles.json)")
+    parser.add_argument("--page-deadline", type=float, default=None,
+                        help="Seconds per page before non-critical agents (statistics, FAQ, SEO, comparison, "
+                             "schema) fall back to default output (default from config/model_routing.json)")
+    parser.add_argument("--max-tokens", type=int, default=None,
+                        help="Stop starting pages once projected prompt+output tokens would exceed N")
+    parser.add_argument("--max-cost", type=float, default=None,
+                        help="Stop starting pages once projected cost (USD, from --pricing) would exceed this")
+    parser.add_argument("--deadline", default=None,
+                        help="Stop starting pages that would not finish by then: HH:MM, ISO datetime or +MINUTES")
+    parser.add_argument("--yes", action="store_true",
+                        help="Unattended: resume from the checkpoint and proceed without prompting")
+    parser.add_argument("--plan", action="store_true",
+                        help="Dry run: estimate calls, tokens, wall time and cost for the batch (no API calls)")
+    parser.add_argument("--jsonl", nargs="?", const="-", metavar="PATH",
+                       help="Stream one JSON record per completed page to stdout (or PATH/named pipe); "
+                            "progress output moves to stderr. Records are emitted before --link-graph runs.")
+
+    args = parser.parse_args()
+
+    # Open the stream first so every progress line lands on stderr; closing it
+    # restores stdout however the run ends (early returns and errors included)
+    stream = JSONLStream(args.jsonl) if args.jsonl else None
+    try:
+        run(args, stream)
+    finally:
+        if stream:
+            stream.close()
+
+
 if __name__ == "__main__":
     main()
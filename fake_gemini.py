@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Fake Gemini
+Stand-ins for google.generativeai's GenerativeModel and its responses, shared by
+the test_*.py scripts (no API required)
+
+FakeModel records every call, then waits, fails or answers in this order:
+queued latencies (else latency), queued errors, queued replies (else reply()).
+Tests subclass it and override reply() to answer by prompt.
+"""
+
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+# Five well-formed FAQs: what FakeModel answers by default
+FAQS = [{'question': 'Q?', 'answer': 'A.'}] * 5
+
+
+class FakeResponse:
+    """A generate_content() response; usage_metadata only when token counts are given"""
+
+    def __init__(self, text, prompt_tokens=None, output_tokens=None, cached_tokens=0):
+        self.text = text
+        if prompt_tokens is not None:
+            self.usage_metadata = SimpleNamespace(
+                prompt_token_count=prompt_tokens, candidates_token_count=output_tokens,
+                cached_content_token_count=cached_tokens
+            )
+
+
+class FakeModel:
+    """Stands in for GenerativeModel: scripted latency, errors and replies"""
+
+    model_name = 'models/fake-model'
+
+    def __init__(self, replies=(), errors=(), latencies=(), latency=0.0, jitter=0.0):
+        self.replies = list(replies)
+        self.errors = list(errors)
+        self.latencies = list(latencies)
+        self.latency = latency
+        # Each wait is scaled by a random factor in [1 - jitter, 1 + jitter]
+        self.jitter = jitter
+        self.calls = 0
+        self.prompts = []
+        self.configs = []
+        self.request_options = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def reply(self, prompt):
+        """The answer when no reply is queued: text, a FakeResponse or JSON-serialisable data"""
+        return FAQS
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.prompts.append(prompt)
+            self.configs.append(generation_config)
+            self.request_options.append(kwargs.get('request_options'))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            latency = self.latencies.pop(0) if self.latencies else self.latency
+            error = self.errors.pop(0) if self.errors else None
+            reply = self.replies.pop(0) if self.replies else None
+        try:
+            time.sleep(latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+            if error is not None:
+                raise error
+            if reply is None:
+                reply = self.reply(prompt)
+            if isinstance(reply, FakeResponse):
+                return reply
+            return FakeResponse(reply if isinstance(reply, str) else json.dumps(reply))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
@@ -28,6 +28,9 @@ import time
 import random
 import argparse
 from datetime import datetime
+from utils.jsonl_stream import JSONLStream
+from utils import token_accounting
+from utils.token_accounting import USAGE
 
 # Load environment variables
 load_dotenv()
@@ -187,6 +190,7 @@ def generate_content_with_claude(page_data, section):
             )
         )
 
+        USAGE.record(response, agent=section, model='gemini-2.0-flash-exp')
         content = response.text
         return content.strip()
     
@@ -194,8 +198,12 @@ def generate_content_with_claude(page_data, section):
         print(f"  ⚠️  Error generating {section}: {e}")
         return f"[ERROR: {section}]"
 
-def generate_all_pages(limit=None, priority_only=False):
-    """Generate all page content"""
+def generate_all_pages(limit=None, priority_only=False, stream=None):
+    """
+    Generate all page content
+    Args:
+        stream: Optional JSONLStream; each completed page is written as one record
+    """
     
     print("\n🚀 Sozee Landing Page Generator")
     print("=" * 50)
@@ -210,7 +218,7 @@ def generate_all_pages(limit=None, priority_only=False):
     
     print(f"   Total pages to generate: {len(pages)}")
     
-    # Estimate cost
+    # Rough up-front estimate (actual tokens and cost are reported at the end)
     total_api_calls = len(pages) * 4  # 4 sections per page
     estimated_tokens = total_api_calls * 500
     estimated_cost = (estimated_tokens / 1_000_000) * 3
@@ -266,6 +274,8 @@ def generate_all_pages(limit=None, priority_only=False):
             result[var_name] = page.get(var_name, '')
         
         results.append(result)
+        if stream:
+            stream.write(result)
         
         # Rate limiting - 1 second between pages (4 calls per page)
         time.sleep(1)
@@ -297,6 +307,7 @@ def generate_all_pages(limit=None, priority_only=False):
     print(f"✅ Complete! Generated {len(results)} pages")
     print(f"⏱️  Total time: {total_time/60:.1f} minutes")
     print(f"📁 Saved to: {output_file}")
+    token_accounting.print_summary(pages=len(results))
     print("\n📊 Page counts by pattern:")
     pattern_counts = df.groupby('pattern_name').size().to_dict()
     for pattern_name, count in pattern_counts.items():
@@ -309,14 +320,22 @@ if __name__ == "__main__":
     parser.add_argument('--limit', type=int, help='Limit number of pages to generate (for testing)')
     parser.add_argument('--priority-only', action='store_true', 
                        help='Only generate pages with high-priority variables')
+    parser.add_argument('--jsonl', nargs='?', const='-', metavar='PATH',
+                       help='Stream one JSON record per page to stdout (or PATH/named pipe); progress goes to stderr')
     
     args = parser.parse_args()
-    
-    # Check for API key
-    if not os.environ.get("GEMINI_API_KEY"):
-        print("❌ Error: GEMINI_API_KEY not found in environment variables")
-        print("   Create a .env file with: GEMINI_API_KEY=your-key-here")
-        exit(1)
-    
-    # Run generator
-    df = generate_all_pages(limit=args.limit, priority_only=args.priority_only)
+    stream = JSONLStream(args.jsonl) if args.jsonl else None
+
+    # Closing the stream restores stdout, including on the early exit below
+    try:
+        # Check for API key
+        if not os.environ.get("GEMINI_API_KEY"):
+            print("❌ Error: GEMINI_API_KEY not found in environment variables")
+            print("   Create a .env file with: GEMINI_API_KEY=your-key-here")
+            exit(1)
+
+        # Run generator
+        df = generate_all_pages(limit=args.limit, priority_only=args.priority_only, stream=stream)
+    finally:
+        if stream:
+            stream.close()
@@ -25,7 +25,8 @@ Classes:
 Performance:
 ------------
 - Speed: 10-20 pages/hour
-- Cost: $0.50-1.00 per page
+- Cost: measured per call from Gemini usage metadata (PageOutput.token_usage;
+  batch_generator.py prints tokens and cost by agent using config/model_pricing.json)
 - Quality Score: 0.85-0.95
 - API Calls: 5-10 per page
 
@@ -47,13 +48,14 @@ import os
 from typing import Dict, List, Any
 import time
 import json
+import threading
 from datetime import datetime
 import google.generativeai as genai
 
 # Import framework
 from agent_framework import (
     BaseAgent, AgentMessage, AgentResponse,
-    ContentBlueprint, PageOutput
+    ContentBlueprint, PageOutput, AGENT_KEY_ALIASES, agent_key
 )
 
 # Import all agents
@@ -67,40 +69,80 @@ from agents.quality_control import QualityControlAgent
 from agents.comparison_table import ComparisonTableAgent
 from agents.statistics_agent import StatisticsAgent
 from agents.schema_markup import SchemaMarkupAgent
+from utils import model_router
+from utils.model_router import ModelRouter
+from utils.model_health import HEALTH
+from utils.hedging import HEDGER
+from utils import concurrency
+from utils.concurrency import LIMITER
+from utils.api_key_pool import KEY_POOL, load_api_keys
+from utils.call_scheduler import SCHEDULER
+from utils import deadlines
+from utils.deadlines import PageDeadline
+from utils.speed_profiles import SpeedProfile
+from utils import token_accounting
+from utils.token_accounting import PageUsage
 
 
 class AgentManager:
     """Manages agent lifecycle and inter-agent communication"""
 
-    def __init__(self, pattern_library: Dict, viral_hooks: List[str], gemini_api_key: str):
+    def __init__(self, pattern_library: Dict, viral_hooks: List[str], gemini_api_key: str,
+                 combined_copy: bool = False, router: ModelRouter = None, api_keys: List[str] = None,
+                 profile: SpeedProfile = None):
         """Initialize all agents"""
 
-        # Configure Gemini API
-        genai.configure(api_key=gemini_api_key)
+        # Configure Gemini API (default client; a pool of keys spreads calls over projects)
+        api_keys = api_keys or ([gemini_api_key] if gemini_api_key else [])
+        genai.configure(api_key=api_keys[0] if api_keys else gemini_api_key)
+
+        # Per-agent (and per-pattern) models from config/model_routing.json
+        self.router = router or ModelRouter.load()
+        HEALTH.configure(**self.router.failover)
+        HEDGER.configure(**self.router.hedging)
+        LIMITER.configure(**self.router.concurrency)
+        KEY_POOL.configure(keys=api_keys, **self.router.key_pool)
+        SCHEDULER.configure(**self.router.agent_limits)
+        # Which fallbacks are acceptable (and so which agents may be cut off at their deadline)
+        self.profile = profile or SpeedProfile()
+
+        def model(agent_key):
+            return self.router.route(agent_key).model
 
         # Initialize agents
         self.agents = {
             'pseo_strategist': PSEOStrategistAgent(pattern_library=pattern_library),
-            'competitor_research': CompetitorResearchAgent(),
-            'audience_insight': AudienceInsightAgent(),
-            'copywriting': CopywritingAgent(viral_hooks=viral_hooks),
-            'faq_generator': FAQGeneratorAgent(),
-            'seo_optimizer': SEOOptimizationAgent(),
-            'quality_control': QualityControlAgent(),
-            'comparison_table': ComparisonTableAgent(),
-            'statistics': StatisticsAgent(),
-            'schema_markup': SchemaMarkupAgent()
+            'competitor_research': CompetitorResearchAgent(model=model('competitor_research')),
+            'audience_insight': AudienceInsightAgent(model=model('audience_insight')),
+            'copywriting': CopywritingAgent(viral_hooks=viral_hooks, model=model('copywriting'),
+                                            combined_copy=combined_copy),
+            'faq_generator': FAQGeneratorAgent(model=model('faq_generator')),
+            'seo_optimizer': SEOOptimizationAgent(model=model('seo_optimizer')),
+            'quality_control': QualityControlAgent(model=model('quality_control')),
+            'comparison_table': ComparisonTableAgent(model=model('comparison_table')),
+            'statistics': StatisticsAgent(model=model('statistics')),
+            'schema_markup': SchemaMarkupAgent(model=model('schema_markup'))
         }
 
+        if KEY_POOL.size > 1:
+            for agent in self.agents.values():
+                if hasattr(agent, 'genai_model'):
+                    agent.genai_model = KEY_POOL.wrap(agent.genai_model)
+            print(f"  🔑 Spreading Gemini calls over {KEY_POOL.size} API keys")
+
+        deadlines.configure(max_workers=self._deadline_workers())
+
         self.message_log = []
         self.task_counter = 0
+        self.task_counter_lock = threading.Lock()  # Pages may run concurrently (batch --workers)
 
     def send_message(self, from_agent: str, to_agent: str, task: Dict,
                     context: Dict, priority: str = "medium") -> AgentResponse:
         """Send message to agent and execute task"""
 
-        self.task_counter += 1
-        task_id = f"task_{self.task_counter}_{int(time.time())}"
+        with self.task_counter_lock:
+            self.task_counter += 1
+            task_id = f"task_{self.task_counter}_{int(time.time())}"
 
         message = AgentMessage(
             from_agent=from_agent,
@@ -120,7 +162,7 @@ class AgentManager:
         # This handles naming inconsistencies between callers and the agent registry
         # Registry keys use lowercase with underscores (e.g., 'pseo_strategist', 'copywriting')
         # Callers may use various formats (e.g., 'PSEO_Strategist_Agent', 'Copywriting_Agent')
-        agent_key = to_agent.lower().replace('_agent', '')
+        agent_key = self.agent_key(to_agent)
         agent = self.agents.get(agent_key)
 
         if not agent:
@@ -130,20 +172,124 @@ class AgentManager:
         print(f"\n  → {from_agent} → {to_agent}")
         print(f"    Task: {task.get('action', 'execute')}")
 
-        response = agent.execute(message)
+        # Route this task by agent and the page's pattern, and queue its Gemini calls at the
+        # message priority. The agent's slot in the shared scheduler keeps one agent from
+        # holding every call across pages.
+        pattern_id = task.get('pattern_id') or context.get('blueprint', {}).get('pattern_id')
+        token = model_router.activate(self.router.route(agent_key, pattern_id))
+        priority_token = concurrency.activate_priority(priority)
+        try:
+            response = self._execute(agent_key, agent, message)
+        finally:
+            concurrency.deactivate_priority(priority_token)
+            model_router.deactivate(token)
 
         # Log response
         self.message_log.append(response.to_dict())
 
         return response
 
+    def run_prefetch(self, agent_key: str, prefetch, pattern_id: str = None):
+        """
+        Run an agent's batched prefetch like one of its tasks: under its route and in its scheduler slot
+
+        The route brings the agent's model, parameters, request timeout and
+        failover; the slot keeps a prefetch from running past the agent's limit
+        alongside page tasks. There is no deadline: a failed or slow prefetch
+        only means pages make their own per-page calls.
+        """
+        token = model_router.activate(self.router.route(agent_key, pattern_id))
+        try:
+            with SCHEDULER.slot(agent_key):
+                return prefetch()
+        finally:
+            model_router.deactivate(token)
+
+    def _execute(self, agent_key: str, agent, message: AgentMessage) -> AgentResponse:
+        """Run a task in the agent's scheduler slot; non-critical agents are cut off at their deadline"""
+        page = deadlines.current_page()
+        seconds = self._task_deadline(agent_key, agent, page)
+        if seconds is None:
+            with SCHEDULER.slot(agent_key, priority=message.priority):
+                return agent.execute(message)
+        if seconds <= 0:
+            return self._degraded(agent_key, agent, message, page, "page deadline already passed")
+
+        def task():
+            with SCHEDULER.slot(agent_key, priority=message.priority):
+                if deadlines.cancelled():  # Timed out while queued for a slot
+                    return None
+                return agent.execute(message)
+
+        try:
+            return deadlines.call_with_deadline(task, seconds)
+        except deadlines.DeadlineExceeded:
+            return self._degraded(agent_key, agent, message, page, f"no result after {seconds:.1f}s")
+
+    def _deadline_workers(self) -> int:
+        """Deadline pool size: the scheduler limits of agents that can be cut off (unlimited ones count as the largest)"""
+        limits = [SCHEDULER.limit(key) for key, agent in self.agents.items()
+                  if self.has_fallback(agent) and self.profile.accepts_fallback(key)]
+        largest = max([limit for limit in limits if limit] or [deadlines.DEFAULT_WORKERS])
+        return sum(limit or largest for limit in limits) or deadlines.DEFAULT_WORKERS
+
+    def _task_deadline(self, agent_key: str, agent, page) -> float:
+        """Smaller of the agent's deadline and the page's time left (None = not cut off)"""
+        if not self.has_fallback(agent) or not self.profile.accepts_fallback(agent_key):
+            return None
+        limits = [self.router.deadlines.get('agents', {}).get(agent_key)]
+        if page is not None:
+            limits.append(page.remaining())
+        limits = [limit for limit in limits if limit is not None]
+        return min(limits) if limits else None
+
+    def _degraded(self, agent_key: str, agent, message: AgentMessage, page, reason: str) -> AgentResponse:
+        """Fallback response for a task that missed its deadline, recorded on the page"""
+        print(f"  ⏱️ {agent.name} missed its deadline ({reason}); using fallback output")
+        if page is not None:
+            page.degrade(agent_key)
+        return agent.create_response(message, status='degraded', data=agent.fallback_data(message), confidence=0.5)
+
+    @staticmethod
+    def has_fallback(agent) -> bool:
+        """Whether the agent has fallback output (BaseAgent.fallback_data overridden)"""
+        return getattr(type(agent), 'fallback_data', BaseAgent.fallback_data) is not BaseAgent.fallback_data
+
+    def send_fallback(self, to_agent: str, task: Dict, context: Dict, priority: str = "medium") -> AgentResponse:
+        """Fallback output of an agent the speed profile skips (no Gemini call)"""
+        agent = self.agents[self.agent_key(to_agent)]
+        message = AgentMessage(
+            from_agent='orchestrator',
+            to_agent=to_agent,
+            task_id=f"fallback_{self.agent_key(to_agent)}_{int(time.time())}",
+            priority=priority,
+            task=task,
+            context=context
+        )
+        print(f"\n  ⏩ {to_agent} skipped by speed profile; using fallback output")
+        return agent.create_response(message, status='fallback', data=agent.fallback_data(message), confidence=0.5)
+
+    # Agent names whose registry key is not the lowercased name (shared with BaseAgent)
+    AGENT_KEY_ALIASES = AGENT_KEY_ALIASES
+    agent_key = staticmethod(agent_key)
+
     def execute_parallel_tasks(self, tasks: List[Dict], context: Dict) -> Dict[str, AgentResponse]:
-        """Execute multiple tasks in parallel (simulated with sequential for now)"""
+        """
+        Execute multiple tasks in parallel (simulated with sequential for now)
+
+        A page's tasks run one after another, highest priority first, so a page
+        never has two tasks waiting in the shared scheduler at once. Its fair
+        queue (priority, then the page with the fewest tasks so far) orders
+        tasks across pages generated concurrently (batch_generator.py --workers).
+        """
 
         print(f"\n  🔄 Executing {len(tasks)} parallel tasks...")
 
         results = {}
-        for task in tasks:
+        # High-priority tasks first (stable, so equal priorities keep their order)
+        ordered = sorted(tasks, key=lambda t: concurrency.PRIORITY_RANK.get(t.get('priority', 'medium'),
+                                                                             concurrency.PRIORITY_RANK['medium']))
+        for task in ordered:
             agent_name = task['agent']
             response = self.send_message(
                 from_agent='orchestrator',
@@ -173,21 +319,36 @@ class PSEOOrchestrator:
         - variables: Dict of all variables
         - viral_hooks: List of viral hooks
         - gemini_api_key: API key
+        - gemini_api_keys: (optional) pool of API keys, one per project (default GEMINI_API_KEYS)
+        - combined_copy: (optional) write copy + pattern sections in one call per page
+        - model_routing: (optional) path to a routing table (default config/model_routing.json)
+        - speed_profile: (optional) fast, balanced or quality (default from config/speed_profiles.json)
         """
         self.pattern_library = config['pattern_library']
         self.variables = config['variables']
         self.viral_hooks = config.get('viral_hooks', [])
         self.gemini_api_key = config['gemini_api_key']
 
+        # Agents and pattern sections per funnel stage
+        self.profile = SpeedProfile.load(config.get('speed_profile'))
+
         # Initialize agent manager
         self.agent_manager = AgentManager(
             pattern_library=self.pattern_library,
             viral_hooks=self.viral_hooks,
-            gemini_api_key=self.gemini_api_key
+            gemini_api_key=self.gemini_api_key,
+            combined_copy=config.get('combined_copy', False),
+            router=ModelRouter.load(config['model_routing']) if config.get('model_routing') else None,
+            api_keys=load_api_keys(config.get('gemini_api_keys'), default=self.gemini_api_key),
+            profile=self.profile
         )
 
+        # FAQ pairs per page (shared by per-page generation and batched prefetch)
+        self.faq_count = 5
+
         print("✓ PSEO Orchestrator initialized")
         print(f"  Agents: {list(self.agent_manager.agents.keys())}")
+        print(f"  Speed profile: {self.profile.name}")
 
     def generate_page(self, pattern_id: str, variables: Dict,
                      generation_model: str = "auto") -> PageOutput:
@@ -200,13 +361,30 @@ class PSEOOrchestrator:
             generation_model: "Model 1" or "Model 2" or "auto"
 
         Returns:
-            PageOutput object with complete page data
+            PageOutput object with complete page data (token_usage: tokens by agent;
+            degraded_agents: agents that missed their deadline and used fallback output)
         """
 
         # Normalize pattern_id to string for consistent handling throughout the pipeline
         # patterns.json uses integer IDs but code comparisons use strings
         pattern_id = str(pattern_id)
 
+        # Every Gemini call made for this page (agent threads included) is counted here,
+        # and non-critical agents are cut off once the page's deadline has passed
+        usage = PageUsage(pattern_id=pattern_id)
+        deadline = PageDeadline(self.agent_manager.router.deadlines.get('page_seconds'))
+        token = token_accounting.begin_page(usage)
+        deadline_token = deadlines.begin_page(deadline)
+        try:
+            return self._generate_page(pattern_id, variables, usage, deadline)
+        finally:
+            deadlines.end_page(deadline_token)
+            token_accounting.end_page(token)
+
+    def _generate_page(self, pattern_id: str, variables: Dict, usage: PageUsage,
+                       deadline: PageDeadline) -> PageOutput:
+        """Pipeline for generate_page(), run with the page's usage record and deadline active"""
+
         print(f"\n{'='*70}")
         print(f"🚀 GENERATING PAGE: Pattern {pattern_id}")
         print(f"{'='*70}")
@@ -238,61 +416,35 @@ class PSEOOrchestrator:
         agent_tasks = blueprint_response.data['agent_task_list']
 
         blueprint = ContentBlueprint(**blueprint_dict)
+        usage.page_id = blueprint.page_id
 
         print(f"  ✓ Blueprint created: {blueprint.page_id}")
         print(f"    Model: {blueprint.generation_model}")
         print(f"    Agents needed: {len(blueprint.required_agents)}")
         print(f"    Research tasks: {len(blueprint.research_requirements)}")
 
+        # The blueprint's task list drives the pipeline; the speed profile decides what runs
+        tasks = self._profile_tasks(agent_tasks, blueprint.funnel_stage)
+        # Fallback responses (deadline or speed profile) carry usable output
+        usable = ('completed', 'degraded', 'fallback')
+
         # Step 2: Research Phase (Parallel)
         research_data = {}
+        research_tasks = tasks['research']['run']
+        research_context = {'blueprint': blueprint_dict, 'pseo_variables': variables}
 
-        if blueprint.research_requirements:
-            print(f"\n🔍 STEP 2: Research Phase ({len(blueprint.research_requirements)} tasks)")
-
-            research_tasks = []
-            for req in blueprint.research_requirements:
-                if req['type'] == 'competitor_analysis':
-                    research_tasks.append({
-                        'agent': 'Competitor_Research_Agent',
-                        'params': {
-                            'competitor': req['target'],
-                            'audience': variables.get('audience', ''),
-                            'required_data': req['required_data']
-                        },
-                        'priority': 'high'
-                    })
-                elif req['type'] == 'audience_insights':
-                    research_tasks.append({
-                        'agent': 'Audience_Insight_Agent',
-                        'params': {
-                            'audience': req['target'],
-                            'required_data': req['required_data']
-                        },
-                        'priority': 'high'
-                    })
-
-            # Add statistics research (especially important for Pattern 6)
-            research_tasks.append({
-                'agent': 'Statistics_Agent',
-                'params': {
-                    'pattern_id': pattern_id,
-                    'topic': blueprint.pattern_name,
-                    'audience': variables.get('audience', 'creators'),
-                    'platform': variables.get('platform', 'social media')
-                },
-                'priority': 'medium'
-            })
+        if research_tasks or tasks['research']['fallback']:
+            print(f"\n🔍 STEP 2: Research Phase ({len(research_tasks)} tasks)")
 
             # Execute research tasks
             research_results = self.agent_manager.execute_parallel_tasks(
-                research_tasks,
-                context={'blueprint': blueprint_dict, 'pseo_variables': variables}
-            )
+                research_tasks, context=research_context
+            ) if research_tasks else {}
+            research_results.update(self._send_fallbacks(tasks['research']['fallback'], research_context))
 
             # Extract research data
             for agent_name, response in research_results.items():
-                if response and response.status == 'completed':
+                if response and response.status in usable:
                     research_data[agent_name] = response.data
 
             print(f"  ✓ Research complete: {len(research_data)} datasets")
@@ -300,19 +452,20 @@ class PSEOOrchestrator:
         # Step 3: Content Generation (Copywriting)
         print(f"\n✍️ STEP 3: Content Generation")
 
+        content_task = tasks['content']['run'][0]
         content_response = self.agent_manager.send_message(
             from_agent='orchestrator',
-            to_agent='Copywriting_Agent',
+            to_agent=content_task['agent'],
             task={
-                'sections': blueprint.sections_needed,
-                'variables': variables
+                **content_task['params'],
+                'max_pattern_sections': self.profile.max_sections(blueprint.funnel_stage)
             },
             context={
                 'blueprint': blueprint_dict,
                 'research_data': research_data,
                 'pseo_variables': variables
             },
-            priority='high'
+            priority=content_task.get('priority', 'high')
         )
 
         if content_response.status != 'completed':
@@ -330,91 +483,89 @@ class PSEOOrchestrator:
         content = content_response.data['content']
         print(f"  ✓ Content generated")
 
-        # Step 4: Supplementary Content (FAQ + SEO + Comparison + Schema) - Parallel
+        # Step 4: Supplementary Content (FAQ + SEO + Comparison) - Parallel
         print(f"\n🔧 STEP 4: Generating Supplementary Content")
 
         h1 = content.get('hero', {}).get('h1', '')
 
-        supplementary_tasks = [
-            {
-                'agent': 'FAQ_Generator_Agent',
-                'params': {
-                    'pattern_id': pattern_id,
-                    'count': 5
-                },
-                'priority': 'medium'
-            },
-            {
-                'agent': 'SEO_Optimization_Agent',
-                'params': {
-                    'h1': h1,
-                    'pattern_id': pattern_id
-                },
-                'priority': 'medium'
-            }
-        ]
-
-        # Add comparison table for patterns 1 & 4 (Comparison, Alternative)
-        if pattern_id in ['1', '4']:
-            supplementary_tasks.append({
-                'agent': 'Comparison_Table_Agent',
-                'params': {
-                    'pattern_id': pattern_id,
-                    'competitor': variables.get('competitor', ''),
-                    'audience': variables.get('audience', 'creators')
-                },
-                'priority': 'high'
-            })
-
+        # Params only known now (the prefetch caches are keyed on the orchestrator's FAQ count)
+        runtime_params = {
+            'FAQ_Generator_Agent': {'count': self.faq_count},
+            'SEO_Optimization_Agent': {'h1': h1}
+        }
+        supplementary_tasks = tasks['supplementary']['run']
+        for task in supplementary_tasks + tasks['supplementary']['fallback']:
+            task['params'].update(runtime_params.get(task['agent'], {}))
+
+        supplementary_context = {
+            'blueprint': blueprint_dict,
+            'pseo_variables': variables,
+            'content': content,
+            'research_data': research_data
+        }
         supplementary_results = self.agent_manager.execute_parallel_tasks(
-            supplementary_tasks,
-            context={
-                'blueprint': blueprint_dict,
-                'pseo_variables': variables,
-                'content': content,
-                'research_data': research_data
-            }
-        )
+            supplementary_tasks, context=supplementary_context
+        ) if supplementary_tasks else {}
+        supplementary_results.update(self._send_fallbacks(tasks['supplementary']['fallback'], supplementary_context))
 
         # Extract supplementary data
         faq_data = supplementary_results.get('FAQ_Generator_Agent')
         seo_data = supplementary_results.get('SEO_Optimization_Agent')
         comparison_data = supplementary_results.get('Comparison_Table_Agent')
 
-        faqs = faq_data.data['faqs'] if faq_data and faq_data.status == 'completed' else []
-        metadata = seo_data.data if seo_data and seo_data.status == 'completed' else {}
-        comparison_table = comparison_data.data['comparison_table'] if comparison_data and comparison_data.status == 'completed' else []
+        faqs = faq_data.data['faqs'] if faq_data and faq_data.status in usable else []
+        metadata = seo_data.data if seo_data and seo_data.status in usable else {}
+        comparison_table = comparison_data.data['comparison_table'] if comparison_data and comparison_data.status in usable else []
 
         print(f"  ✓ FAQ: {len(faqs)} pairs")
-        print(f"  ✓ SEO metadata generated")
-        if pattern_id in ['1', '4']:
+        print("  ✓ SEO metadata generated" if metadata else "  ✓ SEO metadata skipped")
+        if comparison_data:
             print(f"  ✓ Comparison table: {len(comparison_table)} features")
 
         # Generate Schema Markup (after FAQ and metadata are ready)
-        print(f"\n📊 STEP 4b: Generating Schema Markup")
-
-        schema_response = self.agent_manager.send_message(
-            from_agent='orchestrator',
-            to_agent='Schema_Markup_Agent',
-            task={
-                'pattern_id': pattern_id,
+        schemas = []
+        schema_tasks = tasks['schema']['run'] + tasks['schema']['fallback']
+        if schema_tasks:
+            print("\n📊 STEP 4b: Generating Schema Markup")
+
+            schema_task = schema_tasks[0]
+            schema_params = {
+                **schema_task['params'],
                 'page_data': content,
                 'faqs': faqs,
                 'meta': metadata
-            },
-            context={
+            }
+            schema_context = {
                 'blueprint': blueprint_dict,
                 'pseo_variables': variables
-            },
-            priority='medium'
-        )
-
-        schemas = schema_response.data['schemas'] if schema_response and schema_response.status == 'completed' else []
-        print(f"  ✓ Generated {len(schemas)} schema types")
+            }
+            if tasks['schema']['run']:
+                schema_response = self.agent_manager.send_message(
+                    from_agent='orchestrator',
+                    to_agent=schema_task['agent'],
+                    task=schema_params,
+                    context=schema_context,
+                    priority=schema_task.get('priority', 'medium')
+                )
+            else:
+                schema_response = self.agent_manager.send_fallback(schema_task['agent'], schema_params, schema_context)
+
+            schemas = schema_response.data['schemas'] if schema_response and schema_response.status in usable else []
+            print(f"  ✓ Generated {len(schemas)} schema types")
 
         # Step 5: Assemble Page
         print(f"\n🔨 STEP 5: Assembling Page")
 
+        # Agents that called Gemini for this page, for the routing record
+        generating_agents = [
+            self.agent_manager.agent_key(task['agent'])
+            for task in research_tasks + [content_task] + supplementary_tasks
+        ]
+        # Agents that ran for this page (fallbacks for skipped agents are not counted)
+        agents_used = ['PSEO_Strategist_Agent'] + [
+            task['agent'] for stage in tasks.values() for task in stage['run']
+        ]
+
         page_output = self._assemble_page(
             blueprint=blueprint,
             variables=variables,
@@ -423,56 +574,158 @@ class PSEOOrchestrator:
             metadata=metadata,
             research_data=research_data,
             comparison_table=comparison_table,
-            schemas=schemas
+            schemas=schemas,
+            routing=self.agent_manager.router.describe(generating_agents, pattern_id),
+            agents_used=agents_used
         )
 
         print(f"  ✓ Page assembled: {page_output.page_id}")
 
         # Step 6: Quality Control
-        print(f"\n🎯 STEP 6: Quality Control")
+        for qc_task in tasks['review']['run']:
+            print("\n🎯 STEP 6: Quality Control")
 
-        qc_response = self.agent_manager.send_message(
-            from_agent='orchestrator',
-            to_agent='Quality_Control_Agent',
-            task={},
-            context={
-                'page_data': page_output.to_dict(),
-                'blueprint': blueprint_dict
-            },
-            priority='high'
-        )
+            qc_response = self.agent_manager.send_message(
+                from_agent='orchestrator',
+                to_agent=qc_task['agent'],
+                task=qc_task['params'],
+                context={
+                    'page_data': page_output.to_dict(),
+                    'blueprint': blueprint_dict
+                },
+                priority=qc_task.get('priority', 'high')
+            )
 
-        if qc_response.status == 'completed':
-            quality_report = qc_response.data
-            page_output.quality_score = quality_report['overall_score']
-            page_output.uniqueness_check = quality_report['approval_status']
+            if qc_response.status == 'completed':
+                quality_report = qc_response.data
+                page_output.quality_score = quality_report['overall_score']
+                page_output.uniqueness_check = quality_report['approval_status']
 
-            print(f"  ✓ Quality Score: {quality_report['overall_score']:.2f}")
-            print(f"  ✓ Status: {quality_report['approval_status']}")
+                print(f"  ✓ Quality Score: {quality_report['overall_score']:.2f}")
+                print(f"  ✓ Status: {quality_report['approval_status']}")
 
-            if quality_report['issues']:
-                print(f"  ⚠️ Issues found: {len(quality_report['issues'])}")
-                for issue in quality_report['issues'][:3]:
-                    print(f"    - {issue}")
+                if quality_report['issues']:
+                    print(f"  ⚠️ Issues found: {len(quality_report['issues'])}")
+                    for issue in quality_report['issues'][:3]:
+                        print(f"    - {issue}")
 
         # Complete
         total_time = time.time() - start_time
+        page_output.token_usage = usage.to_dict()
+        page_output.degraded_agents = list(deadline.degraded)
+        tokens = page_output.token_usage['total']
 
         print(f"\n{'='*70}")
         print(f"✅ PAGE GENERATION COMPLETE")
         print(f"{'='*70}")
         print(f"  Page ID: {page_output.page_id}")
         print(f"  Time: {total_time:.2f}s")
+        print(f"  Tokens: {tokens['prompt_tokens']:,} in / {tokens['output_tokens']:,} out "
+              f"over {tokens['calls']} calls")
         print(f"  Quality: {page_output.quality_score:.2f}")
         print(f"  Status: {page_output.uniqueness_check}")
+        if page_output.degraded_agents:
+            print(f"  ⏱️ Fallback output (missed deadline): {', '.join(page_output.degraded_agents)}")
         print(f"{'='*70}\n")
 
         return page_output
 
+    def _profile_tasks(self, agent_tasks: List[Dict], funnel_stage: str) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        The blueprint's tasks by stage, split by the speed profile
+
+        Returns:
+            {stage: {'run': [...], 'fallback': [...]}} for the research, content,
+            supplementary, schema and review stages. 'fallback' holds skipped tasks
+            whose agent has fallback output the profile accepts; other skipped
+            tasks are dropped. Tasks are copies, so params can be filled in.
+        """
+        tasks = {stage: {'run': [], 'fallback': []}
+                 for stage in ('research', 'content', 'supplementary', 'schema', 'review')}
+        skipped = []
+        for task in agent_tasks:
+            stage = task.get('stage')
+            if stage not in tasks:
+                continue
+            task = {**task, 'params': dict(task.get('params', {}))}
+            agent_key = self.agent_manager.agent_key(task['agent'])
+            agent = self.agent_manager.agents.get(agent_key)
+            if self.profile.runs(agent_key, funnel_stage):
+                tasks[stage]['run'].append(task)
+            elif agent and self.agent_manager.has_fallback(agent) and self.profile.accepts_fallback(agent_key):
+                tasks[stage]['fallback'].append(task)
+            else:
+                skipped.append(task['agent'])
+        if skipped:
+            print(f"  ⏩ Skipped by '{self.profile.name}' profile: {', '.join(skipped)}")
+        return tasks
+
+    def _send_fallbacks(self, tasks: List[Dict], context: Dict) -> Dict[str, AgentResponse]:
+        """Fallback responses for skipped tasks, keyed like execute_parallel_tasks()"""
+        return {
+            task['agent']: self.agent_manager.send_fallback(task['agent'], task['params'], context,
+                                                            priority=task.get('priority', 'medium'))
+            for task in tasks
+        }
+
+    def funnel_stage(self, pattern_id: str) -> str:
+        """Funnel stage of a pattern (top, mid or bottom), as the strategist assigns it"""
+        return self.agent_manager.agents['pseo_strategist']._determine_strategy(str(pattern_id))[0]
+
+    def prefetch_faqs(self, pattern_id: str, variables_list: List[Dict]) -> int:
+        """
+        Generate FAQs for several upcoming pages of one pattern in a single request
+
+        generate_page() then uses the cached FAQs; pages missing from the batch
+        fall back to a per-page FAQ call.
+
+        Returns:
+            Number of pages cached
+        """
+        if not self.profile.runs('faq_generator', self.funnel_stage(pattern_id)):
+            return 0
+        faq_agent = self.agent_manager.agents['faq_generator']
+        return self.agent_manager.run_prefetch(
+            'faq_generator', lambda: faq_agent.prefetch(str(pattern_id), variables_list, self.faq_count),
+            pattern_id=str(pattern_id)
+        )
+
+    def prefetch_metadata(self, pages: List[Dict], batch_size: int = 25) -> int:
+        """
+        Generate SEO metadata for many upcoming pages with a few batched calls
+
+        Args:
+            pages: Dicts with 'pattern_id' and 'variables'. H1s come from each
+                   pattern's h1_formula, as used by the Copywriting Agent.
+            batch_size: Pages per metadata request
+
+        Returns:
+            Number of pages cached
+        """
+        # Only pages whose speed profile runs the SEO agent
+        pages = [page for page in pages if self.profile.runs('seo_optimizer', self.funnel_stage(page['pattern_id']))]
+        copywriter = self.agent_manager.agents['copywriting']
+        items = [
+            {
+                'h1': copywriter.build_h1(str(page['pattern_id']), page['variables']),
+                'pattern_id': str(page['pattern_id']),
+                'variables': page['variables']
+            }
+            for page in pages
+        ]
+        # Items span patterns, so the prefetch runs under the agent's default route
+        seo_agent = self.agent_manager.agents['seo_optimizer']
+        return self.agent_manager.run_prefetch('seo_optimizer', lambda: seo_agent.prefetch(items, batch_size=batch_size))
+
+    def has_prefetched_faqs(self, pattern_id: str, variables: Dict) -> bool:
+        """Whether generate_page() will reuse prefetched FAQs for this page"""
+        faq_agent = self.agent_manager.agents['faq_generator']
+        return faq_agent.is_prefetched(str(pattern_id), variables, self.faq_count)
+
     def _assemble_page(self, blueprint: ContentBlueprint, variables: Dict,
                       content: Dict, faqs: List, metadata: Dict,
                       research_data: Dict, comparison_table: List = None,
-                      schemas: List = None) -> PageOutput:
+                      schemas: List = None, routing: str = '', agents_used: List[str] = None) -> PageOutput:
         """Assemble final page output from all components"""
 
         # Build URL slug
@@ -502,8 +755,8 @@ class PSEOOrchestrator:
             final_cta=content.get('final_cta', ''),
             pseo_variables=variables,
             research_sources=self._extract_sources(research_data),
-            generation_model=blueprint.generation_model,
-            agents_used=blueprint.required_agents,
+            generation_model=f"{blueprint.generation_model} | {routing}" if routing else blueprint.generation_model,
+            agents_used=agents_used or blueprint.required_agents,
             schema_markup=schemas if schemas else []
         )
 
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Adaptive Concurrency Test (no API required)
+Tests AIMD growth and cuts, the in-flight cap, convergence under a rate limit and routed agent calls
+"""
+
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import model_router
+from utils.concurrency import AdaptiveLimiter, LIMITER
+from utils.model_router import ModelRouter
+from pseo_orchestrator import AgentManager
+from fake_gemini import FakeModel
+
+print("=" * 60)
+print("Adaptive Concurrency Test")
+print("=" * 60)
+
+all_passed = True
+
+
+class APIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+# Test 1: Additive increase, multiplicative decrease
+print("\n1️⃣  Testing AIMD adjustments...")
+limiter = AdaptiveLimiter(initial_limit=2, max_limit=32)
+for _ in range(20):
+    with limiter.slot('seo'):
+        pass
+grown = limiter.snapshot()['limit']
+check(4 <= grown <= 8, f"20 healthy calls grew the limit 2 → {grown}", f"limit={grown}")
+
+limiter = AdaptiveLimiter(initial_limit=8)
+limiter.record_error(APIError(429))
+limiter.record_error(APIError(429))
+check(limiter.snapshot()['limit'] == 4 and limiter.snapshot()['decreases'] == 1,
+      "429 halved the limit; a burst of 429s counts once", f"snapshot={limiter.snapshot()}")
+limiter.record_error(ValueError('bad request'))
+check(limiter.snapshot()['decreases'] == 1, "Non-overload errors leave the limit alone", "cut on a client error")
+
+limiter = AdaptiveLimiter(initial_limit=8, min_samples=5, latency_spike_factor=2.5)
+for _ in range(5):
+    limiter.record_success('copywriting', 0.01)
+limiter.record_success('seo', 0.5)
+limiter.record_success('copywriting', 0.2)
+check(limiter.snapshot()['decreases'] == 1, "Latency spike against the agent's own baseline cut the limit",
+      f"decreases={limiter.snapshot()['decreases']}")
+
+# Test 2: In-flight cap
+print("\n2️⃣  Testing in-flight cap...")
+limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+in_flight, peak = [0], [0]
+lock = threading.Lock()
+
+
+def capped_call():
+    with limiter.slot():
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+
+
+with ThreadPoolExecutor(max_workers=8) as pool:
+    list(pool.map(lambda _: capped_call(), range(16)))
+check(peak[0] == 2, "Never more than 2 calls in flight with limit 2", f"peak={peak[0]}")
+
+# Test 3: Converges near a provider's capacity
+print("\n3️⃣  Testing convergence under a rate limit...")
+CAPACITY = 6
+limiter = AdaptiveLimiter(initial_limit=2, max_limit=64)
+server = {'active': 0, 'rejected': 0}
+server_lock = threading.Lock()
+
+
+def provider_call():
+    while True:
+        try:
+            with limiter.slot('faq'):
+                with server_lock:
+                    server['active'] += 1
+                    overloaded = server['active'] > CAPACITY
+                try:
+                    if overloaded:
+                        with server_lock:
+                            server['rejected'] += 1
+                        raise APIError(429)
+                    time.sleep(0.01)
+                finally:
+                    with server_lock:
+                        server['active'] -= 1
+            return
+        except APIError:
+            time.sleep(0.005)
+
+
+with ThreadPoolExecutor(max_workers=24) as pool:
+    list(pool.map(lambda _: provider_call(), range(300)))
+stats = limiter.snapshot()
+check(stats['decreases'] > 0 and 2 <= stats['limit'] <= 2 * CAPACITY,
+      f"Limit settled at {stats['limit']} for capacity {CAPACITY} ({stats['decreases']} cuts, "
+      f"{server['rejected']} rejected of {stats['calls']} calls)", f"stats={stats}")
+
+# Test 4: Agent calls hold slots; failed-over 429s back the limit off
+print("\n4️⃣  Testing routed agent calls...")
+router = ModelRouter({
+    'default': {'model': 'primary-model', 'fallbacks': ['spare-model']},
+    'concurrency': {'initial_limit': 8, 'max_limit': 32}
+})
+manager = AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='test', router=router)
+check(LIMITER.snapshot()['limit'] == 8, "Limiter settings loaded from the routing config",
+      f"limit={LIMITER.snapshot()['limit']}")
+calls_before = LIMITER.snapshot()['calls']
+manager.agents['faq_generator'].genai_model = FakeModel(errors=[APIError(429)])
+model_router._models['spare-model'] = FakeModel()
+response = manager.send_message(
+    from_agent='orchestrator', to_agent='FAQ_Generator_Agent', task={'pattern_id': '1', 'count': 5},
+    context={'blueprint': {'pattern_id': '1', 'pseo_variables': {'competitor': 'Krea'}}}
+)
+stats = LIMITER.snapshot()
+check(len(response.data['faqs']) == 5 and stats['calls'] == calls_before + 1 and stats['limit'] == 4,
+      "Call held a slot and the failed-over 429 halved the shared limit", f"stats={stats}")
+
+print("\n" + "=" * 60)
+print("✅ All Adaptive Concurrency Tests Passed" if all_passed else "⚠️ Some Adaptive Concurrency Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
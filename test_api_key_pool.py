@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+API Key Pool Test (no API required)
+Tests key loading, spreading calls over keys, sidelining rate-limited keys and AgentManager wiring
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.api_key_pool import KeyPool, KeyedModel, KEY_POOL, load_api_keys
+from pseo_orchestrator import AgentManager
+from fake_gemini import FakeModel
+
+print("=" * 60)
+print("API Key Pool Test")
+print("=" * 60)
+
+all_passed = True
+
+
+class APIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+class KeyedFakeModel(FakeModel):
+    """Records which key's client served each call; errors queued per client"""
+
+    def __init__(self, client_errors=None):
+        super().__init__()
+        self._client = None
+        self.client_errors = client_errors if client_errors is not None else {}
+        self.served = []
+
+    def reply(self, prompt):
+        queued = self.client_errors.get(self._client, [])
+        if queued:
+            raise queued.pop(0)
+        self.served.append(self._client)
+        return {}
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+def client_for(key):
+    return f"client-{key}"
+
+
+# Test 1: Loading keys
+print("\n1️⃣  Testing key loading...")
+saved = {name: os.environ.pop(name, None) for name in ('GEMINI_API_KEYS', 'GEMINI_API_KEY')}
+try:
+    os.environ['GEMINI_API_KEYS'] = 'key-a, key-b,,key-a'
+    from_env = load_api_keys()
+    from_config = load_api_keys(['key-c'])
+    del os.environ['GEMINI_API_KEYS']
+    single = load_api_keys(default='key-d')
+finally:
+    for name, value in saved.items():
+        if value is not None:
+            os.environ[name] = value
+check(from_env == ['key-a', 'key-b'] and from_config == ['key-c'] and single == ['key-d'],
+      "Config list, then GEMINI_API_KEYS (deduplicated), then the single key",
+      f"env={from_env} config={from_config} single={single}")
+
+# Test 2: Calls spread evenly over healthy keys
+print("\n2️⃣  Testing distribution...")
+pool = KeyPool(['key-a', 'key-b', 'key-c'], client_factory=client_for)
+model = KeyedFakeModel()
+keyed = pool.wrap(model)
+for _ in range(6):
+    keyed.generate_content('p')
+counts = {client: model.served.count(client) for client in set(model.served)}
+check(counts == {'client-key-a': 2, 'client-key-b': 2, 'client-key-c': 2},
+      "6 calls spread 2/2/2 over three keys, each on its own client", f"counts={counts}")
+check(keyed.model_name == 'models/fake-model', "Wrapped model keeps model_name (prefix cache)", "model_name hidden")
+
+# Test 3: Rate-limited key is sidelined, then returns
+print("\n3️⃣  Testing sidelining...")
+pool = KeyPool(['key-a', 'key-b'], cooldown_seconds=0.2, client_factory=client_for)
+model = KeyedFakeModel(client_errors={'client-key-a': [APIError(429)]})
+keyed = pool.wrap(model)
+for _ in range(3):
+    keyed.generate_content('p')
+check(model.served == ['client-key-b'] * 3 and pool.snapshot()['key 1 (…ey-a)']['cooling'],
+      "429 on key 1 moved this and later calls to key 2", f"served={model.served}")
+time.sleep(0.25)
+keyed.generate_content('p')
+keyed.generate_content('p')
+check('client-key-a' in model.served[-2:], "Key 1 back in rotation after its cool-down", f"served={model.served}")
+
+model = KeyedFakeModel(client_errors={'client-key-a': [APIError(429)], 'client-key-b': [APIError(429)]})
+keyed = KeyPool(['key-a', 'key-b'], client_factory=client_for).wrap(model)
+try:
+    keyed.generate_content('p')
+    check(False, "", "exhausted pool did not raise")
+except APIError:
+    check(True, "Every key exhausted → 429 raised for model failover", "")
+
+model = KeyedFakeModel(client_errors={'client-key-a': [ValueError('bad request')]})
+keyed = KeyPool(['key-a', 'key-b'], client_factory=client_for).wrap(model)
+try:
+    keyed.generate_content('p')
+    check(False, "", "client error swallowed")
+except ValueError:
+    check(True, "Non-quota errors are not retried on another key", "")
+
+# Test 4: Per-key requests-per-minute cap
+print("\n4️⃣  Testing per-key quota...")
+pool = KeyPool(['key-a', 'key-b'], requests_per_minute=2, client_factory=client_for)
+model = KeyedFakeModel()
+keyed = pool.wrap(model)
+for _ in range(4):
+    keyed.generate_content('p')
+stats = pool.snapshot()
+check(all(s['calls'] == 2 for s in stats.values()), "Each key held to 2 requests/minute", f"stats={stats}")
+
+# Test 5: AgentManager spreads every agent over the pool
+print("\n5️⃣  Testing AgentManager wiring...")
+manager = AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='key-a',
+                       api_keys=['key-a', 'key-b'])
+wrapped = [key for key, agent in manager.agents.items()
+           if hasattr(agent, 'genai_model') and isinstance(agent.genai_model, KeyedModel)]
+check(KEY_POOL.size == 2 and 'copywriting' in wrapped and 'faq_generator' in wrapped,
+      f"{len(wrapped)} agent models spread over 2 keys", f"wrapped={wrapped}")
+check(KeyPool(['only-key']).wrap(model) is model, "Single key leaves models unwrapped", "single key wrapped")
+KEY_POOL.configure(keys=[])
+
+print("\n" + "=" * 60)
+print("✅ All API Key Pool Tests Passed" if all_passed else "⚠️ Some API Key Pool Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
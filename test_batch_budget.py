@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Batch Budget Test (no API required)
+Tests token/cost/deadline admission control in BatchProcessor, resumable checkpoints, SEO prefetch
+windows that follow admission, completion-order streaming and deadline parsing
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import token_accounting
+from utils.token_accounting import USAGE, PageUsage, PriceTable
+from utils.budget import BatchBudget, parse_deadline
+from agent_framework import PageOutput
+from batch_generator import BatchProcessor
+
+print("=" * 60)
+print("Batch Budget Test")
+print("=" * 60)
+
+all_passed = True
+
+PRICES = PriceTable({'default': {'input_per_million': 1.0, 'output_per_million': 1.0}})
+
+
+class FakeOrchestrator:
+    """Every page makes one 1,000-token call recorded in the usage ledger"""
+
+    def __init__(self, seconds=0.01):
+        self.seconds = seconds
+        self.generated = []
+        self.seo_windows = []
+
+    def prefetch_metadata(self, pages, batch_size=25):
+        self.seo_windows.append([page['variables']['competitor'] for page in pages])
+        return len(pages)
+
+    def generate_page(self, pattern_id, variables):
+        page_id = f"page-{variables['competitor']}"
+        usage = PageUsage(pattern_id=str(pattern_id), page_id=page_id)
+        token = token_accounting.begin_page(usage)
+        try:
+            time.sleep(self.seconds)
+            response = SimpleNamespace(text='{}', usage_metadata=SimpleNamespace(
+                prompt_token_count=800, candidates_token_count=200, cached_content_token_count=0))
+            USAGE.record(response, agent='copywriting', model='fake-model', seconds=self.seconds)
+        finally:
+            token_accounting.end_page(token)
+        self.generated.append(variables['competitor'])
+        return PageOutput(page_id=page_id, pattern_id=str(pattern_id), status='draft', post_title='T',
+                          url_slug=page_id, meta_title='T', meta_description='D', hero_section={},
+                          problem_agitation='', solution_overview='', token_usage=usage.to_dict())
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+class SlowFirstOrchestrator(FakeOrchestrator):
+    """Page A takes far longer than the pages after it"""
+
+    def generate_page(self, pattern_id, variables):
+        self.seconds = 0.3 if variables['competitor'] == 'A' else 0.01
+        return super().generate_page(pattern_id, variables)
+
+
+class RecordingStream:
+    """Stands in for JSONLStream: keeps the records in write order"""
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+        return True
+
+
+def run(budget, workers=1, start_index=0, output_dir=None, seo_batch_size=0, orchestrator=None, stream=None):
+    USAGE.reset()
+    orchestrator = orchestrator or FakeOrchestrator()
+    processor = BatchProcessor(orchestrator, output_dir=output_dir or tempfile.mkdtemp(), workers=workers,
+                               prices=PRICES, budget=budget, seo_batch_size=seo_batch_size, stream=stream)
+    pages = processor.process_batch(tasks_df, start_index=start_index)
+    with open(processor.checkpoint_file, 'r') as f:
+        return orchestrator, pages, json.load(f)
+
+
+tasks_df = pd.DataFrame([{'pattern_id': '1', 'priority': 'HIGH', 'competitor': c} for c in 'ABCDEF'])
+
+# Test 1: Token budget
+print("\n1️⃣  Testing token budget...")
+output_dir = tempfile.mkdtemp()
+orchestrator, pages, checkpoint = run(BatchBudget(max_tokens=3500, prices=PRICES), output_dir=output_dir)
+check(orchestrator.generated == ['A', 'B', 'C'], "3 pages of 1,000 tokens admitted under a 3,500-token cap",
+      f"generated={orchestrator.generated}")
+check(checkpoint['last_index'] == 3 and 'token budget' in checkpoint['budget']['stop_reason'],
+      "Checkpoint at the first unadmitted task, with the stop reason", f"checkpoint={checkpoint}")
+
+orchestrator, pages, checkpoint = run(BatchBudget(max_tokens=3500, prices=PRICES),
+                                      start_index=checkpoint['last_index'], output_dir=output_dir)
+check(orchestrator.generated == ['D', 'E', 'F'] and checkpoint['last_index'] == 6,
+      "Resumed run picks up the remaining tasks", f"generated={orchestrator.generated}")
+
+# Test 2: Cost budget with concurrent pages
+print("\n2️⃣  Testing cost budget with workers...")
+budget = BatchBudget(max_cost_usd=0.0035, prices=PRICES, estimate={'tokens': 1000, 'cost_usd': 0.001})
+orchestrator, pages, checkpoint = run(budget, workers=2)
+check(sorted(orchestrator.generated) == ['A', 'B', 'C'] and len(pages) == 3,
+      "In-flight pages counted in the projection: 3 pages at $0.001 under $0.0035",
+      f"generated={orchestrator.generated}")
+check(abs(budget.spent()['cost_usd'] - 0.003) < 1e-9 and checkpoint['last_index'] == 3,
+      f"Live spend ${budget.spent()['cost_usd']:.4f}, checkpoint at 3", f"spent={budget.spent()}")
+
+orchestrator, pages, checkpoint = run(BatchBudget(prices=PRICES), workers=2)
+check(len(orchestrator.generated) == 6 and checkpoint['last_index'] == 6 and 'budget' not in checkpoint,
+      "No limits → every task runs", f"generated={orchestrator.generated}")
+
+# Test 3: Deadline
+print("\n3️⃣  Testing deadline...")
+budget = BatchBudget(deadline=datetime.now() + timedelta(seconds=30), prices=PRICES, estimate={'seconds': 60})
+orchestrator, pages, checkpoint = run(budget)
+check(not orchestrator.generated and checkpoint['last_index'] == 0 and 'deadline' in budget.stop_reason,
+      "A page that would not finish before the deadline is not started", f"generated={orchestrator.generated}")
+
+# Test 4: SEO metadata is prefetched a window at a time, only for admitted pages
+print("\n4️⃣  Testing SEO prefetch windows...")
+orchestrator, pages, checkpoint = run(BatchBudget(max_tokens=3500, prices=PRICES), seo_batch_size=2)
+check(orchestrator.seo_windows == [['A', 'B'], ['C', 'D']],
+      "Windows of 2 pages as pages are admitted; none for E/F after the budget stop",
+      f"windows={orchestrator.seo_windows}")
+
+# Test 5: Pages are streamed as they complete, returned in matrix order
+print("\n5️⃣  Testing completion-order streaming...")
+stream = RecordingStream()
+orchestrator, pages, checkpoint = run(BatchBudget(prices=PRICES), workers=3,
+                                      orchestrator=SlowFirstOrchestrator(), stream=stream)
+streamed = [record['page_id'] for record in stream.records]
+check(len(streamed) == 6 and streamed[-1] == 'page-A',
+      "Slow page A didn't hold back the pages after it in the stream", f"streamed={streamed}")
+check([page['page_id'] for page in pages] == [f'page-{c}' for c in 'ABCDEF'] and checkpoint['last_index'] == 6,
+      "Returned pages (link graph, CSV) stay in matrix order", f"pages={[page['page_id'] for page in pages]}")
+
+now = datetime(2026, 10, 19, 22, 0)
+check(parse_deadline('06:30', now) == datetime(2026, 10, 20, 6, 30)
+      and parse_deadline('+90', now) == datetime(2026, 10, 19, 23, 30)
+      and parse_deadline('2026-10-20T05:00', now) == datetime(2026, 10, 20, 5, 0),
+      "Deadlines from HH:MM (next occurrence), +minutes and ISO datetimes", "deadline parsing wrong")
+
+USAGE.reset()
+
+print("\n" + "=" * 60)
+print("✅ All Batch Budget Tests Passed" if all_passed else "⚠️ Some Batch Budget Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Batch Planner Test (no API required)
+Tests dry-run call counts, KB/in-run cache hits, batching, checkpoint skipping and telemetry-based estimates
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import llm_client
+from utils.batch_planner import BatchPlanner, DEFAULT_CALL_PROFILE, checkpoint_index
+from utils.model_router import ModelRouter
+from utils.token_accounting import PriceTable
+
+print("=" * 60)
+print("Batch Planner Test")
+print("=" * 60)
+
+all_passed = True
+
+PATTERN_LIBRARY = {'patterns': [
+    {'id': 1, 'name': 'Competitor Alternative', 'variables': ['competitor', 'audience']},
+    {'id': 5, 'name': 'Review', 'variables': ['audience']}
+]}
+
+
+class FakeKB:
+    """Competitor KB with a fixed set of stored profiles"""
+
+    def __init__(self, profiles):
+        self.profiles = set(profiles)
+
+    def profile_exists(self, competitor):
+        return competitor in self.profiles
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+def planner(**kwargs):
+    kwargs.setdefault('kb', FakeKB(['Krea']))
+    return BatchPlanner(PATTERN_LIBRARY, router=ModelRouter({'default': {'model': 'fast-model'}}),
+                        prices=PriceTable({'default': {'input_per_million': 1.0, 'output_per_million': 2.0}}),
+                        **kwargs)
+
+
+# Rows of different patterns leave NaN in each other's columns, as in the matrix
+tasks = pd.DataFrame([
+    {'pattern_id': '1', 'competitor': 'Krea', 'audience': 'Creators', 'priority': 'high'},
+    {'pattern_id': '1', 'competitor': 'Leonardo', 'audience': 'Creators', 'priority': 'high'},
+    {'pattern_id': '1', 'competitor': 'Leonardo', 'audience': 'Agencies', 'priority': 'high'},
+    {'pattern_id': '5', 'audience': 'Creators', 'priority': 'medium'}
+])
+
+# Test 1: Call counts and cache hits
+print("\n1️⃣  Testing call counts and cache hits...")
+calls_made = []
+original_generate = llm_client.generate
+llm_client.generate = lambda *args, **kwargs: calls_made.append(args)
+try:
+    plan = planner().plan(tasks)
+finally:
+    llm_client.generate = original_generate
+agents = plan['agents']
+check(not calls_made, "No Gemini calls made", f"{len(calls_made)} calls made")
+check(plan['pages'] == 4, "4 pages planned (NaN columns of other patterns ignored)", f"pages={plan['pages']}")
+check(agents['competitor_research']['calls'] == 1 and agents['competitor_research']['cache_hits'] == 2,
+      "Competitor research: Krea from the KB, Leonardo researched once then cached",
+      f"competitor_research={agents['competitor_research']}")
+check(agents['audience_insight']['calls'] == 2 and agents['audience_insight']['cache_hits'] == 2,
+      "Audience research: one call per audience, repeats cached", f"audience_insight={agents['audience_insight']}")
+check(agents['comparison_table']['calls'] == 3, "Comparison tables only for pattern 1 pages",
+      f"comparison_table={agents['comparison_table']}")
+check(agents['faq_generator']['calls'] == 4 and agents['seo_optimizer']['calls'] == 4,
+      "One FAQ and one SEO call per page without batching", f"faq/seo={agents['faq_generator']}, {agents['seo_optimizer']}")
+check(plan['totals']['cost_usd'] > 0 and plan['wall_seconds'] > 0,
+      f"Estimated ${plan['totals']['cost_usd']:.4f} over {plan['wall_seconds']:.0f}s", f"plan={plan['totals']}")
+
+# Test 2: Batching and combined copy reduce calls
+print("\n2️⃣  Testing batching and combined copy...")
+batched = planner(combined_copy=True, faq_batch_size=5, seo_batch_size=10).plan(tasks)
+check(batched['agents']['copywriting']['calls'] == 4, "Combined copy: one copywriting call per page",
+      f"copywriting={batched['agents']['copywriting']['calls']}")
+check(batched['agents']['faq_generator']['calls'] == 2, "Batched FAQ: one call per pattern group",
+      f"faq_generator={batched['agents']['faq_generator']['calls']}")
+check(batched['agents']['seo_optimizer']['calls'] == 1, "Batched SEO: one prefetch call for 4 pages",
+      f"seo_optimizer={batched['agents']['seo_optimizer']['calls']}")
+check(batched['totals']['calls'] < plan['totals']['calls'],
+      f"{plan['totals']['calls']} → {batched['totals']['calls']} calls", "batching did not reduce calls")
+
+# Test 3: Workers shorten the wall time
+print("\n3️⃣  Testing concurrency...")
+parallel = planner(workers=4).plan(tasks)
+check(parallel['wall_seconds'] < plan['wall_seconds'] and parallel['totals']['calls'] == plan['totals']['calls'],
+      f"4 workers: {plan['wall_seconds']:.0f}s → {parallel['wall_seconds']:.0f}s, same calls",
+      f"wall={parallel['wall_seconds']} vs {plan['wall_seconds']}")
+
+# Test 4: Checkpoint and telemetry
+print("\n4️⃣  Testing checkpoint and telemetry...")
+with tempfile.TemporaryDirectory() as output_dir:
+    with open(os.path.join(output_dir, 'checkpoint.json'), 'w') as f:
+        json.dump({'last_index': 2}, f)
+    start = checkpoint_index(output_dir)
+    telemetry_path = os.path.join(output_dir, 'token_usage.json')
+    with open(telemetry_path, 'w') as f:
+        json.dump({'by_agent': {'faq_generator': {'calls': 2, 'prompt_tokens': 5000, 'output_tokens': 1000,
+                                                  'seconds': 4.0}}}, f)
+    resumed = planner(telemetry_path=telemetry_path).plan(tasks, start_index=start)
+check(start == 2 and resumed['pages'] == 2, "Resumed plan skips pages before the checkpoint",
+      f"start={start} pages={resumed['pages']}")
+check(checkpoint_index('/nonexistent') == 0, "No checkpoint → start at 0", "missing checkpoint not 0")
+faq = resumed['agents']['faq_generator']
+check(faq['prompt_tokens'] == 2 * 2500 and resumed['estimates_from']['faq_generator'].startswith('history'),
+      "FAQ estimate from recorded telemetry (2,500 tokens in per call)", f"faq={faq}")
+check(resumed['estimates_from']['copywriting'] == 'default'
+      and resumed['agents']['copywriting']['prompt_tokens'] % DEFAULT_CALL_PROFILE['copywriting']['prompt_tokens'] == 0,
+      "Agents without telemetry use the default profile", f"estimates_from={resumed['estimates_from']}")
+
+print("\n" + "=" * 60)
+print("✅ All Batch Planner Tests Passed" if all_passed else "⚠️ Some Batch Planner Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
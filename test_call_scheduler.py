@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Agent Call Scheduler Test (no API required)
+Tests per-agent limits, fair queuing across pages, work-conserving dispatch and AgentManager wiring
+"""
+
+import gc
+import os
+import sys
+import time
+import threading
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import token_accounting
+from utils.token_accounting import PageUsage
+from utils.call_scheduler import AgentScheduler, SCHEDULER
+from utils.model_router import ModelRouter
+from pseo_orchestrator import AgentManager
+
+print("=" * 60)
+print("Agent Call Scheduler Test")
+print("=" * 60)
+
+all_passed = True
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+def run_threads(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+# Test 1: Per-agent limits; other agents are not held up
+print("\n1️⃣  Testing per-agent limits...")
+scheduler = AgentScheduler(limits={'copywriting': 2})
+peak = {'copywriting': 0}
+running = {'copywriting': 0}
+lock = threading.Lock()
+faq_done = []
+
+
+def copy_task():
+    with scheduler.slot('copywriting'):
+        with lock:
+            running['copywriting'] += 1
+            peak['copywriting'] = max(peak['copywriting'], running['copywriting'])
+        time.sleep(0.1)
+        with lock:
+            running['copywriting'] -= 1
+
+
+def faq_task():
+    started = time.time()
+    with scheduler.slot('faq_generator'):
+        faq_done.append(time.time() - started)
+
+
+gc.collect()  # Keep a collection pause out of the timed dispatch
+run_threads([copy_task] * 6 + [faq_task] * 3)
+stats = scheduler.snapshot()
+check(peak['copywriting'] == 2 and stats['copywriting']['peak_running'] == 2,
+      "6 copywriting tasks ran at most 2 at a time", f"peak={peak}, stats={stats['copywriting']}")
+check(len(faq_done) == 3 and max(faq_done) < 0.05,
+      "FAQ tasks (no limit) dispatched immediately while copywriting queued", f"faq waits={faq_done}")
+check(stats['copywriting']['waited'] == 4, "4 copywriting tasks queued", f"stats={stats['copywriting']}")
+
+# Test 2: Fair queuing across pages
+print("\n2️⃣  Testing fair queuing across pages...")
+scheduler = AgentScheduler(limits={'copywriting': 1})
+busy, greedy, fresh = PageUsage(page_id='busy'), PageUsage(page_id='greedy'), PageUsage(page_id='fresh')
+for _ in range(3):
+    with scheduler.slot('copywriting', page=greedy):
+        pass
+order = []
+holding = threading.Event()
+release = threading.Event()
+
+
+def hold():
+    with scheduler.slot('copywriting', page=busy):
+        holding.set()
+        release.wait()
+
+
+def page_task(page):
+    def task():
+        token = token_accounting.begin_page(page)
+        try:
+            with scheduler.slot('copywriting'):
+                order.append(page.page_id)
+        finally:
+            token_accounting.end_page(token)
+    return task
+
+
+holder = threading.Thread(target=hold)
+holder.start()
+holding.wait()
+waiters = [threading.Thread(target=page_task(greedy)), threading.Thread(target=page_task(fresh))]
+for thread in waiters:
+    thread.start()
+    time.sleep(0.05)
+release.set()
+for thread in [holder] + waiters:
+    thread.join()
+check(order == ['fresh', 'greedy'], "Page with fewer agent tasks so far served first (page from context)",
+      f"order={order}")
+
+order = []
+scheduler = AgentScheduler(limits={'faq_generator': 1})
+holding.clear()
+release.clear()
+
+
+def hold_faq():
+    with scheduler.slot('faq_generator'):
+        holding.set()
+        release.wait()
+
+
+def priority_task(priority):
+    def task():
+        with scheduler.slot('faq_generator', priority=priority):
+            order.append(priority)
+    return task
+
+
+holder = threading.Thread(target=hold_faq)
+holder.start()
+holding.wait()
+waiters = [threading.Thread(target=priority_task(p)) for p in ('low', 'high')]
+for thread in waiters:
+    thread.start()
+    time.sleep(0.05)
+release.set()
+for thread in [holder] + waiters:
+    thread.join()
+check(order == ['high', 'low'], "Message priority outranks page fairness", f"order={order}")
+
+# Test 3: AgentManager tasks go through the shared scheduler
+print("\n3️⃣  Testing AgentManager wiring...")
+router = ModelRouter({'default': {'model': 'fake-model'}, 'agent_limits': {'limits': {'faq_generator': 1}}})
+manager = AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='test', router=router)
+concurrent = []
+active = [0]
+
+
+class SlowAgent:
+    def execute(self, message):
+        with lock:
+            active[0] += 1
+            concurrent.append(active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return SimpleNamespace(to_dict=lambda: {})
+
+
+manager.agents['faq_generator'] = SlowAgent()
+
+
+def send():
+    manager.send_message(from_agent='orchestrator', to_agent='FAQ_Generator_Agent', task={}, context={})
+
+
+run_threads([send] * 3)
+check(SCHEDULER.limit('faq_generator') == 1 and max(concurrent) == 1,
+      "agent_limits from the routing config applied to send_message", f"concurrent={concurrent}")
+check(ModelRouter.load().agent_limits.get('limits', {}).get('copywriting'),
+      "Shipped routing config limits copywriting", "no copywriting limit shipped")
+SCHEDULER.configure(**ModelRouter.load().agent_limits)
+
+print("\n" + "=" * 60)
+print("✅ All Agent Call Scheduler Tests Passed" if all_passed else "⚠️ Some Agent Call Scheduler Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
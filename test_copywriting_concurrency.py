@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Copywriting Concurrency Test (no API required)
+Tests that pattern sections and main copy run concurrently under the limit and merge in template order,
+and that combined-copy mode splits one response back into copy + pattern sections
+"""
+
+import os
+import re
+import sys
+import json
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agents.copywriting import CopywritingAgent
+from fake_gemini import FakeModel
+
+print("=" * 60)
+print("Copywriting Concurrency Test")
+print("=" * 60)
+
+all_passed = True
+
+
+class CopyModel(FakeModel):
+    """Random latency; section prompts get their section, the main prompt gets the main copy"""
+
+    def __init__(self, latency=0.2):
+        super().__init__(latency=latency, jitter=0.5)
+
+    def reply(self, prompt):
+        section = re.search(r'\(ID: (\w+)\)', prompt)
+        if section:
+            return {'heading': section.group(1), 'content': []}
+        return {
+            'hero': {'h1': 'Sozee vs Higgsfield'},
+            'problem': 'Problem', 'solution': 'Solution',
+            'features': [], 'comparison_table': [], 'final_cta': 'Start now'
+        }
+
+
+blueprint = {
+    'pattern_id': '1',
+    'pattern_name': 'Sozee vs Competitor',
+    'pseo_variables': {'competitor': 'Higgsfield', 'audience': 'OnlyFans Creators'}
+}
+
+with open('config/section_templates.json', 'r') as f:
+    templates = json.load(f)
+expected_order = [
+    s['id'] for s in templates['patterns']['1']['sections']
+    if s['id'] not in ['hero', 'faq', 'final_cta'] and 'generation_prompt' in s
+]
+
+agent = CopywritingAgent(viral_hooks=['The Content Crisis is real'], max_concurrent_calls=4)
+agent.genai_model = CopyModel()
+
+# Test 1: Calls overlap but never exceed the limit
+print("\n1️⃣  Testing bounded concurrent dispatch...")
+start = time.time()
+content = agent._generate_content(blueprint, research_data={}, sections=[])
+elapsed = time.time() - start
+sequential = agent.genai_model.calls * agent.genai_model.latency
+print(f"   {agent.genai_model.calls} calls in {elapsed:.2f}s (sequential ≈ {sequential:.2f}s), "
+      f"max in flight {agent.genai_model.max_in_flight}")
+
+if 1 < agent.genai_model.max_in_flight <= 4:
+    print("   ✅ Calls ran concurrently within the limit")
+else:
+    print("   ❌ Concurrency limit not respected")
+    all_passed = False
+
+if elapsed < sequential * 0.6:
+    print("   ✅ Copywriting wall time well below sequential")
+else:
+    print("   ❌ No speedup over sequential calls")
+    all_passed = False
+
+# Test 2: Merge preserves template order and main copy
+print("\n2️⃣  Testing merge order...")
+if list(content.get('pattern_sections', {})) == expected_order:
+    print("   ✅ pattern_sections in template order")
+else:
+    print(f"   ❌ Order: {list(content.get('pattern_sections', {}))}")
+    all_passed = False
+
+if content.get('hero', {}).get('h1') == 'Sozee vs Higgsfield':
+    print("   ✅ Main copy merged alongside sections")
+else:
+    print("   ❌ Main copy missing")
+    all_passed = False
+
+# Test 3: Limit of 1 degrades to sequential
+print("\n3️⃣  Testing max_concurrent_calls=1...")
+agent = CopywritingAgent(viral_hooks=[], max_concurrent_calls=1)
+agent.genai_model = CopyModel(latency=0.01)
+agent._generate_content(blueprint, research_data={}, sections=[])
+if agent.genai_model.max_in_flight == 1:
+    print("   ✅ One call at a time")
+else:
+    print(f"   ❌ {agent.genai_model.max_in_flight} calls in flight")
+    all_passed = False
+
+
+class CombinedModel(CopyModel):
+    """Answers the combined prompt with every section except the last, then serves per-section calls"""
+
+    def __init__(self, drop):
+        super().__init__(latency=0.01)
+        self.drop = drop
+
+    def reply(self, prompt):
+        if 'PATTERN SECTIONS TO WRITE' in prompt:
+            return {
+                'hero': {'h1': 'Sozee vs Higgsfield'},
+                'problem': 'Problem', 'solution': 'Solution',
+                'features': [], 'comparison_table': [], 'final_cta': 'Start now',
+                'pattern_sections': {sid: {'heading': sid, 'content': []} for sid in expected_order if sid != self.drop}
+            }
+        return super().reply(prompt)
+
+
+# Test 4: Combined mode sends shared context once and splits the response
+print("\n4️⃣  Testing combined-copy mode...")
+agent = CopywritingAgent(viral_hooks=[], combined_copy=True)
+agent.genai_model = CombinedModel(drop=expected_order[-1])
+content = agent._generate_content(blueprint, research_data={'Audience_Insight_Agent': {'pain_points': ['burnout']}}, sections=[])
+
+combined_prompt = agent.genai_model.prompts[0]
+if combined_prompt.count('RESEARCH DATA') == 1 and all(f'(ID: {sid})' in combined_prompt for sid in expected_order):
+    print("   ✅ One prompt covers every section with research data sent once")
+else:
+    print("   ❌ Combined prompt incomplete")
+    all_passed = False
+
+if list(content['pattern_sections']) == expected_order and 'pattern_sections' in content and content['hero']['h1']:
+    print("   ✅ Response split into content + pattern_sections in template order")
+else:
+    print(f"   ❌ Sections: {list(content.get('pattern_sections', {}))}")
+    all_passed = False
+
+if agent.genai_model.calls == 2:
+    print("   ✅ Only the section missing from the response was generated separately")
+else:
+    print(f"   ❌ Expected 2 calls, got {agent.genai_model.calls}")
+    all_passed = False
+
+# Test 5: Default mode prompt has no combined block
+print("\n5️⃣  Testing default mode is unchanged...")
+agent = CopywritingAgent(viral_hooks=[])
+agent.genai_model = CombinedModel(drop=None)
+agent._generate_content(blueprint, research_data={}, sections=[])
+if not any('PATTERN SECTIONS TO WRITE' in p or '"pattern_sections"' in p for p in agent.genai_model.prompts):
+    print("   ✅ Per-section prompts only")
+else:
+    print("   ❌ Combined block leaked into default mode")
+    all_passed = False
+
+print("\n" + "=" * 60)
+print("✅ All Copywriting Concurrency Tests Passed" if all_passed else "⚠️ Some Copywriting Concurrency Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
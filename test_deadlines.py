@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Deadlines Test (no API required)
+Tests per-call request timeouts, per-agent and per-page deadlines, cancellation of abandoned tasks,
+fallback output, research that is never cached or saved after a deadline and PageOutput flags
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import deadlines
+from utils.deadlines import PageDeadline
+from utils.concurrency import LIMITER
+from utils.call_scheduler import SCHEDULER
+from utils.model_router import ModelRouter
+from utils.competitor_kb import CompetitorKnowledgeBase
+from agent_framework import AgentMessage, BaseAgent, PageOutput
+from agents.competitor_research import CompetitorResearchAgent
+from pseo_orchestrator import AgentManager
+from fake_gemini import FakeModel
+
+print("=" * 60)
+print("Deadlines Test")
+print("=" * 60)
+
+all_passed = True
+
+
+class CriticalAgent(BaseAgent):
+    """No fallback output, so never cut short"""
+
+    def __init__(self):
+        super().__init__('Copywriting_Agent', 'Copywriter')
+
+    def execute(self, message):
+        time.sleep(0.2)
+        return self.create_response(message, status='completed', data={'content': {}})
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+def manager_for(config):
+    router = ModelRouter({'default': {'model': 'fake-model'}, **config})
+    return AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='test', router=router)
+
+
+def send(manager, to_agent, task, context=None):
+    return manager.send_message(from_agent='orchestrator', to_agent=to_agent, task=task,
+                                context=context or {'blueprint': {'pattern_id': '1', 'pseo_variables': {}}})
+
+
+# Test 1: Each call carries the route's request timeout
+print("\n1️⃣  Testing per-call request timeout...")
+manager = manager_for({'agents': {'faq_generator': {'timeout_seconds': 20}}})
+model = FakeModel()
+manager.agents['faq_generator'].genai_model = model
+response = send(manager, 'FAQ_Generator_Agent', {'pattern_id': '1', 'count': 5})
+check(model.request_options == [{'timeout': 20}] and response.status == 'completed',
+      "generate_content called with request_options timeout=20s", f"request_options={model.request_options}")
+check(ModelRouter.load().route('copywriting').timeout_seconds and ModelRouter.load().deadlines.get('page_seconds'),
+      "Shipped routing config sets call timeouts and a page deadline", "no timeouts in config")
+
+# Test 2: A non-critical agent that misses its deadline falls back
+print("\n2️⃣  Testing per-agent deadline...")
+manager = manager_for({'deadlines': {'agents': {'statistics': 0.2}}})
+manager.agents['statistics'].genai_model = FakeModel(latency=1.0)
+page = PageDeadline()
+token = deadlines.begin_page(page)
+started = time.time()
+try:
+    response = send(manager, 'Statistics_Agent', {'pattern_id': '6', 'audience': 'Creators', 'platform': 'OnlyFans'})
+finally:
+    deadlines.end_page(token)
+elapsed = time.time() - started
+check(response.status == 'degraded' and response.data.get('key_statistics') and elapsed < 0.8,
+      f"Statistics cut off after {elapsed:.1f}s with fallback statistics", f"status={response.status}, {elapsed:.1f}s")
+check(page.degraded == ['statistics'], "Page records the degraded agent", f"degraded={page.degraded}")
+
+# Test 3: Page deadline
+print("\n3️⃣  Testing per-page deadline...")
+manager = manager_for({})
+faq_model = FakeModel()
+manager.agents['faq_generator'].genai_model = faq_model
+manager.agents['copywriting'] = CriticalAgent()
+page = PageDeadline(seconds=0.1)
+token = deadlines.begin_page(page)
+try:
+    time.sleep(0.15)
+    faq = send(manager, 'FAQ_Generator_Agent', {'pattern_id': '1', 'count': 3})
+    copy = send(manager, 'Copywriting_Agent', {})
+finally:
+    deadlines.end_page(token)
+check(faq.status == 'degraded' and len(faq.data['faqs']) == 3 and not faq_model.calls,
+      "FAQ after the page deadline: fallback FAQs, no Gemini call", f"status={faq.status}, calls={faq_model.calls}")
+check(copy.status == 'completed' and page.degraded == ['faq_generator'],
+      "Critical agents (no fallback) still run to completion", f"copy={copy.status}, degraded={page.degraded}")
+check(deadlines.current_page() is None and manager._task_deadline('faq_generator', manager.agents['faq_generator'], None)
+      is None, "No deadline outside a page when none is configured", "deadline leaked")
+
+# Test 4: An abandoned task frees its scheduler slot at once, its limiter slot when the call returns,
+# and makes no further Gemini calls
+print("\n4️⃣  Testing cancellation of abandoned tasks...")
+# Calls abandoned by earlier tests hold their limiter slots until they return
+waited = time.time()
+while LIMITER.snapshot()['in_flight'] and time.time() - waited < 3:
+    time.sleep(0.05)
+manager = manager_for({'deadlines': {'agents': {'faq_generator': 0.1}}})
+model = FakeModel(latencies=[0.4], replies=['not json'])  # An invalid first reply would be retried
+manager.agents['faq_generator'].genai_model = model
+faq = send(manager, 'FAQ_Generator_Agent', {'pattern_id': '1', 'count': 5})
+running = SCHEDULER.snapshot()['faq_generator']['running']
+in_flight = LIMITER.snapshot()['in_flight']
+check(faq.status == 'degraded' and running == 0 and in_flight == 1,
+      "Scheduler slot freed when the deadline fired; limiter slot held while the call is in flight",
+      f"status={faq.status}, running={running}, in_flight={in_flight}")
+time.sleep(0.6)
+check(model.calls == 1 and LIMITER.snapshot()['in_flight'] == 0,
+      "Limiter slot freed when the abandoned call returned, no retry", f"calls={model.calls}")
+
+# Test 5: Deadline pool sized from the scheduler limits; time queued for a worker does not count
+print("\n5️⃣  Testing deadline pool...")
+manager_for({'agent_limits': {'limits': {'statistics': 2, 'faq_generator': 3}}})
+# statistics 2 + FAQ 3 + unlimited SEO, comparison table and schema at the largest limit (3 each)
+check(deadlines._max_workers == 14, "Pool workers = limits of agents that can be cut off",
+      f"workers={deadlines._max_workers}")
+deadlines.configure(max_workers=1)
+deadlines._pool().submit(time.sleep, 0.3)
+try:
+    result = deadlines.call_with_deadline(lambda: 'done', 0.1)
+except deadlines.DeadlineExceeded:
+    result = None
+check(result == 'done', "Task queued 0.3s behind a busy worker still had its full 0.1s", "queue time counted")
+
+# Test 6: PageOutput flag
+print("\n6️⃣  Testing PageOutput.degraded_agents...")
+output = PageOutput(page_id='p', pattern_id='1', status='completed', post_title='T', url_slug='t',
+                    meta_title='T', meta_description='D', hero_section={}, problem_agitation='',
+                    solution_overview='', degraded_agents=['faq_generator'])
+check(output.to_dict()['degraded_agents'] == ['faq_generator'] and 'degraded_agents' not in output.to_dict_public(),
+      "degraded_agents in the full export, not in public/WordPress output", "degraded_agents export wrong")
+
+# Test 7: Research abandoned at its deadline leaves the research cache and the KB unchanged
+print("\n7️⃣  Testing abandoned research is not cached or saved...")
+manager = manager_for({'deadlines': {'agents': {'statistics': 0.1}}})
+statistics = manager.agents['statistics']
+statistics.genai_model = FakeModel(latencies=[0.4], replies=['not json'])
+stats = send(manager, 'Statistics_Agent', {'pattern_id': '6', 'audience': 'Creators', 'platform': 'OnlyFans'})
+time.sleep(0.6)
+check(stats.status == 'degraded' and not statistics.research_cache,
+      "Statistics cut off: fallback returned, nothing cached once the call returned",
+      f"status={stats.status}, cache={list(statistics.research_cache)}")
+
+research = CompetitorResearchAgent()
+research.kb = CompetitorKnowledgeBase(os.path.join(tempfile.mkdtemp(), 'competitor_profiles.json'))
+research.genai_model = FakeModel(latencies=[0.4], replies=['not json'])
+message = AgentMessage(from_agent='orchestrator', to_agent='Competitor_Research_Agent', task_id='t',
+                       priority='high', task={'competitor': 'Krea', 'audience': 'Creators'}, context={})
+try:
+    deadlines.call_with_deadline(lambda: research.execute(message), 0.1)
+    abandoned = False
+except deadlines.DeadlineExceeded:
+    abandoned = True
+time.sleep(0.6)
+check(abandoned and research.kb.get_profile('Krea') is None and not research.research_cache,
+      "Competitor research cut off: no profile saved to the KB, nothing cached",
+      f"profile={research.kb.get_profile('Krea')}, cache={list(research.research_cache)}")
+
+research.genai_model = FakeModel(replies=['not json', 'not json'])
+failed = research.execute(message)
+check(failed.confidence == 0.5 and failed.data['competitor_data'] and research.kb.get_profile('Krea') is None
+      and not research.research_cache,
+      "Failed research answers with the fallback profile without saving or caching it",
+      f"profile={research.kb.get_profile('Krea')}, cache={list(research.research_cache)}")
+
+print("\n" + "=" * 60)
+print("✅ All Deadlines Tests Passed" if all_passed else "⚠️ Some Deadlines Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+FAQ Batching Test (no API required)
+Tests cross-page FAQ prefetch, per-page fallback, request sizing, same-pattern grouping in BatchProcessor
+and orchestrator prefetches running under the agent's route and scheduler slot
+"""
+
+import os
+import re
+import sys
+import json
+import tempfile
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agents.faq_generator import FAQGeneratorAgent
+from agent_framework import AgentMessage
+from batch_generator import BatchProcessor
+from fake_gemini import FakeModel
+from pseo_orchestrator import PSEOOrchestrator
+from utils import model_router
+from utils.call_scheduler import SCHEDULER
+
+print("=" * 60)
+print("FAQ Batching Test")
+print("=" * 60)
+
+all_passed = True
+
+
+class FAQModel(FakeModel):
+    """Batched prompts get one slice per page (page_2 malformed); single prompts get a list"""
+
+    def reply(self, prompt):
+        faq = [{'question': 'Is Sozee worth it?', 'answer': 'Yes.'}]
+        page_ids = re.findall(r'^### (page_\d+)$', prompt, flags=re.MULTILINE)
+        if page_ids:
+            return {page_id: ('not a list' if page_id == 'page_2' else faq * 5) for page_id in page_ids}
+        return faq * 5
+
+
+def run_faq(agent, variables):
+    message = AgentMessage(
+        from_agent='orchestrator', to_agent='FAQ_Generator_Agent', task_id='t', priority='medium',
+        task={'pattern_id': '1', 'count': 5}, context={'blueprint': {'pseo_variables': variables}}
+    )
+    return agent.execute(message).data['faqs']
+
+
+pages = [{'competitor': c, 'audience': 'OnlyFans Creators'} for c in ['Higgsfield', 'Krea', 'Leonardo']]
+
+# Test 1: One request covers several pages
+print("\n1️⃣  Testing batched prefetch...")
+agent = FAQGeneratorAgent()
+agent.genai_model = FAQModel()
+cached = agent.prefetch('1', pages, count=5)
+prompt = agent.genai_model.prompts[0]
+if cached == 2 and len(agent.genai_model.prompts) == 1 and prompt.count('Sozee Key Facts') == 1:
+    print("   ✅ 3 pages in one request, facts block sent once, malformed slice skipped")
+else:
+    print(f"   ❌ cached={cached}, requests={len(agent.genai_model.prompts)}")
+    all_passed = False
+
+# Test 2: Cached pages skip the API; malformed slice falls back to a per-page call
+print("\n2️⃣  Testing per-page fallback...")
+first = run_faq(agent, pages[0])
+calls_after_cached = len(agent.genai_model.prompts)
+second = run_faq(agent, pages[1])
+if len(first) == 5 and calls_after_cached == 1 and len(second) == 5 and len(agent.genai_model.prompts) == 2:
+    print("   ✅ Prefetched page used cache, failed slice generated individually")
+else:
+    print(f"   ❌ Unexpected call count: {len(agent.genai_model.prompts)}")
+    all_passed = False
+
+if not agent.is_prefetched('1', pages[0], 5):
+    print("   ✅ Cache entry released after use")
+else:
+    print("   ❌ Cache entry kept after use")
+    all_passed = False
+
+# Test 3: Large groups are split into requests whose replies fit the output cap
+print("\n3️⃣  Testing request sizing...")
+agent = FAQGeneratorAgent()
+agent.genai_model = FAQModel()
+many = [{'competitor': f'Tool {i}', 'audience': 'OnlyFans Creators'} for i in range(7)]
+agent.prefetch('1', many, count=5)
+pages_per_request = [len(re.findall(r'^### page_\d+$', p, flags=re.MULTILINE)) for p in agent.genai_model.prompts]
+max_output_tokens = [config.max_output_tokens for config in agent.genai_model.configs]
+if (FAQGeneratorAgent.max_batch_pages(5) == 3 and FAQGeneratorAgent.max_batch_pages(10) == 1
+        and pages_per_request == [3, 3, 1]):
+    print("   ✅ 7 pages of 5 FAQs sent as 3 + 3 + 1 pages (10 FAQs: one page per request)")
+else:
+    print(f"   ❌ Pages per request: {pages_per_request}")
+    all_passed = False
+if all(tokens <= 8192 and tokens >= 400 * 5 * pages
+       for tokens, pages in zip(max_output_tokens, pages_per_request)):
+    print("   ✅ Every request allows 400 tokens per FAQ within the 8192 cap")
+else:
+    print(f"   ❌ max_output_tokens: {max_output_tokens}")
+    all_passed = False
+
+# Test 4: BatchProcessor groups pending pages by pattern
+print("\n4️⃣  Testing same-pattern grouping...")
+
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.groups = []
+        self.cached = set()
+
+    def prefetch_faqs(self, pattern_id, variables_list):
+        self.groups.append((pattern_id, [v['competitor'] for v in variables_list]))
+        self.cached.update((pattern_id, v['competitor']) for v in variables_list)
+        return len(variables_list)
+
+    def has_prefetched_faqs(self, pattern_id, variables):
+        return (pattern_id, variables['competitor']) in self.cached
+
+
+tasks_df = pd.DataFrame([
+    {'pattern_id': '1', 'priority': 'HIGH', 'competitor': 'A'},
+    {'pattern_id': '4', 'priority': 'HIGH', 'competitor': 'B'},
+    {'pattern_id': '1', 'priority': 'HIGH', 'competitor': 'C'},
+    {'pattern_id': '1', 'priority': 'HIGH', 'competitor': 'D'},
+    {'pattern_id': '4', 'priority': 'HIGH', 'competitor': 'E'},
+])
+orchestrator = FakeOrchestrator()
+processor = BatchProcessor(orchestrator, output_dir=tempfile.mkdtemp(), faq_batch_size=2)
+for idx in range(len(tasks_df)):
+    processor._prefetch_faqs(tasks_df, idx)
+
+expected = [('1', ['A', 'C']), ('4', ['B', 'E'])]
+if orchestrator.groups == expected:
+    print("   ✅ Groups of K pages per pattern, lone leftover page generated per page")
+else:
+    print(f"   ❌ Groups: {orchestrator.groups}")
+    all_passed = False
+
+# Test 5: Orchestrator prefetches run like agent tasks
+print("\n5️⃣  Testing prefetch route and scheduler slot...")
+
+
+class WatchedModel(FAQModel):
+    """Records the active route's agent and the agent's running scheduler slots during each call"""
+
+    def __init__(self, agent):
+        super().__init__()
+        self.agent = agent
+        self.seen = []
+
+    def reply(self, prompt):
+        route = model_router.active_route()
+        self.seen.append((route.agent if route else None, SCHEDULER.running.get(self.agent, 0)))
+        return super().reply(prompt)
+
+
+with open('config/patterns.json', 'r') as f:
+    patterns_data = json.load(f)
+orchestrator = PSEOOrchestrator({'pattern_library': patterns_data, 'variables': {}, 'gemini_api_key': 'test'})
+faq_model = WatchedModel('faq_generator')
+seo_model = WatchedModel('seo_optimizer')
+orchestrator.agent_manager.agents['faq_generator'].genai_model = faq_model
+orchestrator.agent_manager.agents['seo_optimizer'].genai_model = seo_model
+orchestrator.prefetch_faqs('1', pages)
+orchestrator.prefetch_metadata([{'pattern_id': '1', 'variables': pages[0]}])
+
+if faq_model.seen and all(seen == ('faq_generator', 1) for seen in faq_model.seen):
+    print("   ✅ FAQ prefetch ran under the faq_generator route in its scheduler slot")
+else:
+    print(f"   ❌ FAQ prefetch calls saw (route, running slots) {faq_model.seen}")
+    all_passed = False
+
+if seo_model.seen and all(seen == ('seo_optimizer', 1) for seen in seo_model.seen):
+    print("   ✅ SEO prefetch ran under the seo_optimizer route in its scheduler slot")
+else:
+    print(f"   ❌ SEO prefetch calls saw (route, running slots) {seo_model.seen}")
+    all_passed = False
+
+print("\n" + "=" * 60)
+print("✅ All FAQ Batching Tests Passed" if all_passed else "⚠️ Some FAQ Batching Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
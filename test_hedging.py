@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Hedged Request Test (no API required)
+Tests p95 tracking, hedging slow calls, first-valid-wins, the hedge-rate cap and routed agent calls
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import llm_client
+from utils.hedging import Hedger, HEDGER
+from utils.model_router import ModelRouter
+from pseo_orchestrator import AgentManager
+from fake_gemini import FakeModel
+
+print("=" * 60)
+print("Hedged Request Test")
+print("=" * 60)
+
+all_passed = True
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+def warm(hedger, key, latency=0.01, count=20):
+    for _ in range(count):
+        hedger.record(key, latency)
+    with hedger.lock:
+        hedger.calls += count
+
+
+# Test 1: Running percentile
+print("\n1️⃣  Testing running p95...")
+hedger = Hedger(enabled=True, min_samples=20)
+check(hedger.threshold('copywriting') is None, "No threshold before min_samples", "threshold too early")
+for latency in range(1, 101):
+    hedger.record('copywriting', latency / 100)
+check(hedger.threshold('copywriting') == 0.95, "p95 of 0.01..1.00s is 0.95s",
+      f"p95={hedger.threshold('copywriting')}")
+
+# Test 2: Slow call is hedged and the fast duplicate wins
+print("\n2️⃣  Testing hedged slow call...")
+hedger = Hedger(enabled=True, min_samples=20, max_hedge_rate=0.5)
+warm(hedger, 'faq')
+model = FakeModel(latencies=[0.5, 0.0])
+start = time.time()
+result = hedger.run('faq', lambda: model.generate_content('p').text)
+elapsed = time.time() - start
+check(elapsed < 0.3 and model.calls == 2 and hedger.snapshot()['hedge_wins'] == 1,
+      f"Hedge answered in {elapsed:.2f}s instead of 0.5s", f"elapsed={elapsed:.2f}s calls={model.calls}")
+
+# Test 3: First valid response wins (invalid fast reply waits for the other)
+print("\n3️⃣  Testing first valid response wins...")
+hedger = Hedger(enabled=True, min_samples=20, max_hedge_rate=0.5)
+warm(hedger, 'faq')
+original = llm_client.HEDGER
+llm_client.HEDGER = hedger
+try:
+    model = FakeModel(latencies=[0.3, 0.0], replies=[[{'question': 'Q?', 'answer': 'A.'}] * 5, 'not json'])
+    faqs = llm_client.generate_json(model, 'FAQ prompt', 'faqs', 1000, 0.5, retries=0, hedge_key='faq')
+finally:
+    llm_client.HEDGER = original
+check(len(faqs) == 5 and model.calls == 2, "Invalid hedge reply ignored; slower valid reply returned",
+      f"calls={model.calls}")
+
+# Test 4: Hedge rate cap
+print("\n4️⃣  Testing hedge-rate cap...")
+hedger = Hedger(enabled=True, min_samples=20, max_hedge_rate=0.1)
+warm(hedger, 'seo')
+model = FakeModel(latencies=[0.1] * 10)
+for _ in range(5):
+    hedger.run('seo', lambda: model.generate_content('p').text)
+stats = hedger.snapshot()
+check(stats['hedged'] <= 0.1 * stats['calls'] and stats['hedged'] == 2,
+      f"{stats['hedged']} hedges over {stats['calls']} calls (cap 10%)", f"stats={stats}")
+
+disabled = Hedger(enabled=False, min_samples=1)
+warm(disabled, 'seo')
+model = FakeModel(latencies=[0.1])
+disabled.run('seo', lambda: model.generate_content('p').text)
+check(model.calls == 1 and disabled.snapshot()['hedged'] == 0, "Disabled hedger never duplicates", "hedged while off")
+
+# Test 5: Time queued for a pool worker does not count toward p95
+print("\n5️⃣  Testing queued primary...")
+hedger = Hedger(enabled=True, min_samples=20, max_hedge_rate=0.5, max_workers=1)
+warm(hedger, 'faq', latency=0.1)
+blocker = hedger._pool().submit(time.sleep, 0.3)
+model = FakeModel(latencies=[0.05])
+hedger.run('faq', lambda: model.generate_content('p').text)
+check(model.calls == 1 and hedger.snapshot()['hedged'] == 0,
+      "Primary queued 0.3s behind a busy worker, then answered within p95: no hedge",
+      f"calls={model.calls} stats={hedger.snapshot()}")
+
+# Test 6: Routed agent calls hedge per agent and keep the route in the hedge thread
+print("\n6️⃣  Testing routed agent hedging...")
+router = ModelRouter({
+    'default': {'model': 'default-model'},
+    'hedging': {'enabled': True, 'min_samples': 20, 'max_hedge_rate': 0.5}
+})
+manager = AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='test', router=router)
+warm(HEDGER, 'faq_generator')
+model = FakeModel(latencies=[0.5])
+manager.agents['faq_generator'].genai_model = model
+start = time.time()
+response = manager.send_message(
+    from_agent='orchestrator', to_agent='FAQ_Generator_Agent', task={'pattern_id': '1', 'count': 5},
+    context={'blueprint': {'pattern_id': '1', 'pseo_variables': {'competitor': 'Krea'}}}
+)
+elapsed = time.time() - start
+check(len(response.data['faqs']) == 5 and model.calls == 2 and elapsed < 0.3,
+      f"FAQ agent hedged on its own p95 ({elapsed:.2f}s)", f"calls={model.calls} elapsed={elapsed:.2f}s")
+HEDGER.configure(enabled=False)
+
+print("\n" + "=" * 60)
+print("✅ All Hedged Request Tests Passed" if all_passed else "⚠️ Some Hedged Request Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Static HTML Renderer Test (no API required)
+Tests StaticSiteRenderer templates, markdown conversion and site tree output
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.html_renderer import StaticSiteRenderer, markdown_to_html
+from agent_framework import PageOutput
+
+print("=" * 60)
+print("Static HTML Renderer Test")
+print("=" * 60)
+
+with open('config/patterns.json', 'r') as f:
+    patterns = json.load(f)
+
+all_passed = True
+
+# Test 1: Markdown conversion
+print("\n1️⃣  Testing markdown_to_html()...")
+md = "# The Challenge\n\nFans want **100x** more content.\n\n- Burnout\n- Unstable revenue"
+converted = markdown_to_html(md)
+expected_parts = ['<h1>The Challenge</h1>', '<strong>100x</strong>', '<ul><li>Burnout</li><li>Unstable revenue</li></ul>']
+if all(part in converted for part in expected_parts):
+    print("   ✅ Headings, bold and lists converted")
+else:
+    print(f"   ❌ Unexpected output: {converted}")
+    all_passed = False
+
+markdown_to_html(md)
+if markdown_to_html.cache_info().hits >= 1:
+    print("   ✅ Conversion is memoized")
+else:
+    print("   ❌ Conversion cache not used")
+    all_passed = False
+
+# Test 2: Templates compiled once per pattern
+print("\n2️⃣  Testing per-pattern template compilation...")
+site_dir = tempfile.mkdtemp()
+renderer = StaticSiteRenderer(patterns, site_dir=site_dir)
+print(f"   Compiled templates: {sorted(renderer.templates.keys())}")
+if len(renderer.templates) == len(patterns['patterns']):
+    print("   ✅ One template per pattern")
+else:
+    print("   ❌ Template count mismatch")
+    all_passed = False
+
+# Test 3: Render and write a page
+print("\n3️⃣  Testing render_page() and write_page()...")
+# The public export batch_generator.py renders (no pseo_variables)
+page = PageOutput(
+    page_id='pat1_higgs_onlyf',
+    pattern_id='1',
+    status='completed',
+    post_title='Sozee vs Higgsfield for OnlyFans Agencies',
+    url_slug='/sozee-vs-higgsfield-for-onlyfans-agencies',
+    meta_title='Sozee vs Higgsfield for OnlyFans Agencies | Sozee',
+    meta_description='Compare Sozee & Higgsfield.',
+    hero_section={'h1': 'Sozee vs Higgsfield for OnlyFans Agencies', 'subtitle': '3 photos, infinite content'},
+    problem_agitation='# The Challenge\n\nBurnout is real.',
+    solution_overview='## How Sozee Solves This\n\nUpload 3 photos.',
+    comparison_table_json=[{'feature': 'Setup Time', 'sozee': 'Instant', 'competitor': 'Training', 'sozee_advantage': True}],
+    feature_sections=[{'title': 'Instant Setup', 'content': 'No training.'}],
+    faq_json=[{'question': 'What is Sozee?', 'answer': 'An AI Content Studio.'}],
+    final_cta='Start your free trial.',
+    schema_markup=[
+        {'@type': 'WebPage', 'url': 'https://sozee.ai/[page-slug]'},
+        {'@type': 'FAQPage', 'mainEntity': []}
+    ],
+    pseo_variables={'competitor': 'Higgsfield', 'audience': 'OnlyFans Agencies'},
+    generated_at='2025-01-01T00:00:00'
+).to_dict_public()
+
+path = renderer.write_page(page)
+with open(path, 'r', encoding='utf-8') as f:
+    rendered = f.read()
+
+checks = {
+    'written under url_slug': path == os.path.join(site_dir, 'sozee-vs-higgsfield-for-onlyfans-agencies', 'index.html'),
+    'JSON-LD embedded': 'application/ld+json' in rendered and '@graph' in rendered,
+    'page-slug placeholder replaced': '[page-slug]' not in rendered,
+    'comparison table rendered': '<table>' in rendered,
+    'comparison column named after the competitor': '<th>Higgsfield</th>' in rendered,
+    'FAQ rendered': '<summary>What is Sozee?</summary>' in rendered,
+    'meta description escaped': 'Compare Sozee &amp; Higgsfield.' in rendered
+}
+for name, ok in checks.items():
+    print(f"   {'✅' if ok else '❌'} {name}")
+    all_passed = all_passed and ok
+
+# Test 4: Pattern without comparison table skips the section
+print("\n4️⃣  Testing pattern-specific layout...")
+review_page = dict(page, pattern_id='5', url_slug='/sozee-review-onlyfans-agencies')
+if '<table>' not in renderer.render_page(review_page):
+    print("   ✅ Review pattern omits comparison table")
+else:
+    print("   ❌ Review pattern rendered a comparison table")
+    all_passed = False
+
+# Test 5: Parallel rendering
+print("\n5️⃣  Testing render_site() across worker processes...")
+pages = [dict(page, page_id=f"p{i}", url_slug=f"/page-{i}") for i in range(20)]
+paths = renderer.render_site(pages, workers=2)
+if len(paths) == 20 and all(os.path.exists(p) for p in paths):
+    print("   ✅ All pages written")
+else:
+    print("   ❌ Parallel render incomplete")
+    all_passed = False
+
+print("\n" + "=" * 60)
+print("✅ All Renderer Tests Passed" if all_passed else "⚠️ Some Renderer Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+JSON Repair Test (no API required)
+Tests salvaging truncated/malformed model output and that generate_json keeps it instead of regenerating
+"""
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.json_repair import parse_json
+from utils.llm_client import generate_json
+from fake_gemini import FakeModel
+
+print("=" * 60)
+print("JSON Repair Test")
+print("=" * 60)
+
+all_passed = True
+
+# Test 1: Repair cases
+print("\n1️⃣  Testing repairs...")
+cases = [
+    ('{"hero": {"h1": "Sozee"}, "final_cta": "Start yo', {'hero': {'h1': 'Sozee'}, 'final_cta': 'Start yo'}, True),
+    ('{"problem": "x", "solu', {'problem': 'x'}, True),
+    ('{"problem": "x", "solution": ', {'problem': 'x'}, True),
+    ('{"counts": [1, 2, tru', {'counts': [1, 2]}, True),
+    ('```json\n{"a": 1, // note\n "b": [1, 2,],}\n```', {'a': 1, 'b': [1, 2]}, True),
+    ('Here is the JSON: {"a": True, "b": None} Hope this helps!', {'a': True, 'b': None}, True),
+    ('{"a": "caf\\u00', {'a': 'caf'}, True),
+    ('{"a": "line\\\\', {'a': 'line\\'}, True),
+    ('{"a": {"b": {"c": "d"', {'a': {'b': {'c': 'd'}}}, True),
+    ('{"a": "b"}', {'a': 'b'}, False),
+]
+for text, expected, expected_repaired in cases:
+    data, repaired = parse_json(text)
+    if data == expected and repaired == expected_repaired:
+        print(f"   ✅ {text[:40]!r}")
+    else:
+        print(f"   ❌ {text[:40]!r} -> {data}, repaired={repaired}")
+        all_passed = False
+
+try:
+    parse_json('Sorry, I cannot help with that.')
+    print("   ❌ Non-JSON text parsed")
+    all_passed = False
+except json.JSONDecodeError:
+    print("   ✅ Non-JSON text still raises")
+
+
+# Test 2: Truncated table salvaged without a second call
+print("\n2️⃣  Testing truncated response salvage...")
+rows = [{'feature': f'Feature {i}', 'sozee': 'Yes', 'competitor': 'No'} for i in range(7)]
+truncated = json.dumps(rows)[:-40]  # Cut mid-way through the last row
+model = FakeModel([truncated])
+table = generate_json(model, 'Compare', 'comparison_table', max_output_tokens=2000, temperature=0.3)
+if model.calls == 1 and table == rows[:6]:
+    print("   ✅ 6 complete rows kept, partial last row dropped, no regeneration")
+else:
+    print(f"   ❌ {model.calls} calls, {len(table)} rows")
+    all_passed = False
+
+# Test 3: Truncated copy keeps the closed-off string
+print("\n3️⃣  Testing truncated section salvage...")
+section = '{"heading": "Why creators switch", "content": [{"item_body": "Three photos in, unlimited con'
+model = FakeModel([section])
+result = generate_json(model, 'Section', 'pattern_section', max_output_tokens=2000, temperature=0.8)
+if model.calls == 1 and result['content'][0]['item_body'] == 'Three photos in, unlimited con':
+    print("   ✅ Section salvaged from one call")
+else:
+    print(f"   ❌ {model.calls} calls, {result}")
+    all_passed = False
+
+print("\n" + "=" * 60)
+print("✅ All JSON Repair Tests Passed" if all_passed else "⚠️ Some JSON Repair Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
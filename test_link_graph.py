@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Link Graph Builder Test (no API required)
+Tests related-page selection and posting-list capping on a large matrix
+"""
+
+import os
+import sys
+import time
+import itertools
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.link_graph import LinkGraphBuilder
+
+print("=" * 60)
+print("Link Graph Builder Test")
+print("=" * 60)
+
+all_passed = True
+
+# Test 1: Same competitor across patterns 1/4/5 ranks first
+print("\n1️⃣  Testing related-page ranking...")
+builder = LinkGraphBuilder(top_k=3)
+builder.add_page('pat1_higgs_onlyf', '1', {'competitor': 'Higgsfield', 'audience': 'OnlyFans Creators'}, '/sozee-vs-higgsfield-for-onlyfans-creators', 'Sozee vs Higgsfield')
+builder.add_page('pat4_higgs_onlyf', '4', {'competitor': 'Higgsfield', 'audience': 'OnlyFans Creators'}, '/higgsfield-alternative-for-onlyfans-creators', 'Higgsfield Alternative')
+builder.add_page('pat5_higgs_onlyf', '5', {'competitor': 'Higgsfield', 'audience': 'OnlyFans Creators'}, '/sozee-review-onlyfans-creators', 'Sozee Review')
+builder.add_page('pat1_krea_onlyf', '1', {'competitor': 'Krea', 'audience': 'OnlyFans Creators'}, '/sozee-vs-krea-for-onlyfans-creators', 'Sozee vs Krea')
+builder.add_page('pat1_krea_conte', '1', {'competitor': 'Krea', 'audience': 'Content Creators'}, '/sozee-vs-krea-for-content-creators', 'Sozee vs Krea')
+graph = builder.build()
+
+related = [link['page_id'] for link in graph['pat1_higgs_onlyf']]
+print(f"   Related to pat1_higgs_onlyf: {related}")
+if set(related[:2]) == {'pat4_higgs_onlyf', 'pat5_higgs_onlyf'}:
+    print("   ✅ Same competitor across patterns ranked first")
+else:
+    print("   ❌ Unexpected ranking")
+    all_passed = False
+
+if 'pat1_higgs_onlyf' not in related and 'pat1_krea_conte' not in related:
+    print("   ✅ No self links, unrelated pages excluded")
+else:
+    print("   ❌ Self link or unrelated page present")
+    all_passed = False
+
+# Test 2: Large matrix stays near-linear
+print("\n2️⃣  Testing large matrix build...")
+
+
+def build_matrix(competitors, audiences, platforms):
+    builder = LinkGraphBuilder(top_k=5, max_postings=200)
+    combos = itertools.product(range(competitors), range(audiences), range(platforms))
+    for c, a, p in combos:
+        builder.add_page(f"p_{c}_{a}_{p}", str(c % 6 + 1),
+                         {'competitor': f"C{c}", 'audience': f"A{a}", 'platform': f"P{p}"},
+                         f"/c{c}-a{a}-p{p}")
+    start = time.time()
+    graph = builder.build()
+    return graph, time.time() - start
+
+
+small_graph, small_time = build_matrix(20, 10, 10)
+large_graph, large_time = build_matrix(40, 20, 10)
+ratio = large_time / max(small_time, 1e-6)
+print(f"   2,000 pages: {small_time:.2f}s | 8,000 pages: {large_time:.2f}s (ratio {ratio:.1f}x)")
+
+if all(len(links) == 5 for links in large_graph.values()):
+    print("   ✅ Every page has top-K links")
+else:
+    print("   ❌ Some pages missing links")
+    all_passed = False
+
+if ratio < 8:
+    print("   ✅ Build time grows near-linearly")
+else:
+    print("   ❌ Build time grows super-linearly")
+    all_passed = False
+
+print("\n" + "=" * 60)
+print("✅ All Link Graph Tests Passed" if all_passed else "⚠️ Some Link Graph Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Model Failover Test (no API required)
+Tests cool-down on 429s, degraded and slow models, automatic recovery, and routed agent calls
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import model_router
+from utils.model_health import ModelHealth, FailoverModel, HEALTH
+from utils.model_router import ModelRouter
+from pseo_orchestrator import AgentManager
+from fake_gemini import FakeModel
+
+print("=" * 60)
+print("Model Failover Test")
+print("=" * 60)
+
+all_passed = True
+
+
+class APIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+# Test 1: 429 sends calls to the fallback for the cool-down window, then back
+print("\n1️⃣  Testing rate-limit failover and recovery...")
+health = ModelHealth(cooldown_seconds=0.3)
+primary, secondary = FakeModel(errors=[APIError(429)]), FakeModel()
+model = FailoverModel([('primary', primary), ('secondary', secondary)], health)
+model.generate_content('p')
+check(primary.calls == 1 and secondary.calls == 1, "429 served by the secondary", "no failover on 429")
+model.generate_content('p')
+check(primary.calls == 1 and secondary.calls == 2, "Primary skipped during cool-down", "primary retried during cool-down")
+time.sleep(0.35)
+model.generate_content('p')
+check(primary.calls == 2 and secondary.calls == 2, "Primary back after cool-down", "primary not restored")
+
+# Test 2: Degraded (5xx) trips after consecutive errors; other errors propagate
+print("\n2️⃣  Testing degraded model...")
+health = ModelHealth(cooldown_seconds=60, errors_to_trip=2)
+primary, secondary = FakeModel(errors=[APIError(503), APIError(503)]), FakeModel()
+model = FailoverModel([('primary', primary), ('secondary', secondary)], health)
+model.generate_content('p')
+model.generate_content('p')
+model.generate_content('p')
+check(primary.calls == 2 and health.snapshot()['primary']['trips'] == 1,
+      "Two 503s in a row put the primary in cool-down", f"primary calls={primary.calls}")
+
+broken = FailoverModel([('other', FakeModel(errors=[ValueError('bad request')])), ('secondary', FakeModel())], health)
+try:
+    broken.generate_content('p')
+    check(False, "", "non-retryable error swallowed")
+except ValueError:
+    check(True, "Non-retryable errors propagate without failover", "")
+
+# Test 3: Slow calls trip the latency threshold
+print("\n3️⃣  Testing latency threshold...")
+health = ModelHealth(cooldown_seconds=60, latency_threshold_seconds=0.02, slow_calls_to_trip=2)
+primary, secondary = FakeModel(latency=0.03), FakeModel()
+model = FailoverModel([('primary', primary), ('secondary', secondary)], health)
+for _ in range(4):
+    model.generate_content('p')
+check(primary.calls == 2 and secondary.calls == 2, "Two slow calls moved traffic to the secondary",
+      f"primary={primary.calls} secondary={secondary.calls}")
+
+# Test 4: Every model cooling down → soonest recovery is tried
+print("\n4️⃣  Testing all models cooling down...")
+health = ModelHealth(cooldown_seconds=60)
+primary, secondary = FakeModel(errors=[APIError(429)]), FakeModel(errors=[APIError(429)])
+model = FailoverModel([('primary', primary), ('secondary', secondary)], health)
+try:
+    model.generate_content('p')
+except APIError:
+    pass
+model.generate_content('p')
+check(primary.calls == 2, "Primary (first to recover) retried when no model is healthy", f"primary={primary.calls}")
+
+# Test 5: Routed agent calls use the chain from config
+print("\n5️⃣  Testing routed agent failover...")
+router = ModelRouter({
+    'default': {'model': 'primary-model', 'fallbacks': ['backup-model', 'primary-model']},
+    'failover': {'cooldown_seconds': 60}
+})
+check(router.route('faq_generator').fallbacks == ('backup-model',), "Primary removed from its own fallbacks",
+      f"fallbacks={router.route('faq_generator').fallbacks}")
+
+manager = AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='test', router=router)
+limited, backup = FakeModel(errors=[APIError(429)]), FakeModel()
+manager.agents['faq_generator'].genai_model = limited
+model_router._models['backup-model'] = backup
+for competitor in ['Krea', 'Leonardo']:
+    response = manager.send_message(
+        from_agent='orchestrator', to_agent='FAQ_Generator_Agent', task={'pattern_id': '1', 'count': 5},
+        context={'blueprint': {'pattern_id': '1', 'pseo_variables': {'competitor': competitor}}}
+    )
+check(limited.calls == 1 and backup.calls == 2 and len(response.data['faqs']) == 5,
+      "Agent kept generating on the backup model instead of falling back to canned FAQs",
+      f"primary={limited.calls} backup={backup.calls}")
+check(HEALTH.cooldown_seconds == 60, "Failover settings loaded from the routing config", "settings not applied")
+
+print("\n" + "=" * 60)
+print("✅ All Model Failover Tests Passed" if all_passed else "⚠️ Some Model Failover Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Model Routing Test (no API required)
+Tests per-agent/per-pattern routes, route activation around agent tasks and the routing record
+"""
+
+import os
+import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import model_router
+from utils.model_router import ModelRouter
+from pseo_orchestrator import AgentManager
+from fake_gemini import FakeModel
+
+print("=" * 60)
+print("Model Routing Test")
+print("=" * 60)
+
+all_passed = True
+
+ROUTING = {
+    'default': {'model': 'default-model'},
+    'agents': {
+        'copywriting': {'model': 'strong-model'},
+        'faq_generator': {'model': 'fast-model', 'max_output_tokens': 1000}
+    },
+    'patterns': {
+        '6': {'faq_generator': {'model': 'crisis-model', 'temperature': 0.2}},
+        '5': {'copywriting': {'temperature': 0.3}}
+    }
+}
+
+
+class RoutedModel(FakeModel):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def reply(self, prompt):
+        section = re.search(r'\(ID: (\w+)\)', prompt)
+        if section:
+            return {'heading': section.group(1), 'content': []}
+        if 'FAQ' in prompt:
+            return [{'question': 'Q?', 'answer': 'A.'}] * 5
+        return {'hero': {'h1': 'Sozee'}, 'problem': 'P', 'solution': 'S', 'features': [], 'final_cta': 'Go'}
+
+
+# Test 1: Route resolution
+print("\n1️⃣  Testing route resolution...")
+router = ModelRouter(ROUTING)
+checks = [
+    (router.route('seo_optimizer').model, 'default-model'),
+    (router.route('faq_generator', '1'), model_router.Route('faq_generator', 'fast-model', 1000, None)),
+    (router.route('faq_generator', '6'), model_router.Route('faq_generator', 'crisis-model', 1000, 0.2)),
+    (router.route('faq_generator', 6).model, 'crisis-model'),
+    (router.route('faq_generator', '6').apply(4000, 0.6), (1000, 0.2)),
+]
+if all(actual == expected for actual, expected in checks):
+    print("   ✅ Default, agent and pattern layers merge; max tokens capped, temperature overridden")
+else:
+    print(f"   ❌ {[actual for actual, _ in checks]}")
+    all_passed = False
+
+shipped = ModelRouter.load()
+if shipped.route('seo_optimizer').model != shipped.route('copywriting').model:
+    print("   ✅ Shipped config routes SEO and copywriting to different models")
+else:
+    print("   ❌ Shipped config does not differentiate agents")
+    all_passed = False
+
+# Test 2: AgentManager builds agents on their routed model and activates pattern routes
+print("\n2️⃣  Testing AgentManager routing...")
+manager = AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='test', router=router)
+if manager.agents['copywriting'].model == 'strong-model' and manager.agents['faq_generator'].model == 'fast-model':
+    print("   ✅ Agents constructed with their agent-level model")
+else:
+    print("   ❌ Agents not given routed models")
+    all_passed = False
+
+fast = RoutedModel('fast-model')
+crisis = RoutedModel('crisis-model')
+manager.agents['faq_generator'].genai_model = fast
+model_router._models['crisis-model'] = crisis
+
+
+def faq_task(pattern_id):
+    return manager.send_message(
+        from_agent='orchestrator', to_agent='FAQ_Generator_Agent',
+        task={'pattern_id': pattern_id, 'count': 5},
+        context={'blueprint': {'pattern_id': pattern_id, 'pseo_variables': {'competitor': 'Krea'}}}
+    )
+
+
+faq_task('1')
+faq_task('6')
+if (len(fast.configs) == 1 and len(crisis.configs) == 1 and fast.configs[0].max_output_tokens == 1000
+        and crisis.configs[0].temperature == 0.2):
+    print("   ✅ Pattern 6 FAQ call switched model and temperature; pattern 1 used the agent model")
+else:
+    print(f"   ❌ fast={len(fast.configs)} crisis={len(crisis.configs)}")
+    all_passed = False
+
+if model_router.active_route() is None:
+    print("   ✅ Route cleared after the task")
+else:
+    print("   ❌ Route leaked outside the task")
+    all_passed = False
+
+# Test 3: Copywriting worker threads keep the page route
+print("\n3️⃣  Testing route propagation to worker threads...")
+strong = RoutedModel('strong-model')
+manager.agents['copywriting'].genai_model = strong
+manager.send_message(
+    from_agent='orchestrator', to_agent='Copywriting_Agent', task={'sections': []},
+    context={'blueprint': {'pattern_id': '5', 'pattern_name': 'Review', 'pseo_variables': {'audience': 'Creators'}},
+             'research_data': {}}
+)
+temperatures = {config.temperature for config in strong.configs}
+if len(strong.configs) > 1 and temperatures == {0.3}:
+    print(f"   ✅ All {len(strong.configs)} copy/section calls used the pattern 5 temperature")
+else:
+    print(f"   ❌ Temperatures seen: {temperatures}")
+    all_passed = False
+
+# Test 4: Routing record
+print("\n4️⃣  Testing routing record...")
+record = router.describe(['copywriting', 'faq_generator', 'seo_optimizer'], '6')
+if record == 'strong-model: copywriting; crisis-model: faq_generator; default-model: seo_optimizer':
+    print(f"   ✅ {record}")
+else:
+    print(f"   ❌ {record}")
+    all_passed = False
+
+print("\n" + "=" * 60)
+print("✅ All Model Routing Tests Passed" if all_passed else "⚠️ Some Model Routing Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Priority Scheduling Test (no API required)
+Tests page scoring from pattern priority and variable tiers, matrix ordering, and high-before-low call queuing
+"""
+
+import os
+import sys
+import time
+import threading
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from batch_generator import PSEOMatrixGenerator
+from utils import concurrency
+from utils.concurrency import AdaptiveLimiter
+from pseo_orchestrator import AgentManager
+
+print("=" * 60)
+print("Priority Scheduling Test")
+print("=" * 60)
+
+all_passed = True
+
+VARIABLES = {
+    'competitors': {'high_priority': ['Higgsfield'], 'medium_priority': ['Krea'], 'low_priority': ['Civitai'],
+                    'all': ['Civitai', 'Krea', 'Higgsfield', 'Unlisted']},
+    'audiences': {'high_priority': ['Creators'], 'low_priority': ['Models'], 'all': ['Models', 'Creators']},
+    'platforms': {'all': ['OnlyFans']},
+    'tool_types': {'high_priority': ['Image Generator'], 'all': ['Image Generator']},
+    'use_cases': {'all': ['Ads']}
+}
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+# Test 1: Page scores
+print("\n1️⃣  Testing page scores...")
+matrix_gen = PSEOMatrixGenerator(variables_config=VARIABLES)
+top = matrix_gen.score_page({'pattern_id': '1', 'priority': 'HIGH', 'competitor': 'Higgsfield', 'audience': 'Creators'})
+mixed = matrix_gen.score_page({'pattern_id': '1', 'priority': 'HIGH', 'competitor': 'Krea', 'audience': 'Models'})
+unlisted = matrix_gen.score_page({'pattern_id': '1', 'priority': 'HIGH', 'competitor': 'Unlisted', 'audience': 'Models'})
+medium_pattern = matrix_gen.score_page({'pattern_id': '5', 'priority': 'MEDIUM', 'competitor': 'Higgsfield',
+                                        'audience': 'Creators'})
+check(top == 6 and mixed == 4.5 and unlisted == 4,
+      f"HIGH pattern: high/high {top}, medium/low {mixed}, untiered/low {unlisted}",
+      f"scores={top}, {mixed}, {unlisted}")
+check(medium_pattern == 5 and medium_pattern < top, f"MEDIUM pattern with high-tier variables scores {medium_pattern}",
+      f"medium_pattern={medium_pattern}")
+
+# Test 2: Matrix ordering before the limit
+print("\n2️⃣  Testing matrix ordering...")
+matrix = matrix_gen.generate_matrix(patterns=['1', '5'])
+ordered = matrix_gen.filter_matrix(matrix, patterns=['1', '5'])
+scores = [matrix_gen.score_page(row) for row in ordered.to_dict('records')]
+check(scores == sorted(scores, reverse=True) and list(ordered.index) == list(range(len(ordered))),
+      "Pages sorted by score (index reset for checkpoints)", f"scores={scores}")
+check(ordered.iloc[0][['pattern_id', 'competitor', 'audience']].tolist() == ['1', 'Higgsfield', 'Creators'],
+      "Highest-value page first", f"first={ordered.iloc[0].to_dict()}")
+limited = matrix_gen.filter_matrix(matrix, patterns=['1', '5'], limit=3)
+check(len(limited) == 3 and all(matrix_gen.score_page(r) >= 5 for r in limited.to_dict('records')),
+      "Limit keeps the top-scoring pages", f"limited={limited.to_dict('records')}")
+def tied(df):
+    return [tuple(row[k] for k in ('pattern_id', 'competitor', 'audience'))
+            for row in df.to_dict('records') if matrix_gen.score_page(row) == 4]
+
+
+check(tied(ordered) == tied(matrix) and len(tied(matrix)) > 1,
+      "Equal scores keep matrix order (stable, so resumes line up)", f"ties={tied(ordered)}")
+
+# Test 3: High-priority calls are served first from the limiter queue
+print("\n3️⃣  Testing call queue priority...")
+limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, max_limit=1)
+served = []
+holding = threading.Event()
+release = threading.Event()
+
+
+def hold():
+    with limiter.slot('hold', priority='high'):
+        holding.set()
+        release.wait()
+
+
+def call(priority):
+    with limiter.slot(priority, priority=priority):
+        served.append(priority)
+
+
+holder = threading.Thread(target=hold)
+holder.start()
+holding.wait()
+waiters = []
+for priority in ['low', 'medium', 'high']:
+    waiters.append(threading.Thread(target=call, args=(priority,)))
+    waiters[-1].start()
+    time.sleep(0.05)
+check(limiter.snapshot()['queued'] == 3, "3 calls queued behind a full limiter", f"snapshot={limiter.snapshot()}")
+release.set()
+for thread in [holder] + waiters:
+    thread.join()
+check(served == ['high', 'medium', 'low'], "Queued calls served high → medium → low", f"served={served}")
+
+# Test 4: AgentManager queues calls at the message priority
+print("\n4️⃣  Testing message priority...")
+manager = AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='test')
+seen = []
+
+
+class RecordingAgent:
+    def __init__(self, name):
+        self.name = name
+
+    def execute(self, message):
+        seen.append((self.name, message.priority, concurrency.call_priority()))
+        return SimpleNamespace(to_dict=lambda: {})
+
+
+manager.agents['faq_generator'] = RecordingAgent('faq')
+manager.agents['comparison_table'] = RecordingAgent('table')
+manager.execute_parallel_tasks([
+    {'agent': 'FAQ_Generator_Agent', 'params': {}, 'priority': 'medium'},
+    {'agent': 'Comparison_Table_Agent', 'params': {}, 'priority': 'high'}
+], context={})
+check(seen == [('table', 'high', 'high'), ('faq', 'medium', 'medium')],
+      "High-priority task runs first, its calls queued as 'high'", f"seen={seen}")
+check(concurrency.call_priority() == 'medium', "Priority reset after the task", "priority leaked")
+
+print("\n" + "=" * 60)
+print("✅ All Priority Scheduling Tests Passed" if all_passed else "⚠️ Some Priority Scheduling Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Research Context Test (no API required)
+Tests token-budgeted, relevance-ranked research blocks used by the copywriting prompts
+"""
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.research_context import ResearchContext, estimate_tokens
+
+print("=" * 60)
+print("Research Context Test")
+print("=" * 60)
+
+all_passed = True
+
+research_data = {
+    'Audience_Insight_Agent': {
+        'audience_segment': 'OnlyFans Creators',
+        'pain_points': [
+            {'pain': f'Pain point {i}: content burnout from posting every day', 'intensity': 'high', 'frequency': 'daily'}
+            for i in range(12)
+        ],
+        'content_preferences': {'platforms': ['OnlyFans', 'Fansly'], 'tone': 'casual'}
+    },
+    'Competitor_Research_Agent': {
+        'category': 'AI image generator',
+        'pricing': {'estimate': '$30/month', 'model': 'subscription'},
+        'weaknesses': ['No NSFW support', 'Requires LoRA training before first image']
+    }
+}
+
+# Test 1: Budget respected and every fact kept whole
+print("\n1️⃣  Testing token budget...")
+context = ResearchContext(research_data)
+for budget in (60, 200, 800):
+    block = context.render(budget)
+    tokens = estimate_tokens(block)
+    if tokens <= budget:
+        print(f"   ✅ Budget {budget}: {tokens} estimated tokens")
+    else:
+        print(f"   ❌ Budget {budget}: {tokens} estimated tokens")
+        all_passed = False
+
+old_style = sum(estimate_tokens(json.dumps(data, indent=2)[:1000]) for data in research_data.values())
+block = context.render(800)
+items = [item for line in block.splitlines() if line.startswith('- pain_points: ')
+         for item in line[len('- pain_points: '):].split(' | ')]
+if items and all(json.loads(item)['intensity'] == 'high' for item in items):
+    print(f"   ✅ {len(items)} pain points included whole (no mid-object cuts)")
+else:
+    print("   ❌ Pain points missing or cut mid-object")
+    all_passed = False
+
+if '  "' not in block:
+    print(f"   ✅ Compact serialization (no indentation; old per-agent dump ≈ {old_style} tokens)")
+else:
+    print("   ❌ Indented JSON in block")
+    all_passed = False
+
+# Test 2: Facts relevant to the focus rank first under a tight budget
+print("\n2️⃣  Testing relevance ranking...")
+focus = "Explain the competitor's lack of NSFW support and LoRA training requirement"
+block = context.render(120, focus=focus)
+if 'No NSFW support' in block and 'Requires LoRA training' in block:
+    print("   ✅ Section-relevant competitor weaknesses kept under a tight budget")
+else:
+    print(f"   ❌ Relevant facts dropped:\n{block}")
+    all_passed = False
+
+# Test 3: Empty research and pre-built contexts
+print("\n3️⃣  Testing empty research and reuse...")
+if ResearchContext({}).render(500) == "No research data available" and ResearchContext.ensure(context) is context:
+    print("   ✅ Empty research handled, built context reused across prompts")
+else:
+    print("   ❌ Unexpected empty/reuse behaviour")
+    all_passed = False
+
+print("\n" + "=" * 60)
+print("✅ All Research Context Tests Passed" if all_passed else "⚠️ Some Research Context Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
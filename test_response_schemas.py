@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Response Schema Test (no API required)
+Tests schema validation, response_schema export and the targeted retry in llm_client.generate_json
+"""
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.response_schemas import validate, api_schema
+from utils.llm_client import generate_json, StructuredOutputError
+from fake_gemini import FakeModel
+
+print("=" * 60)
+print("Response Schema Test")
+print("=" * 60)
+
+all_passed = True
+
+
+GOOD_FAQS = json.dumps([{'question': 'Is Sozee worth it?', 'answer': 'Yes.'}])
+
+# Test 1: Validator reports path-qualified problems
+print("\n1️⃣  Testing validation errors...")
+errors = validate('comparison_table', [{'feature': 'NSFW', 'sozee': 'Yes'}, {'feature': 1, 'sozee': 'Yes', 'competitor': 'No'}])
+if '$[0].competitor: missing required field' in errors and '$[1].feature: expected string, got int' in errors:
+    print("   ✅ Missing and mistyped fields named with their path")
+else:
+    print(f"   ❌ Errors: {errors}")
+    all_passed = False
+
+stats = {'key_statistics': [{'stat': '78% of creators report burnout', 'credibility': 'unknown'}]}
+if validate('statistics', stats) == ["$.key_statistics[0].credibility: 'unknown' not one of ['high', 'low', 'medium']"]:
+    print("   ✅ Enum violation reported")
+else:
+    print(f"   ❌ Errors: {validate('statistics', stats)}")
+    all_passed = False
+
+if not validate('faqs', json.loads(GOOD_FAQS)) and validate('faqs', []):
+    print("   ✅ Valid FAQ list accepted, empty list rejected")
+else:
+    print("   ❌ FAQ min_items not enforced")
+    all_passed = False
+
+# Test 2: Only schemas Gemini can express are sent as response_schema
+print("\n2️⃣  Testing response_schema export...")
+faq_schema = api_schema('faqs')
+if faq_schema and 'min_items' not in faq_schema and api_schema('faq_batch') is None and api_schema('competitor_profile') is None:
+    print("   ✅ Static schemas exported, dynamic maps and untyped fields validated locally only")
+else:
+    print("   ❌ Unexpected export")
+    all_passed = False
+
+# Test 3: Invalid reply gets one targeted retry
+print("\n3️⃣  Testing targeted retry...")
+model = FakeModel(['```json\n[{"question": "Is Sozee worth it?"}]\n```', GOOD_FAQS])
+faqs = generate_json(model, 'Write FAQs', 'faqs', max_output_tokens=500, temperature=0.5)
+retry_prompt = model.prompts[-1]
+if len(model.prompts) == 2 and faqs == json.loads(GOOD_FAQS) and '$[0].answer: missing required field' in retry_prompt:
+    print("   ✅ Retry prompt listed the exact problem and valid reply returned")
+else:
+    print(f"   ❌ {len(model.prompts)} calls, result {faqs}")
+    all_passed = False
+
+if model.configs[0].response_mime_type == 'application/json':
+    print("   ✅ JSON output mode requested")
+else:
+    print("   ❌ JSON mime type not set")
+    all_passed = False
+
+# Test 4: Still invalid after retries raises with the raw text
+print("\n4️⃣  Testing StructuredOutputError...")
+model = FakeModel(['not json', '{"question": "x"}'])
+try:
+    generate_json(model, 'Write FAQs', 'faqs', max_output_tokens=500, temperature=0.5)
+    print("   ❌ No error raised")
+    all_passed = False
+except StructuredOutputError as e:
+    if e.schema_name == 'faqs' and e.text == '{"question": "x"}' and len(model.prompts) == 2:
+        print("   ✅ Raised after one retry with schema name and last raw text")
+    else:
+        print(f"   ❌ Unexpected error details: {e}")
+        all_passed = False
+
+print("\n" + "=" * 60)
+print("✅ All Response Schema Tests Passed" if all_passed else "⚠️ Some Response Schema Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Sitemap Generator Test (no API required)
+Tests sharding, sitemap index output and incremental shard rewrites
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.sitemap import SitemapGenerator
+
+print("=" * 60)
+print("Sitemap Generator Test")
+print("=" * 60)
+
+all_passed = True
+sitemap_dir = tempfile.mkdtemp()
+
+
+def make_pages(start, end, generated_at='2025-01-01T10:00:00'):
+    return [{'url_slug': f'/page-{i}', 'generated_at': generated_at} for i in range(start, end)]
+
+
+# Test 1: Initial build shards at max_urls
+print("\n1️⃣  Testing initial sharded build...")
+generator = SitemapGenerator(sitemap_dir, max_urls=10)
+written = generator.update(make_pages(0, 25))
+shard_files = sorted(f for f in os.listdir(sitemap_dir) if f.startswith('sitemap-'))
+if len(written) == 3 and shard_files == ['sitemap-1.xml', 'sitemap-2.xml', 'sitemap-3.xml']:
+    print("   ✅ 25 URLs split into 3 shards")
+else:
+    print(f"   ❌ Unexpected shards: {shard_files}")
+    all_passed = False
+
+with open(os.path.join(sitemap_dir, 'sitemap.xml'), 'r') as f:
+    index = f.read()
+if index.count('<sitemap>') == 3 and 'https://sozee.ai/sitemap-2.xml' in index:
+    print("   ✅ Sitemap index lists every shard")
+else:
+    print("   ❌ Sitemap index incomplete")
+    all_passed = False
+
+# Test 2: Re-running with unchanged pages rewrites nothing
+print("\n2️⃣  Testing no-op update...")
+generator = SitemapGenerator(sitemap_dir, max_urls=10)
+if generator.update(make_pages(0, 5)) == []:
+    print("   ✅ Unchanged pages left all shards untouched")
+else:
+    print("   ❌ Shards rewritten for unchanged pages")
+    all_passed = False
+
+# Test 3: Changed page only rewrites its own shard
+print("\n3️⃣  Testing incremental update of a changed page...")
+written = generator.update(make_pages(12, 13, generated_at='2025-02-01T10:00:00'))
+if [os.path.basename(p) for p in written] == ['sitemap-2.xml']:
+    print("   ✅ Only sitemap-2.xml rewritten")
+else:
+    print(f"   ❌ Rewrote: {written}")
+    all_passed = False
+
+with open(os.path.join(sitemap_dir, 'sitemap-2.xml'), 'r') as f:
+    if '<loc>https://sozee.ai/page-12</loc><lastmod>2025-02-01</lastmod>' in f.read():
+        print("   ✅ lastmod refreshed from generated_at")
+    else:
+        print("   ❌ lastmod not refreshed")
+        all_passed = False
+
+# Test 4: New pages fill the last shard before opening a new one
+print("\n4️⃣  Testing new pages appended to last shard...")
+written = generator.update(make_pages(25, 31))
+if [os.path.basename(p) for p in written] == ['sitemap-3.xml', 'sitemap-4.xml']:
+    print("   ✅ Filled sitemap-3.xml and opened sitemap-4.xml")
+else:
+    print(f"   ❌ Rewrote: {written}")
+    all_passed = False
+
+print("\n" + "=" * 60)
+print("✅ All Sitemap Tests Passed" if all_passed else "⚠️ Some Sitemap Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
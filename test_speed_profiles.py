@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Speed Profiles Test (no API required)
+Tests profile loading, the strategist's task list, profile-driven page generation,
+fallback acceptance, prefetch filtering and the dry-run planner
+"""
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from utils.speed_profiles import SpeedProfile
+from utils.batch_planner import BatchPlanner
+from utils.token_accounting import PriceTable
+from agents.pseo_strategist import PSEOStrategistAgent
+from pseo_orchestrator import PSEOOrchestrator
+
+print("=" * 60)
+print("Speed Profiles Test")
+print("=" * 60)
+
+all_passed = True
+
+with open('config/patterns.json', 'r') as f:
+    patterns_data = json.load(f)
+
+VARIABLES = {'competitor': 'Higgsfield', 'audience': 'OnlyFans Creators', 'platform': 'TikTok'}
+
+# Canned output per agent (the strategist runs for real)
+CANNED = {
+    'competitor_research': {'competitor': 'Higgsfield'},
+    'audience_insight': {'pain_points': ['burnout']},
+    'statistics': {'key_statistics': []},
+    'copywriting': {'content': {'hero': {'h1': 'Sozee vs Higgsfield'}}},
+    'faq_generator': {'faqs': [{'question': 'Q?', 'answer': 'A.'}] * 5},
+    'seo_optimizer': {'meta_title': 'Meta', 'meta_description': 'Description'},
+    'comparison_table': {'comparison_table': [{'feature': 'Speed'}]},
+    'schema_markup': {'schemas': [{'@type': 'WebPage'}]},
+    'quality_control': {'overall_score': 0.9, 'approval_status': 'approved', 'issues': []}
+}
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+def orchestrator_for(profile):
+    """Orchestrator whose agents (strategist aside) record their tasks instead of calling Gemini"""
+    orchestrator = PSEOOrchestrator({
+        'pattern_library': patterns_data,
+        'variables': {},
+        'gemini_api_key': 'test',
+        'speed_profile': profile
+    })
+    executed = {}
+    for key, agent in orchestrator.agent_manager.agents.items():
+        if key == 'pseo_strategist':
+            continue
+
+        def execute(message, key=key, agent=agent):
+            executed[key] = message.task
+            return agent.create_response(message, status='completed', data=CANNED[key])
+
+        agent.execute = execute
+    return orchestrator, executed
+
+
+# Test 1: Profiles from config/speed_profiles.json
+print("\n1️⃣  Testing profile config...")
+fast = SpeedProfile.load('fast')
+quality = SpeedProfile.load()
+check(quality.name == 'quality' and quality.runs('audience_insight', 'mid') and quality.max_sections('bottom') is None,
+      "Default profile is quality: every agent, every section", f"default={quality.name}")
+check(fast.runs('copywriting', 'mid') and not fast.runs('audience_insight', 'mid') and fast.max_sections('mid') == 1,
+      "fast: copywriting always runs, mid-funnel research skipped, one pattern section", "fast profile wrong")
+try:
+    SpeedProfile.load('turbo')
+    check(False, "", "Unknown profile accepted")
+except ValueError:
+    check(True, "Unknown profile rejected", "")
+
+# Test 2: The strategist's task list covers every agent the orchestrator runs
+print("\n2️⃣  Testing blueprint task list...")
+strategist = PSEOStrategistAgent(pattern_library=patterns_data)
+blueprint = strategist._create_blueprint(strategist._get_pattern('1'), VARIABLES)
+tasks = strategist._create_agent_tasks(blueprint, VARIABLES)
+stages = {task['agent']: task['stage'] for task in tasks}
+check(stages.get('Statistics_Agent') == 'research' and stages.get('Comparison_Table_Agent') == 'supplementary'
+      and stages.get('Schema_Markup_Agent') == 'schema' and stages.get('Quality_Control_Agent') == 'review',
+      "Pattern 1 tasks include statistics, comparison table, schema and QC", f"stages={stages}")
+check(blueprint.required_agents == ['PSEO_Strategist_Agent'] + [task['agent'] for task in tasks],
+      "required_agents matches the task list", f"required={blueprint.required_agents}")
+pattern5 = strategist._create_blueprint(strategist._get_pattern('5'), VARIABLES)
+check('Copywriting_Agent' in pattern5.required_agents,
+      "Pattern 5 blueprint lists its content agents", f"required={pattern5.required_agents}")
+
+# Test 3: quality runs the full pipeline
+print("\n3️⃣  Testing quality profile page...")
+orchestrator, executed = orchestrator_for('quality')
+page = orchestrator.generate_page('1', VARIABLES)
+check(set(executed) == set(CANNED), "Every agent in the task list ran", f"ran={sorted(executed)}")
+check(executed['copywriting'].get('max_pattern_sections') is None and page.faq_json and page.comparison_table_json,
+      "All pattern sections, FAQs and comparison table", "quality page incomplete")
+
+# Test 4: fast mid-funnel page
+print("\n4️⃣  Testing fast profile, mid-funnel page...")
+orchestrator, executed = orchestrator_for('fast')
+page = orchestrator.generate_page('2', VARIABLES)
+check(set(executed) == {'copywriting', 'seo_optimizer', 'schema_markup', 'quality_control'},
+      "Only copywriting, SEO, schema and QC ran", f"ran={sorted(executed)}")
+check(executed['copywriting'].get('max_pattern_sections') == 1, "Copywriting capped at one pattern section",
+      f"task={executed['copywriting']}")
+check(page.faq_json == [] and page.meta_title == 'Meta',
+      "Skipped FAQ agent leaves the page without FAQs (no duplicate fallback FAQs)", f"faqs={len(page.faq_json)}")
+check('FAQ_Generator_Agent' not in page.agents_used and 'Audience_Insight_Agent' not in page.agents_used
+      and [s['agent'] for s in page.research_sources] == ['Statistics_Agent'],
+      "agents_used lists agents that ran; statistics fallback only research", f"used={page.agents_used}")
+
+# Test 5: fast bottom-funnel page keeps competitor research and the comparison table
+print("\n5️⃣  Testing fast profile, bottom-funnel page...")
+orchestrator, executed = orchestrator_for('fast')
+page = orchestrator.generate_page('1', VARIABLES)
+check({'competitor_research', 'comparison_table', 'faq_generator'} <= set(executed)
+      and 'audience_insight' not in executed and executed['copywriting'].get('max_pattern_sections') == 3,
+      "Competitor research, comparison table and FAQs ran; three pattern sections", f"ran={sorted(executed)}")
+
+# Test 6: Fallbacks the profile does not accept are not cut off at a deadline
+print("\n6️⃣  Testing fallback acceptance...")
+orchestrator, _ = orchestrator_for('balanced')
+manager = orchestrator.agent_manager
+manager.router.deadlines = {'agents': {'faq_generator': 30, 'statistics': 30}}
+check(manager._task_deadline('faq_generator', manager.agents['faq_generator'], None) is None
+      and manager._task_deadline('statistics', manager.agents['statistics'], None) == 30,
+      "balanced: FAQ treated as critical, statistics keeps its deadline", "deadlines ignore the profile")
+orchestrator, _ = orchestrator_for('fast')
+check(orchestrator.prefetch_faqs('2', [VARIABLES]) == 0,
+      "No FAQ prefetch for stages the profile skips", "FAQs prefetched for skipped stage")
+
+# Test 7: The planner honours the profile
+print("\n7️⃣  Testing dry-run plan per profile...")
+mid_pages = pd.DataFrame([{'pattern_id': '2', **VARIABLES, 'audience': f'Audience {i}'} for i in range(10)])
+plans = {
+    name: BatchPlanner(patterns_data, prices=PriceTable({}), profile=SpeedProfile.load(name)).plan(mid_pages)
+    for name in ('quality', 'balanced', 'fast')
+}
+calls = {name: plan['totals']['calls'] for name, plan in plans.items()}
+check(calls['quality'] >= 3 * calls['fast'] and calls['quality'] > calls['balanced'] > calls['fast'],
+      f"Mid-funnel calls: quality {calls['quality']}, balanced {calls['balanced']}, fast {calls['fast']}",
+      f"calls={calls}")
+check(plans['fast']['profile'] == 'fast', "Plan records the profile", "profile missing from plan")
+
+print("\n" + "=" * 60)
+print("✅ All Speed Profiles Tests Passed" if all_passed else "⚠️ Some Speed Profiles Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Token Accounting Test (no API required)
+Tests usage metadata capture, per-page/per-agent attribution across worker threads, pricing and PageOutput
+"""
+
+import os
+import re
+import sys
+import json
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import model_router, token_accounting
+from utils.token_accounting import USAGE, PageUsage, PriceTable, usage_from_response
+from utils.model_router import ModelRouter
+from agent_framework import PageOutput
+from pseo_orchestrator import AgentManager
+from fake_gemini import FakeModel, FakeResponse
+
+print("=" * 60)
+print("Token Accounting Test")
+print("=" * 60)
+
+all_passed = True
+
+
+class APIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+class MeteredModel(FakeModel):
+    """Replies carry usage metadata (prompt/output/cached tokens)"""
+
+    def reply(self, prompt):
+        section = re.search(r'\(ID: (\w+)\)', prompt)
+        if section:
+            return FakeResponse(json.dumps({'heading': section.group(1), 'content': []}), 300, 50)
+        if 'FAQ' in prompt:
+            return FakeResponse(json.dumps([{'question': 'Q?', 'answer': 'A.'}] * 5), 400, 120, cached_tokens=100)
+        return FakeResponse(json.dumps({
+            'hero': {'h1': 'Sozee'}, 'problem': 'P', 'solution': 'S', 'features': [], 'final_cta': 'Go'
+        }), 1000, 400)
+
+
+def check(condition, ok, failure):
+    global all_passed
+    if condition:
+        print(f"   ✅ {ok}")
+    else:
+        print(f"   ❌ {failure}")
+        all_passed = False
+
+
+# Test 1: Usage metadata and pricing
+print("\n1️⃣  Testing usage metadata and pricing...")
+usage = usage_from_response(FakeResponse('{}', 1200, 300, cached_tokens=200))
+check(usage == {'calls': 1, 'prompt_tokens': 1200, 'output_tokens': 300, 'cached_tokens': 200},
+      "Prompt, output and cached tokens read from usage_metadata", f"usage={usage}")
+check(usage_from_response(SimpleNamespace(text='{}'))['prompt_tokens'] == 0,
+      "Missing usage metadata counts as zero tokens", "no metadata crashed or miscounted")
+
+prices = PriceTable({
+    'default': {'input_per_million': 1.0, 'output_per_million': 1.0},
+    'models': {'fast-model': {'input_per_million': 0.10, 'output_per_million': 0.40, 'cached_input_per_million': 0.025}}
+})
+cost = prices.cost('fast-model', usage)
+expected = (1000 * 0.10 + 200 * 0.025 + 300 * 0.40) / 1_000_000
+check(abs(cost - expected) < 1e-12, f"Cached tokens priced at the cache rate (${cost:.6f})", f"cost={cost}")
+check(PriceTable.load().models.get('gemini-2.0-flash'), "Shipped price table covers routed models", "no prices")
+
+# Test 2: Page and agent attribution (including copywriting worker threads)
+print("\n2️⃣  Testing per-page, per-agent attribution...")
+USAGE.reset()
+router = ModelRouter({'default': {'model': 'fast-model'}})
+manager = AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='test', router=router)
+manager.agents['copywriting'].genai_model = MeteredModel()
+manager.agents['faq_generator'].genai_model = MeteredModel()
+
+page = PageUsage(pattern_id='5', page_id='page-1')
+token = token_accounting.begin_page(page)
+try:
+    manager.send_message(
+        from_agent='orchestrator', to_agent='Copywriting_Agent', task={'sections': []},
+        context={'blueprint': {'pattern_id': '5', 'pattern_name': 'Review', 'pseo_variables': {'audience': 'Creators'}},
+                 'research_data': {}}
+    )
+    manager.send_message(
+        from_agent='orchestrator', to_agent='FAQ_Generator_Agent', task={'pattern_id': '5', 'count': 5},
+        context={'blueprint': {'pattern_id': '5', 'pseo_variables': {'competitor': 'Krea'}}}
+    )
+finally:
+    token_accounting.end_page(token)
+
+report = page.to_dict()
+copy_usage = report['by_agent'].get('copywriting', {})
+check(copy_usage.get('calls', 0) > 1 and copy_usage['prompt_tokens'] >= 1000,
+      f"Copywriting: {copy_usage.get('calls')} calls (main + section threads) on the page",
+      f"copywriting={copy_usage}")
+check(report['by_agent'].get('faq_generator', {}).get('cached_tokens') == 100,
+      "FAQ tokens attributed to faq_generator", f"by_agent={list(report['by_agent'])}")
+check(report['total']['calls'] == sum(a['calls'] for a in report['by_agent'].values()),
+      f"Page total: {report['total']['prompt_tokens']:,} in / {report['total']['output_tokens']:,} out",
+      f"total={report['total']}")
+check(set(USAGE.totals('pattern_id')) == {'5'} and set(USAGE.totals('page_id')) == {'page-1'},
+      "Ledger tags every call with pattern and page_id", f"patterns={list(USAGE.totals('pattern_id'))}")
+page_cost = USAGE.cost_for(prices, 'page-1')
+check(page_cost > 0 and abs(page_cost - USAGE.cost(prices, 'page_id')['page-1']) < 1e-12
+      and USAGE.cost_for(prices, 'page-2') == 0.0,
+      f"Per-page cost from the page index (${page_cost:.6f})", f"cost_for={page_cost}")
+check(USAGE.model_totals() == USAGE.totals('model'),
+      "Running totals by model match a rescan of the ledger", f"model_totals={USAGE.model_totals()}")
+
+# Test 3: Failover calls are priced at the model that served them
+print("\n3️⃣  Testing failover attribution...")
+USAGE.reset()
+router = ModelRouter({'default': {'model': 'primary-model', 'fallbacks': ['backup-model']}})
+manager = AgentManager(pattern_library={'patterns': []}, viral_hooks=[], gemini_api_key='test', router=router)
+manager.agents['faq_generator'].genai_model = MeteredModel(errors=[APIError(429)])
+model_router._models['backup-model'] = MeteredModel()
+manager.send_message(
+    from_agent='orchestrator', to_agent='FAQ_Generator_Agent', task={'pattern_id': '1', 'count': 5},
+    context={'blueprint': {'pattern_id': '1', 'pseo_variables': {'competitor': 'Leonardo'}}}
+)
+check(set(USAGE.totals('model')) == {'backup-model'}, "Tokens recorded against the fallback model",
+      f"models={list(USAGE.totals('model'))}")
+
+# Test 4: PageOutput carries usage as internal metadata
+print("\n4️⃣  Testing PageOutput.token_usage...")
+output = PageOutput(page_id='p', pattern_id='1', status='draft', post_title='T', url_slug='t',
+                    meta_title='T', meta_description='D', hero_section={}, problem_agitation='',
+                    solution_overview='', token_usage=report)
+check(output.to_dict()['token_usage'] == report and 'token_usage' not in output.to_dict_public(),
+      "token_usage in the full export, not in public/WordPress output", "token_usage export wrong")
+
+print("\n" + "=" * 60)
+print("✅ All Token Accounting Tests Passed" if all_passed else "⚠️ Some Token Accounting Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+WordPress Publisher Test (no API required)
+Tests batched upserts, 429 retries (Retry-After) and idempotent re-publishing against a local mock WordPress
+"""
+
+import os
+import sys
+import json
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.html_renderer import StaticSiteRenderer
+from utils import wordpress_publisher
+from utils.wordpress_publisher import WordPressPublisher
+
+print("=" * 60)
+print("WordPress Publisher Test")
+print("=" * 60)
+
+all_passed = True
+
+
+class MockWordPress:
+    """In-memory WordPress: posts keyed by id, first batch request is throttled"""
+
+    def __init__(self):
+        self.posts = {}
+        self.next_id = 1
+        self.batch_requests = 0
+        self.throttled = False
+        self.retry_after = '0'
+        self.lock = threading.Lock()
+
+    def upsert(self, path, body):
+        with self.lock:
+            post_id = path.rstrip('/').rsplit('/', 1)[-1]
+            if post_id.isdigit():
+                self.posts[int(post_id)].update(body)
+                return 200
+            self.posts[self.next_id] = dict(body, id=self.next_id)
+            self.next_id += 1
+            return 201
+
+
+wp = MockWordPress()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        slugs = query.get('slug', [''])[0].split(',')
+        with wp.lock:
+            found = [{'id': p['id'], 'slug': p['slug']} for p in wp.posts.values() if p['slug'] in slugs]
+        self._send(200, found)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with wp.lock:
+            wp.batch_requests += 1
+            throttle = not wp.throttled
+            wp.throttled = True
+        if throttle:
+            self._send(429, {'message': 'Too many requests'}, {'Retry-After': wp.retry_after})
+            return
+        responses = [{'status': wp.upsert(r['path'], r['body']), 'body': {}} for r in body['requests']]
+        self._send(207, {'responses': responses})
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+renderer = StaticSiteRenderer({'patterns': []})
+pages = [
+    {
+        'page_id': f'page_{i}',
+        'post_title': f'Page {i}',
+        'url_slug': f'/sozee-vs-tool-{i}',
+        'meta_title': f'Meta {i}',
+        'meta_description': f'Description {i}',
+        'hero_section': {'h1': f'Headline {i}'},
+        'schema_markup': [{'@context': 'https://schema.org', '@type': 'WebPage', 'name': f'Page {i}'}]
+    }
+    for i in range(12)
+]
+
+
+def make_publisher():
+    return WordPressPublisher(base_url, 'admin', 'app-pass', renderer,
+                              batch_size=5, max_concurrency=2, backoff_seconds=0.01)
+
+
+# Test 1: First publish creates every page despite a 429
+print("\n1️⃣  Testing batched create with 429 retry...")
+results = make_publisher().publish(pages)
+if results['created'] == 12 and not results['failed'] and len(wp.posts) == 12:
+    print("   ✅ 12 pages created, throttled batch retried")
+else:
+    print(f"   ❌ Unexpected results: {results}")
+    all_passed = False
+
+# 3 batches of up to 5 pages + 1 throttled attempt
+if wp.batch_requests == 4:
+    print("   ✅ Pages sent in 3 batch requests (+1 retry)")
+else:
+    print(f"   ❌ Expected 4 batch requests, got {wp.batch_requests}")
+    all_passed = False
+
+# Test 2: Re-publishing updates in place
+print("\n2️⃣  Testing idempotent re-publish...")
+pages[0]['post_title'] = 'Page 0 (updated)'
+results = make_publisher().publish(pages)
+titles = [p['title'] for p in wp.posts.values()]
+if results['updated'] == 12 and results['created'] == 0 and len(wp.posts) == 12:
+    print("   ✅ All 12 pages updated, no duplicates")
+else:
+    print(f"   ❌ Unexpected results: {results} ({len(wp.posts)} posts)")
+    all_passed = False
+
+if 'Page 0 (updated)' in titles:
+    print("   ✅ Updated title stored")
+else:
+    print("   ❌ Update not applied")
+    all_passed = False
+
+# Test 3: Post body mapping
+print("\n3️⃣  Testing post body mapping...")
+post = next(p for p in wp.posts.values() if p['slug'] == 'sozee-vs-tool-1')
+if post['status'] == 'draft' and post['excerpt'] == 'Description 1' and 'Headline 1' in post['content']:
+    print("   ✅ Slug, status, excerpt and content mapped")
+else:
+    print(f"   ❌ Unexpected post body: {post}")
+    all_passed = False
+
+if 'application/ld+json' in post['meta']['pseo_json_ld'] and '<script' not in post['content']:
+    print("   ✅ JSON-LD sent as post meta, not in content (kses would strip it)")
+else:
+    print(f"   ❌ JSON-LD placement wrong: meta={post['meta']}")
+    all_passed = False
+
+# Test 4: Retry delay is the longer of Retry-After and the backoff, not both
+print("\n4️⃣  Testing Retry-After delay...")
+sleeps = []
+real_sleep = wordpress_publisher.time.sleep
+wordpress_publisher.time.sleep = sleeps.append
+try:
+    wp.throttled = False
+    wp.retry_after = '2'
+    make_publisher().publish(pages[:1])
+finally:
+    wordpress_publisher.time.sleep = real_sleep
+if sleeps == [2]:
+    print("   ✅ Slept once for Retry-After (2s) instead of Retry-After + backoff")
+else:
+    print(f"   ❌ Sleeps: {sleeps}")
+    all_passed = False
+
+server.shutdown()
+
+print("\n" + "=" * 60)
+print("✅ All WordPress Publisher Tests Passed" if all_passed else "⚠️ Some WordPress Publisher Tests Failed")
+print("=" * 60)
+
+sys.exit(0 if all_passed else 1)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+API Key Pool
+Spreads Gemini calls over several API keys (projects), each with its own quota
+
+Keys come from the orchestrator config ('gemini_api_keys') or the environment
+(GEMINI_API_KEYS, comma-separated; GEMINI_API_KEY alone is a pool of one).
+Every key gets its own SDK client, call counters and cool-down state. Calls go
+to the healthy key with the fewest calls in flight (then fewest this minute);
+a key that returns 429 / quota errors is sidelined for cooldown_seconds and
+the call moves to the next key. Only when every key is exhausted does the
+error reach utils.model_health, which then fails over to another model.
+
+With a single key nothing is wrapped and calls use the default client from
+genai.configure(), as before.
+"""
+
+import os
+import copy
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List
+
+from utils import deadlines
+from utils.model_health import error_status, RATE_LIMIT_STATUS
+
+
+def load_api_keys(configured: List[str] = None, default: str = None) -> List[str]:
+    """Keys from config, else GEMINI_API_KEYS, else default / GEMINI_API_KEY (duplicates dropped)"""
+    keys = configured or os.environ.get('GEMINI_API_KEYS', '').split(',')
+    keys = [key.strip() for key in keys if key and key.strip()]
+    default = default or os.environ.get('GEMINI_API_KEY')
+    if not keys and default:
+        keys = [default]
+    return list(dict.fromkeys(keys))
+
+
+def _sdk_client(api_key: str):
+    """A GenerativeServiceClient bound to one key (genai.configure() only sets a global default)"""
+    from google.generativeai import client as genai_client
+    manager = genai_client._ClientManager()
+    manager.configure(api_key=api_key)
+    return manager.get_default_client('generative')
+
+
+class KeyPool:
+    """Per-key clients, quota counters and cool-downs"""
+
+    def __init__(self, keys: List[str] = None, cooldown_seconds: float = 60.0,
+                 requests_per_minute: int = None, client_factory: Callable[[str], Any] = None):
+        self.cooldown_seconds = cooldown_seconds
+        self.requests_per_minute = requests_per_minute
+        self.client_factory = client_factory or _sdk_client
+        self.lock = threading.Lock()
+        self.keys: List[Dict[str, Any]] = []
+        self.configure(keys=keys or [])
+
+    def configure(self, keys: List[str] = None, **settings):
+        """Replace the keys and/or update settings (cooldown_seconds, requests_per_minute)"""
+        with self.lock:
+            for key, value in settings.items():
+                if hasattr(self, key) and value is not None:
+                    setattr(self, key, value)
+            if keys is not None:
+                self.keys = [
+                    {
+                        'key': key, 'label': f"key {i + 1} (…{key[-4:]})", 'client': None,
+                        'in_flight': 0, 'calls': 0, 'failures': 0, 'rate_limited': 0,
+                        'cooldown_until': 0.0, 'recent': deque()
+                    }
+                    for i, key in enumerate(keys)
+                ]
+
+    @property
+    def size(self) -> int:
+        return len(self.keys)
+
+    def wrap(self, model):
+        """Model that spreads its calls over the pool (unchanged for a pool of 0-1 keys)"""
+        if self.size < 2 or model is None or isinstance(model, KeyedModel):
+            return model
+        return KeyedModel(model, self)
+
+    def _available(self, state: Dict[str, Any], now: float) -> bool:
+        while state['recent'] and state['recent'][0] <= now - 60:
+            state['recent'].popleft()
+        if state['cooldown_until'] > now:
+            return False
+        return not self.requests_per_minute or len(state['recent']) < self.requests_per_minute
+
+    def acquire(self, exclude: List[Dict[str, Any]] = ()) -> Dict[str, Any]:
+        """Pick a key for one call: healthy and least loaded, else the one recovering first"""
+        now = time.monotonic()
+        with self.lock:
+            candidates = [state for state in self.keys if not any(state is used for used in exclude)]
+            if not candidates:
+                return None
+            healthy = [state for state in candidates if self._available(state, now)]
+            if healthy:
+                state = min(healthy, key=lambda s: (s['in_flight'], len(s['recent']), s['calls']))
+            else:
+                state = min(candidates, key=lambda s: s['cooldown_until'])
+            state['in_flight'] += 1
+            state['calls'] += 1
+            state['recent'].append(now)
+            if state['client'] is None:
+                state['client'] = self.client_factory(state['key'])
+            return state
+
+    def release(self, state: Dict[str, Any], error: Exception = None) -> bool:
+        """
+        Finish a call on a key
+
+        Returns:
+            True if the error was a quota/rate limit (key sidelined; try another key)
+        """
+        with self.lock:
+            state['in_flight'] -= 1
+            if error is None:
+                return False
+            state['failures'] += 1
+            if error_status(error) not in RATE_LIMIT_STATUS:
+                return False
+            state['rate_limited'] += 1
+            state['cooldown_until'] = time.monotonic() + self.cooldown_seconds
+        print(f"  🔑 {state['label']} rate-limited, sidelined for {self.cooldown_seconds:.0f}s")
+        return True
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Counters per key label (for run summaries; keys themselves are never shown)"""
+        now = time.monotonic()
+        with self.lock:
+            return {
+                state['label']: {
+                    'calls': state['calls'], 'failures': state['failures'],
+                    'rate_limited': state['rate_limited'], 'cooling': state['cooldown_until'] > now
+                }
+                for state in self.keys
+            }
+
+
+KEY_POOL = KeyPool()
+
+
+class KeyedModel:
+    """A GenerativeModel whose calls are spread over the key pool"""
+
+    def __init__(self, model, pool: KeyPool):
+        self.model = model
+        self.pool = pool
+        self.lock = threading.Lock()
+        self.per_key: Dict[str, Any] = {}
+
+    def __getattr__(self, name):
+        # model_name etc. come from the wrapped model
+        if name == 'model':
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def _for_key(self, state: Dict[str, Any]):
+        with self.lock:
+            if state['label'] not in self.per_key:
+                keyed = copy.copy(self.model)
+                keyed._client = state['client']
+                self.per_key[state['label']] = keyed
+            return self.per_key[state['label']]
+
+    def generate_content(self, prompt, **kwargs):
+        tried = []
+        while True:
+            if tried:
+                deadlines.check_cancelled()
+            # The key stays busy until the request returns, even for a task abandoned at its deadline
+            state = self.pool.acquire(exclude=tried)
+            try:
+                response = self._for_key(state).generate_content(prompt, **kwargs)
+            except Exception as e:
+                if not self.pool.release(state, e) or len(tried) + 1 >= self.pool.size:
+                    raise
+                tried.append(state)
+                continue
+            self.pool.release(state)
+            return response
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Batch Planner
+Dry-run estimate of Gemini calls, tokens, wall time and cost for a batch
+
+Walks the task matrix the way BatchProcessor and PSEOOrchestrator would,
+without calling the API:
+
+- Blueprints come from the PSEO Strategist (deterministic), so research
+  requirements, pattern sections and comparison tables match a real run
+- Competitor research is a cache hit if the competitor is in the KB or was
+  researched earlier in the batch; audience and statistics research hit the
+  in-run cache after their first page
+- FAQ/SEO batching and combined copy change the call counts as they would
+- Pages before the checkpoint (or --start-index) are skipped
+- The speed profile (utils.speed_profiles) decides which agents run and how
+  many pattern sections are written for each page's funnel stage
+
+Per-call tokens and latency come from a previous run's token_usage.json
+(utils.token_accounting) where available, else from DEFAULT_CALL_PROFILE.
+Costs use each agent's routed model and the price table.
+"""
+
+import os
+import json
+import math
+from typing import Any, Dict
+
+import pandas as pd
+
+from agents.pseo_strategist import PSEOStrategistAgent
+from agents.copywriting import CopywritingAgent
+from agents.faq_generator import FAQGeneratorAgent
+from utils.competitor_kb import CompetitorKnowledgeBase
+from utils.model_router import ModelRouter
+from utils.speed_profiles import SpeedProfile
+from utils.token_accounting import PriceTable
+
+# Per-call estimates used until a run has recorded telemetry for the agent
+DEFAULT_CALL_PROFILE = {
+    'competitor_research': {'prompt_tokens': 900, 'output_tokens': 1500, 'seconds': 12.0},
+    'audience_insight': {'prompt_tokens': 800, 'output_tokens': 1400, 'seconds': 11.0},
+    'statistics': {'prompt_tokens': 700, 'output_tokens': 900, 'seconds': 8.0},
+    'copywriting': {'prompt_tokens': 1800, 'output_tokens': 900, 'seconds': 10.0},
+    'faq_generator': {'prompt_tokens': 1300, 'output_tokens': 700, 'seconds': 6.0},
+    'seo_optimizer': {'prompt_tokens': 900, 'output_tokens': 120, 'seconds': 2.5},
+    'comparison_table': {'prompt_tokens': 1600, 'output_tokens': 900, 'seconds': 8.0}
+}
+
+RESEARCH_AGENTS = ('competitor_research', 'audience_insight', 'statistics')
+
+
+def checkpoint_index(output_dir: str) -> int:
+    """Index a resumed batch would start from (0 if there is no checkpoint)"""
+    try:
+        with open(os.path.join(output_dir, 'checkpoint.json'), 'r') as f:
+            return int(json.load(f).get('last_index', 0))
+    except (FileNotFoundError, ValueError, json.JSONDecodeError):
+        return 0
+
+
+class BatchPlanner:
+    """Estimates the cost of a batch from the matrix, KB, caches and telemetry"""
+
+    def __init__(self, pattern_library: Dict, router: ModelRouter = None, prices: PriceTable = None,
+                 kb: CompetitorKnowledgeBase = None, telemetry_path: str = None,
+                 combined_copy: bool = False, faq_batch_size: int = 0, seo_batch_size: int = 0,
+                 workers: int = 1, max_llm_concurrency: int = None, profile: SpeedProfile = None,
+                 faq_count: int = 5):
+        self.strategist = PSEOStrategistAgent(pattern_library=pattern_library)
+        self.copywriter = CopywritingAgent(viral_hooks=[])
+        self.router = router or ModelRouter.load()
+        self.prices = prices or PriceTable.load()
+        self.kb = kb or CompetitorKnowledgeBase()
+        self.combined_copy = combined_copy
+        self.faq_batch_size = faq_batch_size
+        # FAQ pairs per page (PSEOOrchestrator.faq_count)
+        self.faq_count = faq_count
+        self.seo_batch_size = seo_batch_size
+        self.workers = max(1, workers)
+        self.max_llm_concurrency = max_llm_concurrency or self.router.concurrency.get('max_limit', 32)
+        self.profile = profile or SpeedProfile()
+        self.profiles, self.sources = self._load_profiles(telemetry_path)
+        self._section_counts: Dict[str, int] = {}
+
+    def _load_profiles(self, telemetry_path: str):
+        """Per-call averages by agent from token_usage.json, falling back to defaults"""
+        profiles = {agent: dict(profile) for agent, profile in DEFAULT_CALL_PROFILE.items()}
+        sources = {agent: 'default' for agent in profiles}
+        if not telemetry_path or not os.path.exists(telemetry_path):
+            return profiles, sources
+        try:
+            with open(telemetry_path, 'r') as f:
+                by_agent = json.load(f).get('by_agent', {})
+        except Exception as e:
+            print(f"  ⚠️ Could not read telemetry from {telemetry_path}: {e}")
+            return profiles, sources
+        for agent, totals in by_agent.items():
+            calls = totals.get('calls', 0)
+            if agent not in profiles or not calls:
+                continue
+            for counter in ('prompt_tokens', 'output_tokens', 'seconds'):
+                if totals.get(counter):
+                    profiles[agent][counter] = totals[counter] / calls
+            sources[agent] = f"history ({calls} calls)"
+        return profiles, sources
+
+    def _sections(self, pattern_id: str) -> int:
+        if pattern_id not in self._section_counts:
+            self._section_counts[pattern_id] = len(self.copywriter._get_pattern_section_configs(pattern_id))
+        return self._section_counts[pattern_id]
+
+    def plan(self, tasks_df: pd.DataFrame, start_index: int = 0) -> Dict[str, Any]:
+        """
+        Estimate a batch
+
+        Returns:
+            Dict with per-agent calls/cache hits/tokens/seconds/cost, totals,
+            wall time and the call and token rates it implies
+        """
+        agents = {
+            agent: {'calls': 0, 'cache_hits': 0, 'prompt_tokens': 0, 'output_tokens': 0,
+                    'seconds': 0.0, 'cost_usd': 0.0}
+            for agent in DEFAULT_CALL_PROFILE
+        }
+        seen_competitors = set()
+        seen_audiences = set()
+        seen_statistics = set()
+        pages_per_pattern: Dict[str, int] = {}
+        faq_pages_per_pattern: Dict[str, int] = {}
+        seo_pages = 0
+        serial_seconds = 0.0
+
+        def call(agent: str, pattern_id: str = None, count: int = 1, pages: int = 1):
+            """count calls producing output for pages pages; returns their latency"""
+            profile = self.profiles[agent]
+            usage = {
+                'prompt_tokens': profile['prompt_tokens'] * count,
+                'output_tokens': profile['output_tokens'] * pages,
+                # Batched calls are assumed to take as long per page as single calls (conservative)
+                'seconds': profile['seconds'] * pages
+            }
+            stats = agents[agent]
+            stats['calls'] += count
+            for counter in ('prompt_tokens', 'output_tokens', 'seconds'):
+                stats[counter] += usage[counter]
+            stats['cost_usd'] += self.prices.cost(self.router.route(agent, pattern_id).model, usage)
+            return usage['seconds']
+
+        rows = tasks_df.iloc[start_index:]
+        for _, row in rows.iterrows():
+            pattern_id = str(row['pattern_id'])
+            variables = {k: v for k, v in row.items() if k not in ['pattern_id', 'priority'] and not pd.isna(v)}
+            pattern = self.strategist._get_pattern(pattern_id)
+            if pattern is None:
+                continue
+            blueprint = self.strategist._create_blueprint(pattern, variables)
+            pages_per_pattern[pattern_id] = pages_per_pattern.get(pattern_id, 0) + 1
+            page_seconds = 0.0
+
+            def runs(agent: str) -> bool:
+                return self.profile.runs(agent, blueprint.funnel_stage)
+
+            # Research (sequential in the orchestrator)
+            for requirement in blueprint.research_requirements:
+                if requirement['type'] == 'competitor_analysis' and runs('competitor_research'):
+                    target = requirement['target']
+                    if target in seen_competitors or self.kb.profile_exists(target):
+                        agents['competitor_research']['cache_hits'] += 1
+                    else:
+                        page_seconds += call('competitor_research', pattern_id)
+                    seen_competitors.add(target)
+                elif requirement['type'] == 'audience_insights' and runs('audience_insight'):
+                    if requirement['target'] in seen_audiences:
+                        agents['audience_insight']['cache_hits'] += 1
+                    else:
+                        page_seconds += call('audience_insight', pattern_id)
+                    seen_audiences.add(requirement['target'])
+            if blueprint.research_requirements and runs('statistics'):
+                stats_key = (pattern_id, variables.get('audience', 'creators'), variables.get('platform', 'social media'))
+                if stats_key in seen_statistics:
+                    agents['statistics']['cache_hits'] += 1
+                else:
+                    page_seconds += call('statistics', pattern_id)
+                seen_statistics.add(stats_key)
+
+            # Copy: one combined call, or main copy + pattern sections in parallel
+            if self.combined_copy:
+                page_seconds += call('copywriting', pattern_id)
+            else:
+                sections = self._sections(pattern_id)
+                max_sections = self.profile.max_sections(blueprint.funnel_stage)
+                copy_calls = 1 + (min(sections, max_sections) if max_sections is not None else sections)
+                copy_seconds = call('copywriting', pattern_id, count=copy_calls, pages=copy_calls)
+                page_seconds += copy_seconds / min(copy_calls, self.copywriter.max_concurrent_calls)
+
+            # Supplementary content
+            if runs('faq_generator'):
+                faq_pages_per_pattern[pattern_id] = faq_pages_per_pattern.get(pattern_id, 0) + 1
+                if self.faq_batch_size <= 1:
+                    page_seconds += call('faq_generator', pattern_id)
+            if runs('seo_optimizer'):
+                seo_pages += 1
+                if self.seo_batch_size <= 0:
+                    page_seconds += call('seo_optimizer', pattern_id)
+            if pattern_id in ['1', '4'] and runs('comparison_table'):
+                page_seconds += call('comparison_table', pattern_id)
+
+            serial_seconds += page_seconds
+
+        # Batched FAQ (per pattern group) and SEO (one window of pages at a time), inline with pages
+        pages = sum(pages_per_pattern.values())
+        if self.faq_batch_size > 1:
+            # The FAQ agent splits groups that would not fit in one reply
+            faq_pages_per_request = min(self.faq_batch_size, FAQGeneratorAgent.max_batch_pages(self.faq_count))
+            for pattern_id, count in faq_pages_per_pattern.items():
+                serial_seconds += call('faq_generator', pattern_id,
+                                       count=math.ceil(count / faq_pages_per_request), pages=count)
+        if self.seo_batch_size > 0 and seo_pages:
+            serial_seconds += call('seo_optimizer', count=math.ceil(seo_pages / self.seo_batch_size), pages=seo_pages)
+
+        totals = {counter: sum(stats[counter] for stats in agents.values())
+                  for counter in ('calls', 'cache_hits', 'prompt_tokens', 'output_tokens', 'seconds', 'cost_usd')}
+
+        # Pages overlap across workers, but no more calls run at once than the concurrency cap
+        wall_seconds = max(serial_seconds / self.workers, totals['seconds'] / self.max_llm_concurrency)
+        minutes = wall_seconds / 60 if wall_seconds else 0
+        return {
+            'pages': pages,
+            'start_index': start_index,
+            'profile': self.profile.name,
+            'workers': self.workers,
+            'max_llm_concurrency': self.max_llm_concurrency,
+            'agents': {agent: stats for agent, stats in agents.items() if stats['calls'] or stats['cache_hits']},
+            'totals': totals,
+            'wall_seconds': wall_seconds,
+            'calls_per_minute': totals['calls'] / minutes if minutes else 0,
+            'tokens_per_minute': (totals['prompt_tokens'] + totals['output_tokens']) / minutes if minutes else 0,
+            'estimates_from': {agent: self.sources[agent] for agent in agents if agents[agent]['calls']}
+        }
+
+
+def print_plan(plan: Dict[str, Any]):
+    """Human-readable plan"""
+    print(f"\n{'='*80}")
+    print("🧮 Batch Plan (dry run - no API calls)")
+    print(f"{'='*80}")
+    print(f"  Pages: {plan['pages']} (starting at index {plan['start_index']})")
+    print(f"  Speed profile: {plan.get('profile', 'quality')}")
+    print(f"  Concurrency: {plan['workers']} page workers, up to {plan['max_llm_concurrency']} Gemini calls in flight")
+    print(f"\n  {'Agent':<20} {'Calls':>6} {'Cached':>7} {'Tokens in':>11} {'Tokens out':>11} {'Cost':>9}  Estimates")
+    for agent, stats in sorted(plan['agents'].items(), key=lambda item: item[1]['cost_usd'], reverse=True):
+        print(f"  {agent:<20} {stats['calls']:>6} {stats['cache_hits']:>7} {stats['prompt_tokens']:>11,.0f} "
+              f"{stats['output_tokens']:>11,.0f} ${stats['cost_usd']:>8.2f}  {plan['estimates_from'].get(agent, '-')}")
+    totals = plan['totals']
+    print(f"  {'TOTAL':<20} {totals['calls']:>6} {totals['cache_hits']:>7} {totals['prompt_tokens']:>11,.0f} "
+          f"{totals['output_tokens']:>11,.0f} ${totals['cost_usd']:>8.2f}")
+    print(f"\n  Estimated wall time: {plan['wall_seconds'] / 60:.1f} minutes")
+    print(f"  Quota needed: ~{plan['calls_per_minute']:.0f} requests/min, "
+          f"~{plan['tokens_per_minute']:,.0f} tokens/min")
+    if plan['pages']:
+        print(f"  Per page: {totals['calls'] / plan['pages']:.1f} calls, ${totals['cost_usd'] / plan['pages']:.4f}")
+    print(f"{'='*80}\n")
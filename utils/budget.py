@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Batch Budget
+Admission control for BatchProcessor: token/dollar caps and a wall-clock deadline
+
+Before each page is started, BatchBudget projects the run's spend if that
+page (and every page already in flight) costs what finished pages cost on
+average, using the live USAGE ledger's running totals by model priced with
+the PriceTable. A page is admitted only if the projection stays within
+max_tokens / max_cost_usd and an average page would finish before the
+deadline. Pages already in flight always finish; pages never admitted stay
+after the checkpoint, so the batch resumes from there.
+
+Until a page has finished, the per-page estimate comes from the dry-run
+planner (utils.batch_planner) when one is supplied.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from utils.token_accounting import USAGE, PriceTable, UsageLedger
+
+
+def parse_deadline(value: str, now: datetime = None) -> datetime:
+    """
+    Deadline from the command line
+
+    Accepts an ISO datetime ("2026-10-20T06:30"), a time of day ("06:30",
+    the next one to come) or a duration in minutes ("+90").
+    """
+    now = now or datetime.now()
+    value = value.strip()
+    if value.startswith('+'):
+        return now + timedelta(minutes=float(value[1:]))
+    if len(value) <= 5 and ':' in value:
+        hour, minute = (int(part) for part in value.split(':'))
+        deadline = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return deadline if deadline > now else deadline + timedelta(days=1)
+    return datetime.fromisoformat(value)
+
+
+class BatchBudget:
+    """Stops admitting pages once the projected spend or finish time would exceed the limits"""
+
+    def __init__(self, max_tokens: int = None, max_cost_usd: float = None, deadline: datetime = None,
+                 prices: PriceTable = None, ledger: UsageLedger = None, estimate: Dict[str, float] = None):
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.deadline = deadline
+        self.prices = prices or PriceTable.load()
+        self.ledger = ledger or USAGE
+        # Per-page estimate ({'tokens', 'cost_usd', 'seconds'}) used until a page has finished
+        self.estimate = estimate or {}
+        self.lock = threading.Lock()
+        self.finished = {'pages': 0, 'tokens': 0, 'cost_usd': 0.0, 'seconds': 0.0}
+        self.stop_reason: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return any(limit is not None for limit in (self.max_tokens, self.max_cost_usd, self.deadline))
+
+    def spent(self) -> Dict[str, float]:
+        """Tokens and cost of every call of the run so far (prefetches included)"""
+        totals = self.ledger.model_totals()
+        return {
+            'tokens': sum(t['prompt_tokens'] + t['output_tokens'] for t in totals.values()),
+            'cost_usd': sum(self.prices.cost(model, t) for model, t in totals.items())
+        }
+
+    def page_finished(self, tokens: int, cost_usd: float, seconds: float):
+        """Feed a finished page into the per-page average"""
+        with self.lock:
+            self.finished['pages'] += 1
+            self.finished['tokens'] += tokens
+            self.finished['cost_usd'] += cost_usd
+            self.finished['seconds'] += seconds
+
+    def per_page(self) -> Dict[str, float]:
+        """Average tokens, cost and latency of a page (the estimate until one has finished)"""
+        with self.lock:
+            pages = self.finished['pages']
+            if not pages:
+                return dict(self.estimate)
+            return {counter: self.finished[counter] / pages for counter in ('tokens', 'cost_usd', 'seconds')}
+
+    def admit(self, in_flight: int = 0) -> bool:
+        """
+        Whether another page may start
+
+        Args:
+            in_flight: Pages started but not finished (already partly in the ledger)
+
+        Returns:
+            False once a limit would be exceeded; stop_reason says which
+        """
+        if self.stop_reason:
+            return False
+        if not self.enabled:
+            return True
+
+        spent = self.spent()
+        page = self.per_page()
+        # In-flight pages are counted in full on top of what they have already spent (conservative)
+        pages_ahead = in_flight + 1
+
+        if self.max_tokens is not None:
+            projected = spent['tokens'] + pages_ahead * page.get('tokens', 0)
+            if projected > self.max_tokens:
+                self.stop_reason = (f"token budget: {spent['tokens']:,} spent, "
+                                    f"~{projected:,.0f} projected > {self.max_tokens:,}")
+        if self.max_cost_usd is not None and not self.stop_reason:
+            projected = spent['cost_usd'] + pages_ahead * page.get('cost_usd', 0.0)
+            if projected > self.max_cost_usd:
+                self.stop_reason = (f"cost budget: ${spent['cost_usd']:.4f} spent, "
+                                    f"~${projected:.4f} projected > ${self.max_cost_usd:g}")
+        if self.deadline is not None and not self.stop_reason:
+            finish = datetime.now() + timedelta(seconds=page.get('seconds', 0.0))
+            if finish > self.deadline:
+                self.stop_reason = f"deadline {self.deadline:%Y-%m-%d %H:%M}: a page would finish ~{finish:%H:%M}"
+
+        return self.stop_reason is None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Limits, spend and the stop reason (for the checkpoint and batch summary)"""
+        return {
+            'max_tokens': self.max_tokens,
+            'max_cost_usd': self.max_cost_usd,
+            'deadline': self.deadline.isoformat() if self.deadline else None,
+            'spent': self.spent(),
+            'stop_reason': self.stop_reason
+        }
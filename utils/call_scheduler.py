@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Agent Call Scheduler
+Per-agent concurrency limits with fair queuing across pages
+
+Every AgentManager.send_message task takes a slot for its agent from the
+shared SCHEDULER. Each agent type has its own limit (agent_limits in
+config/model_routing.json), so with many pages in flight copywriting cannot
+hold every Gemini call while the cheap agents wait: a page blocked on
+copywriting does not stop another page's FAQ or SEO task from running.
+
+When an agent is at its limit, waiting tasks are served by message priority,
+then by the page that has had the fewest agent tasks so far, then in arrival
+order, so pages move through the pipeline evenly instead of all piling up
+at the same stage. Dispatch is work-conserving: a freed slot goes straight to
+the next waiting task and agents without a limit never wait.
+
+Pages are identified by the token accounting PageUsage of the task's
+context (utils.token_accounting), which worker threads inherit.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from utils import deadlines, token_accounting
+from utils.concurrency import PRIORITY_RANK, call_priority
+
+
+class _NoPage:
+    """Stands in for tasks that run outside generate_page() (weak-referenceable)"""
+
+
+NO_PAGE = _NoPage()
+
+
+class AgentScheduler:
+    """Per-agent slots, handed out fairly across pages"""
+
+    def __init__(self, limits: Dict[str, int] = None, default_limit: int = None, enabled: bool = True):
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.enabled = enabled
+        self.condition = threading.Condition()
+        self.queues: Dict[str, list] = {}
+        self.running: Dict[str, int] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+        # Agent tasks granted per page (weak, so finished pages drop out)
+        self.served = weakref.WeakKeyDictionary()
+        self.sequence = itertools.count()
+
+    def configure(self, **settings):
+        """Update settings: enabled, default_limit, limits (per agent key)"""
+        with self.condition:
+            for key, value in settings.items():
+                if key == 'limits' and value is not None:
+                    self.limits = dict(value)
+                elif hasattr(self, key) and value is not None:
+                    setattr(self, key, value)
+            self.condition.notify_all()
+
+    def limit(self, agent: str) -> Optional[int]:
+        """Concurrent tasks allowed for an agent (None = unlimited)"""
+        if not self.enabled:
+            return None
+        return self.limits.get(agent, self.default_limit)
+
+    @contextmanager
+    def slot(self, agent: str, page=None, priority: str = None):
+        """Hold one of the agent's slots for a task"""
+        page = page or token_accounting.current_page() or NO_PAGE
+        rank = PRIORITY_RANK.get(str(priority or call_priority()).lower(), PRIORITY_RANK['medium'])
+        queued_at = time.time()
+        with self.condition:
+            limit = self.limit(agent)
+            queue = self.queues.setdefault(agent, [])
+            ticket = (rank, self.served.get(page, 0), next(self.sequence))
+            heapq.heappush(queue, ticket)
+            try:
+                while limit and (self.running.get(agent, 0) >= limit or queue[0] != ticket):
+                    self.condition.wait()
+                    limit = self.limit(agent)
+            finally:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+            self.running[agent] = self.running.get(agent, 0) + 1
+            self.served[page] = self.served.get(page, 0) + 1
+            stats = self.stats.setdefault(agent, {'tasks': 0, 'waited': 0, 'wait_seconds': 0.0, 'peak_running': 0})
+            stats['tasks'] += 1
+            waited = time.time() - queued_at
+            if waited > 0.001:
+                stats['waited'] += 1
+                stats['wait_seconds'] += waited
+            stats['peak_running'] = max(stats['peak_running'], self.running[agent])
+            self.condition.notify_all()
+
+        def release():
+            with self.condition:
+                self.running[agent] -= 1
+                self.condition.notify_all()
+
+        # Freed early if the task's deadline fires while it holds the slot
+        release = deadlines.releasing(release)
+        try:
+            yield
+        finally:
+            release()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per agent: limit, running, queued, tasks, tasks that waited and average wait (for run summaries)"""
+        with self.condition:
+            return {
+                agent: {
+                    'limit': self.limit(agent),
+                    'running': self.running.get(agent, 0),
+                    'queued': len(self.queues.get(agent, [])),
+                    'tasks': stats['tasks'],
+                    'waited': stats['waited'],
+                    'avg_wait_seconds': stats['wait_seconds'] / stats['waited'] if stats['waited'] else 0.0,
+                    'peak_running': stats['peak_running']
+                }
+                for agent, stats in self.stats.items()
+            }
+
+
+SCHEDULER = AgentScheduler()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Adaptive Concurrency
+AIMD limit on Gemini calls in flight, shared by every agent
+
+Every model call holds a slot from the shared LIMITER. While calls succeed at
+normal latency the limit grows additively (about +1 per limit's worth of
+successes); a 429/503 or a latency spike cuts it multiplicatively. Cuts are
+spaced at least one typical call apart, so a burst of errors from calls that
+were already in flight counts as one congestion signal.
+
+Latency spikes are judged per key (agent), since a copywriting call is
+normally much slower than an SEO call. The current limit is exposed through
+snapshot() and printed whenever it is cut.
+
+When calls queue for a slot, 'high' priority calls are served before
+'medium' and 'low' ones. The priority is the AgentMessage priority, set for
+the task by AgentManager.send_message through a contextvar (so agent worker
+threads started with copy_context keep it).
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict
+
+from utils.model_health import error_status, RATE_LIMIT_STATUS, DEGRADED_STATUS
+
+# Queue order for calls waiting on a slot (unknown priorities wait as 'medium')
+PRIORITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+_call_priority: ContextVar[str] = ContextVar('call_priority', default='medium')
+
+
+def activate_priority(priority: str):
+    """Queue this context's calls at priority; returns a token for deactivate_priority()"""
+    return _call_priority.set(priority or 'medium')
+
+
+def deactivate_priority(token):
+    _call_priority.reset(token)
+
+
+def call_priority() -> str:
+    return _call_priority.get()
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease limit on concurrent calls"""
+
+    def __init__(self, initial_limit: float = 4, min_limit: float = 1, max_limit: float = 32,
+                 increase: float = 1.0, decrease_factor: float = 0.5,
+                 latency_spike_factor: float = 2.5, min_samples: int = 5):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_spike_factor = latency_spike_factor
+        self.min_samples = min_samples
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.waiting = [0] * len(PRIORITY_RANK)
+        self.baselines: Dict[str, float] = {}
+        self.samples: Dict[str, int] = {}
+        self.last_decrease = 0.0
+        self.calls = 0
+        self.decreases = 0
+        self.peak_limit = self.limit
+
+    def configure(self, **settings):
+        """Update settings (keys match the constructor arguments)"""
+        with self.condition:
+            for key, value in settings.items():
+                if hasattr(self, key) and value is not None:
+                    setattr(self, key, value)
+            if settings.get('initial_limit') is not None:
+                self.limit = float(settings['initial_limit'])
+            self.limit = min(max(self.limit, self.min_limit), self.max_limit)
+            self.peak_limit = self.limit
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self, key: str = 'default', priority: str = None):
+        """Hold one in-flight slot for a call; outcome and latency adjust the limit"""
+        rank = PRIORITY_RANK.get(str(priority or call_priority()).lower(), PRIORITY_RANK['medium'])
+        with self.condition:
+            self.waiting[rank] += 1
+            try:
+                # Wait for a free slot and for every higher-priority call queued ahead of this one
+                while self.in_flight >= int(self.limit) or any(self.waiting[:rank]):
+                    self.condition.wait()
+            finally:
+                self.waiting[rank] -= 1
+            self.in_flight += 1
+            self.condition.notify_all()
+        # Held until the request returns, even for a task abandoned at its deadline: the request
+        # still counts against Gemini's rate limits
+        start = time.time()
+        try:
+            yield
+        except Exception as e:
+            self._release()
+            self.record_error(e)
+            raise
+        self._release()
+        self.record_success(key, time.time() - start)
+
+    def _release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.calls += 1
+            self.condition.notify_all()
+
+    def record_success(self, key: str, latency: float):
+        """Grow the limit, or cut it if latency spiked well above the key's baseline"""
+        with self.condition:
+            baseline = self.baselines.get(key)
+            seen = self.samples.get(key, 0)
+            if baseline is not None and seen >= self.min_samples and latency > baseline * self.latency_spike_factor:
+                self._decrease(f"latency spike on {key} ({latency:.1f}s vs {baseline:.1f}s)")
+                return
+            self.baselines[key] = latency if baseline is None else baseline * 0.9 + latency * 0.1
+            self.samples[key] = seen + 1
+            self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self.peak_limit = max(self.peak_limit, self.limit)
+            self.condition.notify_all()
+
+    def record_error(self, error: Exception):
+        """Cut the limit on rate-limit / overload errors (other errors are ignored)"""
+        status = error_status(error)
+        if status in RATE_LIMIT_STATUS or status in DEGRADED_STATUS:
+            with self.condition:
+                self._decrease(f"{status} from Gemini")
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        spacing = min(self.baselines.values()) if self.baselines else 1.0
+        if now - self.last_decrease < spacing:
+            return
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        self.last_decrease = now
+        self.decreases += 1
+        print(f"  📉 LLM concurrency {int(previous)} → {int(self.limit)} ({reason})")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limit and counters (for run summaries)"""
+        with self.condition:
+            return {
+                'limit': int(self.limit), 'in_flight': self.in_flight, 'queued': sum(self.waiting),
+                'peak_limit': int(self.peak_limit),
+                'decreases': self.decreases, 'calls': self.calls
+            }
+
+
+LIMITER = AdaptiveLimiter()
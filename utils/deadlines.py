@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Deadlines
+Per-page and per-agent time limits with graceful degradation
+
+Each Gemini call carries a request timeout (the route's timeout_seconds in
+config/model_routing.json), so a hung generate_content call fails instead of
+blocking its page. On top of that, PSEOOrchestrator.generate_page() opens a
+PageDeadline (the 'deadlines' block's page_seconds) through a contextvar, and
+AgentManager gives every non-critical agent task the smaller of its own
+deadline ('deadlines' → 'agents') and the time left for the page.
+
+Non-critical agents are those with fallback output (BaseAgent.fallback_data:
+statistics, FAQ, SEO, comparison table, schema). A task that misses its
+deadline is abandoned and answered with that fallback; the agent is recorded
+on the page and ends up in PageOutput.degraded_agents. Critical agents
+(strategist, research, copywriting, QC) have no fallback and are bounded by
+their call timeouts only, as are agents whose fallback the speed profile
+does not accept (utils.speed_profiles).
+
+A task's deadline runs from when a pool worker picks it up. When it fires,
+the task's Cancellation is set: the agent's scheduler slot is released at
+once, so the agent's next task can start, and the task stops before its
+next Gemini call or retry (check_cancelled() in utils.llm_client, the
+failover chain and the key pool). A request already in flight cannot be
+aborted through the SDK; it keeps its concurrency-limiter and API-key slots
+until it returns (at its request timeout at the latest), as it still counts
+against Gemini's rate limits, and its result is discarded. The pool is
+sized from the scheduler's agent limits (configure(), called by
+AgentManager).
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, List, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """A task did not finish before its deadline"""
+
+
+class PageDeadline:
+    """Time budget for one page, and the agents that were degraded to meet it"""
+
+    def __init__(self, seconds: float = None):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.degraded: List[str] = []
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left for the page (None = no page deadline)"""
+        if self.seconds is None:
+            return None
+        return self.seconds - (time.monotonic() - self.started)
+
+    def degrade(self, agent: str):
+        with self.lock:
+            if agent not in self.degraded:
+                self.degraded.append(agent)
+
+
+_page_deadline: ContextVar[Optional[PageDeadline]] = ContextVar('page_deadline', default=None)
+
+
+def begin_page(deadline: PageDeadline):
+    """Apply a page deadline to this context; returns a token for end_page()"""
+    return _page_deadline.set(deadline)
+
+
+def end_page(token):
+    _page_deadline.reset(token)
+
+
+def current_page() -> Optional[PageDeadline]:
+    return _page_deadline.get()
+
+
+class Cancellation:
+    """Set when a task's deadline fires; runs the releases of the slots the task holds"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cancelled = False
+        self.releases: List[Callable[[], None]] = []
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            releases, self.releases = self.releases, []
+        for release in releases:
+            release()
+
+    def hold(self, release: Callable[[], None]) -> Callable[[], None]:
+        """release, run at most once: by the holder when it is done or by cancel(), whichever is first"""
+        released = []
+
+        def once():
+            with self.lock:
+                if released:
+                    return
+                released.append(True)
+                if once in self.releases:
+                    self.releases.remove(once)
+            release()
+
+        with self.lock:
+            if not self.cancelled:
+                self.releases.append(once)
+        return once
+
+
+_cancellation: ContextVar[Optional[Cancellation]] = ContextVar('task_cancellation', default=None)
+
+
+def cancelled() -> bool:
+    """Whether the deadline of the task running in this context has fired"""
+    cancellation = _cancellation.get()
+    return cancellation is not None and cancellation.cancelled
+
+
+def check_cancelled():
+    """
+    Stop a task whose deadline has fired (call before each Gemini call or retry)
+
+    Raises:
+        DeadlineExceeded: The task was abandoned at its deadline
+    """
+    if cancelled():
+        raise DeadlineExceeded("task abandoned at its deadline")
+
+
+def releasing(release: Callable[[], None]) -> Callable[[], None]:
+    """A slot's release, also run as soon as this context's task is cancelled (no-op outside a deadline)"""
+    cancellation = _cancellation.get()
+    if cancellation is None:
+        return release
+    return cancellation.hold(release)
+
+
+DEFAULT_WORKERS = 16
+
+_executor: Optional[ThreadPoolExecutor] = None
+_max_workers = DEFAULT_WORKERS
+_executor_lock = threading.Lock()
+
+
+def configure(max_workers: int):
+    """Size the deadline pool (AgentManager: the scheduler limits of agents that can be cut off)"""
+    global _executor, _max_workers
+    max_workers = max(int(max_workers), 1)
+    with _executor_lock:
+        if _executor is not None and max_workers != _max_workers:
+            _executor.shutdown(wait=False)
+            _executor = None
+        _max_workers = max_workers
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix='deadline')
+        return _executor
+
+
+def call_with_deadline(call: Callable[[], Any], seconds: float) -> Any:
+    """
+    Run call (in this context) and wait at most seconds for it, counted from when it starts running
+
+    Raises:
+        DeadlineExceeded: The call is still running; it is cancelled (slots released, no further
+            Gemini calls) and its result discarded
+    """
+    cancellation = Cancellation()
+    started = threading.Event()
+
+    def run():
+        started.set()
+        _cancellation.set(cancellation)
+        return call()
+
+    future = _pool().submit(copy_context().run, run)
+    started.wait()
+    try:
+        return future.result(timeout=max(seconds, 0))
+    except FutureTimeout:
+        cancellation.cancel()
+        raise DeadlineExceeded(f"no result after {seconds:.1f}s")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Hedged Requests
+Cuts tail latency by firing a duplicate call when the first one runs long
+
+A Hedger keeps a rolling window of call latencies per agent. Once an agent
+has enough samples, each call runs on a worker thread; if it has not
+returned within the agent's running p95 of starting, a duplicate is fired
+and the first valid result wins. The p95 is timed from when the call starts
+running, so time spent waiting for a pool worker never triggers a hedge. The other call is cancelled if it has not started yet;
+a request already in flight cannot be aborted through the SDK, so its
+result is simply discarded.
+
+Hedges are capped at max_hedge_rate of all calls so the extra spend stays
+bounded. Hedging is off by default ('hedging' in config/model_routing.json,
+or batch_generator.py --hedge).
+"""
+
+import math
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextvars import copy_context
+from typing import Any, Callable, Deque, Dict
+
+
+class Hedger:
+    """Per-agent latency percentiles and hedged execution"""
+
+    def __init__(self, enabled: bool = False, percentile: float = 95, min_samples: int = 20,
+                 window: int = 200, max_hedge_rate: float = 0.1, max_workers: int = 32):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.max_hedge_rate = max_hedge_rate
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._executor = None
+
+    def configure(self, **settings):
+        """Update settings (keys match the constructor arguments)"""
+        with self.lock:
+            for key, value in settings.items():
+                if hasattr(self, key) and value is not None:
+                    setattr(self, key, value)
+
+    def threshold(self, key: str):
+        """Running percentile latency for key, or None until min_samples calls are recorded"""
+        with self.lock:
+            samples = sorted(self.latencies.get(key, ()))
+        if len(samples) < max(self.min_samples, 1):
+            return None
+        index = min(len(samples) - 1, math.ceil(self.percentile / 100 * len(samples)) - 1)
+        return samples[max(index, 0)]
+
+    def record(self, key: str, latency: float):
+        with self.lock:
+            if key not in self.latencies:
+                self.latencies[key] = deque(maxlen=self.window)
+            self.latencies[key].append(latency)
+
+    def _may_hedge(self) -> bool:
+        """Reserve a hedge if it keeps hedges within max_hedge_rate of calls"""
+        with self.lock:
+            if self.hedged + 1 > self.max_hedge_rate * self.calls:
+                return False
+            self.hedged += 1
+            return True
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='hedge')
+            return self._executor
+
+    def _submit(self, key: str, call: Callable[[], Any], timed: bool, started: threading.Event = None):
+        """Run call on the pool in a copy of this context (keeps the model route); started is set when it begins"""
+        def timed_call():
+            start = time.time()
+            if started is not None:
+                started.set()
+            result = call()
+            if timed:
+                self.record(key, time.time() - start)
+            return result
+        return self._pool().submit(copy_context().run, timed_call)
+
+    def run(self, key: str, call: Callable[[], Any], accept: Callable[[Any], bool] = None) -> Any:
+        """
+        Run call(), hedging it if it outlives key's running p95
+
+        Args:
+            key: Latency bucket (agent key)
+            call: Zero-argument function making one model call
+            accept: Whether a result is valid; an invalid first result waits for the other call
+
+        Returns:
+            The first accepted result (or the last result if none is accepted)
+        """
+        with self.lock:
+            self.calls += 1
+        delay = self.threshold(key) if self.enabled else None
+
+        if delay is None:
+            start = time.time()
+            result = call()
+            self.record(key, time.time() - start)
+            return result
+
+        # Only the original call feeds the percentile, so hedging does not drag p95 down
+        started = threading.Event()
+        primary = self._submit(key, call, timed=True, started=started)
+        started.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._may_hedge():
+            return primary.result()
+
+        print(f"  🏇 {key} call past p95 ({delay:.1f}s), hedging")
+        hedge = self._submit(key, call, timed=False)
+        pending = {primary, hedge}
+        outcome = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    outcome = outcome or future
+                    continue
+                if accept is None or accept(future.result()):
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        with self.lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                outcome = future
+        return outcome.result()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hedge counters (for run summaries)"""
+        with self.lock:
+            return {'calls': self.calls, 'hedged': self.hedged, 'hedge_wins': self.hedge_wins}
+
+
+HEDGER = Hedger()
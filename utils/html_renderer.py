@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Static HTML Renderer
+Renders generated pages (PageOutput.to_dict_public()) into a static site tree
+
+Templates are compiled once per pattern and reused for every page of that
+pattern, and markdown conversion is memoized so repeated blocks (fallback copy,
+shared CTAs) are only converted once per process. Pages are written to
+{site_dir}/{url_slug}/index.html.
+"""
+
+import os
+import re
+import json
+import html
+import glob
+from string import Template
+from functools import lru_cache
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$meta_title</title>
+<meta name="description" content="$meta_description">
+<link rel="canonical" href="$canonical_url">
+$json_ld
+</head>
+<body class="pseo-page pattern-$pattern_id">
+<main>
+$body
+</main>
+</body>
+</html>
+"""
+
+# Body sections in render order. Each maps to a placeholder filled per page.
+SECTION_PLACEHOLDERS = {
+    'hero': '$hero',
+    'problem_agitation': '<section class="problem">\n$problem_agitation\n</section>',
+    'solution_overview': '<section class="solution">\n$solution_overview\n</section>',
+    'comparison_table': '$comparison_table',
+    'feature_sections': '$feature_sections',
+    'faq': '$faq',
+    'related_pages': '$related_pages',
+    'final_cta': '<section class="final-cta">\n$final_cta\n</section>',
+}
+
+DEFAULT_SECTION_ORDER = [
+    'hero',
+    'problem_agitation',
+    'solution_overview',
+    'feature_sections',
+    'faq',
+    'related_pages',
+    'final_cta'
+]
+
+
+@lru_cache(maxsize=4096)
+def markdown_to_html(text: str) -> str:
+    """
+    Convert the markdown subset produced by the agents into HTML
+
+    Supports headings, paragraphs, unordered/ordered lists, bold, italic,
+    inline code and links. Results are memoized per process.
+
+    Args:
+        text: Markdown text
+
+    Returns:
+        HTML fragment
+    """
+    if not text:
+        return ''
+
+    blocks = []
+    paragraph = []
+    list_items = []
+    list_tag = None
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    def flush_list():
+        nonlocal list_tag
+        if list_items:
+            items = ''.join(f"<li>{_inline(item)}</li>" for item in list_items)
+            blocks.append(f"<{list_tag}>{items}</{list_tag}>")
+            list_items.clear()
+        list_tag = None
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+
+        if not line:
+            flush_paragraph()
+            flush_list()
+            continue
+
+        heading = re.match(r'^(#{1,6})\s+(.*)$', line)
+        unordered = re.match(r'^[-*+]\s+(.*)$', line)
+        ordered = re.match(r'^\d+[.)]\s+(.*)$', line)
+
+        if heading:
+            flush_paragraph()
+            flush_list()
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif unordered or ordered:
+            flush_paragraph()
+            tag = 'ul' if unordered else 'ol'
+            if list_tag and list_tag != tag:
+                flush_list()
+            list_tag = tag
+            list_items.append((unordered or ordered).group(1))
+        else:
+            flush_list()
+            paragraph.append(line)
+
+    flush_paragraph()
+    flush_list()
+
+    return '\n'.join(blocks)
+
+
+def _inline(text: str) -> str:
+    """Convert inline markdown (bold, italic, code, links) after escaping"""
+    text = html.escape(text, quote=False)
+    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])', r'<em>\1</em>', text)
+    text = re.sub(
+        r'\[([^\]]+)\]\(([^)\s]+)\)',
+        lambda m: f'<a href="{html.escape(m.group(2), quote=True)}">{m.group(1)}</a>',
+        text
+    )
+    return text
+
+
+class StaticSiteRenderer:
+    """Renders page dicts into static HTML using precompiled per-pattern templates"""
+
+    def __init__(self, pattern_library: Dict, site_dir: str = 'output/site',
+                 base_url: str = 'https://sozee.ai'):
+        """
+        Initialize renderer and compile one template per pattern
+
+        Args:
+            pattern_library: Contents of config/patterns.json
+            site_dir: Root directory of the static site tree
+            base_url: Public site URL used for canonical links and JSON-LD
+        """
+        self.pattern_library = pattern_library
+        self.site_dir = site_dir
+        self.base_url = base_url.rstrip('/')
+
+        self.templates = {}
+        self.body_templates = {}
+        for pattern in pattern_library.get('patterns', []):
+            body = self._compile_body(pattern)
+            self.body_templates[str(pattern.get('id'))] = Template(body)
+            self.templates[str(pattern.get('id'))] = Template(PAGE_TEMPLATE.replace('$body', body))
+
+        default_body = self._compile_body({})
+        self.default_body_template = Template(default_body)
+        self.default_template = Template(PAGE_TEMPLATE.replace('$body', default_body))
+
+    def _compile_body(self, pattern: Dict) -> str:
+        """Build the body layout for a pattern (comparison table only where the pattern shows one)"""
+        order = list(DEFAULT_SECTION_ORDER)
+        if pattern.get('show_comparison_table'):
+            order.insert(order.index('feature_sections'), 'comparison_table')
+
+        return '\n'.join(SECTION_PLACEHOLDERS[section] for section in order)
+
+    def render_page(self, page: Dict) -> str:
+        """
+        Render a single page dict to HTML
+
+        Args:
+            page: Page dict from PageOutput.to_dict_public() (or to_dict())
+
+        Returns:
+            Complete HTML document
+        """
+        pattern_id = str(page.get('pattern_id', ''))
+        template = self.templates.get(pattern_id, self.default_template)
+        page_url = self._page_url(page.get('url_slug', ''))
+
+        return template.substitute(
+            meta_title=html.escape(page.get('meta_title') or page.get('post_title', '')),
+            meta_description=html.escape(page.get('meta_description', '')),
+            canonical_url=html.escape(page_url),
+            json_ld=self.render_json_ld(page),
+            pattern_id=html.escape(pattern_id),
+            **self._section_values(page)
+        )
+
+    def render_content(self, page: Dict) -> str:
+        """
+        Render only the page body (no <html>/<head>), e.g. for CMS post content
+
+        Args:
+            page: Page dict from PageOutput.to_dict_public()
+
+        Returns:
+            HTML fragment with the pattern's sections
+        """
+        pattern_id = str(page.get('pattern_id', ''))
+        template = self.body_templates.get(pattern_id, self.default_body_template)
+        return template.substitute(**self._section_values(page))
+
+    def render_json_ld(self, page: Dict) -> str:
+        """Render the page's schema markup as a JSON-LD script block"""
+        return self._render_json_ld(page.get('schema_markup', []), self._page_url(page.get('url_slug', '')))
+
+    def _section_values(self, page: Dict) -> Dict[str, str]:
+        """Rendered HTML for every body section placeholder"""
+        return dict(
+            hero=self._render_hero(page.get('hero_section', {})),
+            problem_agitation=markdown_to_html(page.get('problem_agitation', '')),
+            solution_overview=markdown_to_html(page.get('solution_overview', '')),
+            comparison_table=self._render_comparison_table(page),
+            feature_sections=self._render_features(page.get('feature_sections', [])),
+            faq=self._render_faq(page.get('faq_json', [])),
+            related_pages=self._render_related_pages(page.get('related_pages', [])),
+            final_cta=markdown_to_html(page.get('final_cta', ''))
+        )
+
+    def write_page(self, page: Dict) -> str:
+        """
+        Render a page and write it to {site_dir}/{url_slug}/index.html
+
+        Returns:
+            Path of the written file
+        """
+        slug = page.get('url_slug', '').strip('/')
+        if not slug or '..' in slug.split('/'):
+            raise ValueError(f"Invalid url_slug for page {page.get('page_id')}: '{page.get('url_slug')}'")
+
+        page_dir = os.path.join(self.site_dir, slug)
+        os.makedirs(page_dir, exist_ok=True)
+
+        path = os.path.join(page_dir, 'index.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.render_page(page))
+        return path
+
+    def render_site(self, pages: List[Dict], workers: Optional[int] = None) -> List[str]:
+        """
+        Render many pages in parallel across CPU cores
+
+        Each worker process builds its own renderer once (templates are compiled
+        per process, not per page) and renders pages in chunks.
+
+        Args:
+            pages: Page dicts to render
+            workers: Number of worker processes (default: os.cpu_count())
+
+        Returns:
+            List of written file paths
+        """
+        if not pages:
+            return []
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(pages) < 2 * workers:
+            return [self.write_page(page) for page in pages]
+
+        chunksize = max(1, len(pages) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.pattern_library, self.site_dir, self.base_url)
+        ) as executor:
+            paths = list(executor.map(_write_page_in_worker, pages, chunksize=chunksize))
+
+        print(f"  ✓ Rendered {len(paths)} pages to {self.site_dir}")
+        return paths
+
+    def _page_url(self, url_slug: str) -> str:
+        """Absolute URL for a page slug"""
+        return f"{self.base_url}/{url_slug.strip('/')}"
+
+    def _render_json_ld(self, schemas: List[Dict], page_url: str) -> str:
+        """Embed SchemaMarkupAgent output as a single JSON-LD block"""
+        if not schemas:
+            return ''
+
+        if len(schemas) == 1:
+            payload = schemas[0]
+        else:
+            payload = {"@context": "https://schema.org", "@graph": schemas}
+
+        # Schema agent leaves "[page-slug]" placeholders for the publishing step
+        data = json.dumps(payload, ensure_ascii=False)
+        data = data.replace(f"{self.base_url}/[page-slug]", page_url)
+        data = data.replace('</', '<\\/')
+
+        return f'<script type="application/ld+json">{data}</script>'
+
+    def _render_hero(self, hero: Dict) -> str:
+        """Render hero section"""
+        if not isinstance(hero, dict):
+            return ''
+
+        parts = ['<header class="hero">']
+        if hero.get('eyebrow'):
+            parts.append(f'<p class="eyebrow">{html.escape(hero["eyebrow"])}</p>')
+        parts.append(f'<h1>{html.escape(hero.get("h1", ""))}</h1>')
+        if hero.get('subtitle'):
+            parts.append(f'<p class="subtitle">{html.escape(hero["subtitle"])}</p>')
+        if hero.get('primary_cta'):
+            parts.append(f'<a class="cta cta-primary" href="{self.base_url}/signup">{html.escape(hero["primary_cta"])}</a>')
+        if hero.get('secondary_cta'):
+            parts.append(f'<a class="cta cta-secondary" href="{self.base_url}/how-it-works">{html.escape(hero["secondary_cta"])}</a>')
+        parts.append('</header>')
+
+        return '\n'.join(parts)
+
+    def _render_comparison_table(self, page: Dict) -> str:
+        """Render comparison table rows from ComparisonTableAgent"""
+        rows = page.get('comparison_table_json') or []
+        if not rows:
+            return ''
+
+        competitor = (page.get('comparison_competitor') or page.get('pseo_variables', {}).get('competitor')
+                      or 'Competitor')
+
+        lines = [
+            '<section class="comparison">',
+            '<table>',
+            f'<thead><tr><th>Feature</th><th>Sozee</th><th>{html.escape(competitor)}</th></tr></thead>',
+            '<tbody>'
+        ]
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            css = ' class="sozee-advantage"' if row.get('sozee_advantage') is True else ''
+            lines.append(
+                f'<tr{css}><td>{html.escape(str(row.get("feature", "")))}</td>'
+                f'<td>{html.escape(str(row.get("sozee", "")))}</td>'
+                f'<td>{html.escape(str(row.get("competitor", "")))}</td></tr>'
+            )
+        lines.extend(['</tbody>', '</table>', '</section>'])
+
+        return '\n'.join(lines)
+
+    def _render_features(self, features: List[Dict]) -> str:
+        """Render feature sections"""
+        if not features:
+            return ''
+
+        lines = ['<section class="features">']
+        for feature in features:
+            if not isinstance(feature, dict):
+                continue
+            lines.append('<div class="feature">')
+            lines.append(f'<h3>{html.escape(feature.get("title", ""))}</h3>')
+            lines.append(markdown_to_html(feature.get('content', '')))
+            lines.append('</div>')
+        lines.append('</section>')
+
+        return '\n'.join(lines)
+
+    def _render_faq(self, faqs: List[Dict]) -> str:
+        """Render FAQ pairs"""
+        if not faqs:
+            return ''
+
+        lines = ['<section class="faq">', '<h2>Frequently Asked Questions</h2>']
+        for faq in faqs:
+            if not isinstance(faq, dict):
+                continue
+            lines.append('<details>')
+            lines.append(f'<summary>{html.escape(faq.get("question", ""))}</summary>')
+            lines.append(markdown_to_html(faq.get('answer', '')))
+            lines.append('</details>')
+        lines.append('</section>')
+
+        return '\n'.join(lines)
+
+    def _render_related_pages(self, related: List[Dict]) -> str:
+        """Render internal links from the link graph stage"""
+        if not related:
+            return ''
+
+        lines = ['<nav class="related-pages">', '<h2>Related</h2>', '<ul>']
+        for link in related:
+            href = html.escape(self._page_url(link.get('url_slug', '')), quote=True)
+            lines.append(f'<li><a href="{href}">{html.escape(link.get("title") or link.get("url_slug", ""))}</a></li>')
+        lines.extend(['</ul>', '</nav>'])
+
+        return '\n'.join(lines)
+
+
+# Per-process renderer used by render_site() workers
+_worker_renderer = None
+
+
+def _init_worker(pattern_library: Dict, site_dir: str, base_url: str):
+    """Build the renderer (and compile templates) once per worker process"""
+    global _worker_renderer
+    _worker_renderer = StaticSiteRenderer(pattern_library, site_dir=site_dir, base_url=base_url)
+
+
+def _write_page_in_worker(page: Dict) -> str:
+    return _worker_renderer.write_page(page)
+
+
+def load_pages(output_dir: str = 'output') -> List[Dict]:
+    """
+    Load generated page JSON files (page_*.json) from the output directory
+
+    Args:
+        output_dir: Directory written by BatchProcessor
+
+    Returns:
+        List of page dicts
+    """
+    pages = []
+    for path in sorted(glob.glob(os.path.join(output_dir, 'page_*.json'))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages.append(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Skipping unreadable page file {path}: {e}")
+    return pages
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tolerant JSON Parsing
+Salvages model output that json.loads rejects
+
+Gemini replies cut off at max_output_tokens, or carrying comments, trailing
+commas or chatter around the JSON, used to be thrown away whole. parse_json()
+streams through the text once and keeps the largest valid prefix:
+
+- unterminated string values are closed ("Start yo" -> "Start yo")
+- open arrays/objects are closed
+- dangling keys, commas and half-written literals are cut back
+- // and /* */ comments and trailing commas are dropped
+- Python literals (True/False/None) are mapped to JSON
+
+The second return value tells the caller whether anything was repaired.
+"""
+
+import json
+from typing import Any, List, Tuple
+
+_CLOSERS = {'{': '}', '[': ']'}
+_LITERAL_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-.')
+_PYTHON_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+
+
+def _strip_fences(text: str) -> str:
+    """Remove a markdown code fence around the JSON"""
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else text[3:]
+    if text.rstrip().endswith('```'):
+        text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def _trim_partial_escape(body: str) -> str:
+    """Drop an escape sequence cut off at the end of a truncated string"""
+    backslash = body.rfind('\\', max(0, len(body) - 6))
+    if backslash == -1:
+        return body
+    # Count the run of backslashes: an even run is literal backslashes, not an escape
+    run = len(body[:backslash + 1]) - len(body[:backslash + 1].rstrip('\\'))
+    escape = body[backslash - run + 1:] if run % 2 else ''
+    if not escape:
+        return body
+    complete = len(escape) >= 2 and (escape[1] != 'u' or len(escape) >= 6)
+    return body if complete else body[:len(body) - len(escape)]
+
+
+def _salvage(text: str) -> str:
+    """Single pass over text, returning the longest prefix that closes into valid JSON"""
+    start = min((i for i in (text.find('{'), text.find('[')) if i != -1), default=-1)
+    if start == -1:
+        raise json.JSONDecodeError("No JSON object or array found", text, 0)
+
+    out: List[str] = []
+    stack: List[str] = []
+    expect_key: List[bool] = []  # Parallel to stack; only meaningful for objects
+    pending_comma = False
+    checkpoint = (0, ())  # (len(out), stack) after the last complete value
+
+    def mark():
+        nonlocal checkpoint
+        checkpoint = (len(out), tuple(stack))
+
+    def emit(chunk: str):
+        nonlocal pending_comma
+        if pending_comma:
+            out.append(',')
+            pending_comma = False
+        out.append(chunk)
+
+    i, n = start, len(text)
+    while i < n:
+        c = text[i]
+
+        if c.isspace():
+            i += 1
+
+        elif c == '/' and text[i + 1:i + 2] in ('/', '*'):
+            end = text.find('\n' if text[i + 1] == '/' else '*/', i + 2)
+            i = n if end == -1 else end + (1 if text[i + 1] == '/' else 2)
+
+        elif c == '"':
+            j, escaped = i + 1, False
+            while j < n:
+                if escaped:
+                    escaped = False
+                elif text[j] == '\\':
+                    escaped = True
+                elif text[j] == '"':
+                    break
+                j += 1
+            is_key = bool(stack) and stack[-1] == '{' and expect_key[-1]
+
+            if j >= n:
+                # Truncated: keep a value's partial text, drop a partial key
+                if not is_key:
+                    emit(_trim_partial_escape(text[i:n]) + '"')
+                    mark()
+                break
+
+            emit(text[i:j + 1])
+            i = j + 1
+            if is_key:
+                expect_key[-1] = False
+            elif stack:
+                mark()
+            else:
+                mark()
+                break
+
+        elif c in _CLOSERS:
+            emit(c)
+            stack.append(c)
+            expect_key.append(c == '{')
+            mark()
+            i += 1
+
+        elif c in '}]':
+            if not stack or _CLOSERS[stack[-1]] != c:
+                break
+            pending_comma = False  # Trailing comma
+            stack.pop()
+            expect_key.pop()
+            out.append(c)
+            mark()
+            i += 1
+            if not stack:
+                break
+
+        elif c == ',':
+            if stack and stack[-1] == '{':
+                expect_key[-1] = True
+            pending_comma = True
+            i += 1
+
+        elif c == ':':
+            out.append(':')
+            i += 1
+
+        elif c in _LITERAL_CHARS:
+            j = i
+            while j < n and text[j] in _LITERAL_CHARS:
+                j += 1
+            if j >= n:
+                break  # Literal may be cut off ("tru", "12")
+            literal = text[i:j]
+            emit(_PYTHON_LITERALS.get(literal, literal))
+            mark()
+            i = j
+            if not stack:
+                break
+
+        else:
+            break
+
+    length, open_containers = checkpoint
+    return ''.join(out[:length]) + ''.join(_CLOSERS[c] for c in reversed(open_containers))
+
+
+def parse_json(text: str) -> Tuple[Any, bool]:
+    """
+    Parse model output as JSON, salvaging what it can
+
+    Args:
+        text: Raw model output (may be fenced, truncated or commented)
+
+    Returns:
+        (data, repaired) - repaired is True if the text was not valid JSON as-is
+
+    Raises:
+        json.JSONDecodeError: Nothing salvageable
+    """
+    text = _strip_fences(text)
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        pass
+
+    salvaged = _salvage(text)
+    return json.loads(salvaged), True
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+JSONL Page Stream
+Emits one compact JSON record per completed page for Unix pipelines
+
+In stream mode progress output (print) moves to stderr so stdout carries only
+page records, e.g.:
+
+    python batch_generator.py --phase week_1 --jsonl | jq -c '.url_slug'
+
+A path target (regular file or named pipe created with mkfifo) is written
+instead of stdout; progress output then stays where it was.
+"""
+
+import os
+import sys
+import json
+from typing import Dict, Optional, TextIO
+
+
+class JSONLStream:
+    """Line-buffered JSONL writer that flushes after every page record"""
+
+    def __init__(self, target: str = '-'):
+        """
+        Initialize stream
+
+        Args:
+            target: '-' for stdout, otherwise a file or named pipe path.
+                    Opening a named pipe blocks until a reader connects.
+        """
+        self.target = target
+        self.records = 0
+        self.closed = False
+        self._owns_handle = target != '-'
+
+        if target == '-':
+            # Keep the real stdout for records, send everything printed to stderr
+            self.handle: Optional[TextIO] = sys.stdout
+            sys.stdout = sys.stderr
+        else:
+            self.handle = open(target, 'w', buffering=1, encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, record: Dict) -> bool:
+        """
+        Write one record as a single line and flush it
+
+        Returns:
+            False once the reader has gone away (e.g. `| head`), True otherwise
+        """
+        if self.closed:
+            return False
+
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str)
+        try:
+            self.handle.write(line + '\n')
+            self.handle.flush()
+        except BrokenPipeError:
+            print("⚠️ JSONL reader closed the stream, continuing without it", file=sys.stderr)
+            # Point the dead pipe at devnull so the interpreter's exit flush doesn't fail again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), self.handle.fileno())
+            if self._owns_handle:
+                self.handle.close()
+            self.closed = True
+            return False
+
+        self.records += 1
+        return True
+
+    def close(self):
+        """Flush and release the target, restoring stdout"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._owns_handle:
+            self.handle.close()
+        else:
+            self.handle.flush()
+            sys.stdout = self.handle
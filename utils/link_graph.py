@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Internal Link Graph Builder
+Computes top-K related pages for every page in the PSEO matrix
+
+Pages are indexed in hash-based inverted indexes keyed by (variable, value),
+e.g. ('competitor', 'Higgsfield') or ('audience', 'OnlyFans Creators'). Related
+candidates for a page come only from the posting lists of its own variable
+values, so no pairwise comparison across the whole matrix is needed. Posting
+lists are capped per key, which keeps the build near-linear as
+config/variables.json grows.
+"""
+
+import math
+import heapq
+from typing import Dict, List
+
+
+# How much a shared variable value counts toward relatedness
+VARIABLE_WEIGHTS = {
+    'competitor': 3.0,
+    'audience': 2.0,
+    'platform': 1.5,
+    'use_case': 1.5,
+    'tool_type': 1.0
+}
+
+# Prefer links that move readers across patterns (e.g. vs → alternative → review)
+CROSS_PATTERN_BONUS = 0.5
+
+
+class LinkGraphBuilder:
+    """Builds related-page links from pattern + pseo_variables using inverted indexes"""
+
+    def __init__(self, top_k: int = 5, max_postings: int = 500):
+        """
+        Initialize builder
+
+        Args:
+            top_k: Related pages to keep per page
+            max_postings: Max candidates considered per (variable, value) key.
+                          Bounds work per page so the build stays near-linear.
+        """
+        self.top_k = top_k
+        self.max_postings = max_postings
+        self.pages = {}
+        self.index = {}
+
+    def add_page(self, page_id: str, pattern_id: str, variables: Dict,
+                 url_slug: str, title: str = ''):
+        """
+        Add a page to the graph
+
+        Args:
+            page_id: Unique page ID
+            pattern_id: Pattern ID (1-6)
+            variables: pseo_variables for the page
+            url_slug: Page URL slug
+            title: Link anchor text (post_title)
+        """
+        if page_id in self.pages:
+            return
+
+        keys = [(name, value) for name, value in variables.items() if name in VARIABLE_WEIGHTS and value]
+
+        self.pages[page_id] = {
+            'page_id': page_id,
+            'pattern_id': str(pattern_id),
+            'url_slug': url_slug,
+            'title': title,
+            'keys': keys
+        }
+
+        for key in keys:
+            self.index.setdefault(key, []).append(page_id)
+
+    def build(self) -> Dict[str, List[Dict]]:
+        """
+        Compute top-K related pages for every page
+
+        Returns:
+            Dict mapping page_id → list of related page dicts
+            ({'page_id', 'url_slug', 'title', 'score'}), best first
+        """
+        # Positions let capped posting lists take a window around the page itself,
+        # so large groups still link to a stable, varied neighborhood
+        positions = {
+            key: {page_id: i for i, page_id in enumerate(postings)}
+            for key, postings in self.index.items()
+            if len(postings) > self.max_postings
+        }
+
+        graph = {}
+        for page_id, page in self.pages.items():
+            scores = {}
+
+            for key in page['keys']:
+                postings = self.index[key]
+                if len(postings) > self.max_postings:
+                    center = positions[key][page_id]
+                    start = max(0, min(center - self.max_postings // 2, len(postings) - self.max_postings))
+                    postings = postings[start:start + self.max_postings]
+
+                # Rarer shared values say more about relatedness (IDF-style damping)
+                weight = VARIABLE_WEIGHTS[key[0]] / math.log2(1 + len(self.index[key]))
+
+                for candidate_id in postings:
+                    if candidate_id != page_id:
+                        scores[candidate_id] = scores.get(candidate_id, 0.0) + weight
+
+            for candidate_id in scores:
+                if self.pages[candidate_id]['pattern_id'] != page['pattern_id']:
+                    scores[candidate_id] += CROSS_PATTERN_BONUS
+
+            best = heapq.nlargest(self.top_k, scores.items(), key=lambda item: (item[1], item[0]))
+            graph[page_id] = [
+                {
+                    'page_id': candidate_id,
+                    'url_slug': self.pages[candidate_id]['url_slug'],
+                    'title': self.pages[candidate_id]['title'],
+                    'score': round(score, 3)
+                }
+                for candidate_id, score in best
+            ]
+
+        print(f"  ✓ Link graph built: {len(graph)} pages, {len(self.index)} index keys")
+        return graph
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+LLM Client
+Shared Gemini call path for all agents
+
+generate_json() requests the SDK's JSON output mode (with a response_schema
+where the schema allows it), parses the reply and validates it against the
+agent's schema in utils/response_schemas.py. Truncated or slightly malformed
+replies are salvaged with utils.json_repair before anything is re-requested;
+a reply that is still invalid gets one targeted retry that lists the exact
+problems, instead of the agent silently falling back to canned content.
+
+Each attempt runs through utils.hedging.HEDGER, which (when enabled) fires a
+duplicate call once an attempt outlives the agent's running p95 latency and
+keeps the first valid reply. Every model call holds a slot from
+utils.concurrency.LIMITER, the shared adaptive (AIMD) in-flight limit, is
+sent with the active route's request timeout (utils.deadlines), and its
+usage metadata is recorded by utils.token_accounting.
+"""
+
+import json
+import time
+from typing import Any, List, Tuple
+
+import google.generativeai as genai
+
+from utils.json_repair import parse_json
+from utils.hedging import HEDGER
+from utils.concurrency import LIMITER
+from utils.token_accounting import USAGE
+from utils import deadlines, model_router
+from utils.prompt_prefixes import PromptPrefix
+from utils.response_schemas import validate, api_schema
+
+
+class StructuredOutputError(ValueError):
+    """Model output could not be parsed or did not match its schema after retries"""
+
+    def __init__(self, schema_name: str, errors: List[str], text: str = ''):
+        self.schema_name = schema_name
+        self.errors = errors
+        self.text = text
+        super().__init__(f"{schema_name} response invalid: {'; '.join(errors[:3])}")
+
+
+def generate(model, prompt: str, max_output_tokens: int, temperature: float,
+             prefix: PromptPrefix = None, key: str = 'default', **config) -> Any:
+    """
+    Single Gemini call
+
+    Args:
+        model: genai.GenerativeModel (or anything with generate_content)
+        prompt: Prompt text
+        max_output_tokens: Output token cap
+        temperature: Sampling temperature
+        prefix: Static prompt block placed ahead of the prompt (see utils.prompt_prefixes)
+        key: Agent key (latency spikes in the concurrency limiter, token accounting)
+        **config: Extra GenerationConfig fields (response_mime_type, response_schema, ...)
+
+    Returns:
+        SDK response (use .text)
+    """
+    # A task abandoned at its deadline makes no further calls
+    deadlines.check_cancelled()
+    if prefix is not None:
+        prompt = prefix.apply(prompt)
+
+    generation_config = genai.types.GenerationConfig(
+        max_output_tokens=max_output_tokens,
+        temperature=temperature,
+        **config
+    )
+    # A hung call fails at the route's request timeout instead of blocking the page
+    route = model_router.active_route()
+    options = {}
+    if route is not None and route.timeout_seconds:
+        options['request_options'] = {'timeout': route.timeout_seconds}
+    with LIMITER.slot(key):
+        start = time.time()
+        response = model.generate_content(prompt, generation_config=generation_config, **options)
+        seconds = time.time() - start
+    USAGE.record(response, agent=key, model=_served_by(model, response), seconds=seconds)
+    return response
+
+
+def _served_by(model, response) -> str:
+    """Model name that produced a response (failover chains tag the response)"""
+    served = getattr(response, 'served_model', None)
+    if served:
+        return served
+    route = model_router.active_route()
+    name = getattr(model, 'model_name', None) or (route.model if route else model_router.DEFAULT_MODEL)
+    return str(name).replace('models/', '')
+
+
+def _drop_partial_tail(schema_name: str, data: Any, errors: List[str]) -> Tuple[Any, List[str]]:
+    """A truncated array's last item is often incomplete; drop it if it is the only problem"""
+    if not isinstance(data, list) or len(data) < 2:
+        return data, errors
+    tail = f"$[{len(data) - 1}]"
+    if not all(error.startswith(tail) for error in errors):
+        return data, errors
+    trimmed = data[:-1]
+    return trimmed, validate(schema_name, trimmed)
+
+
+def _parse_reply(schema_name: str, text: str) -> Tuple[Any, List[str], bool]:
+    """(data, errors, repaired) for one reply"""
+    try:
+        data, repaired = parse_json(text)
+    except json.JSONDecodeError as e:
+        return None, [f"invalid JSON: {e}"], False
+    errors = validate(schema_name, data)
+    if repaired and errors:
+        data, errors = _drop_partial_tail(schema_name, data, errors)
+    return data, errors, repaired
+
+
+def generate_json(model, prompt: str, schema_name: str, max_output_tokens: int,
+                  temperature: float, retries: int = 1, prefix: PromptPrefix = None,
+                  hedge_key: str = None) -> Any:
+    """
+    Call Gemini in JSON mode and return data that matches schema_name
+
+    Args:
+        model: genai.GenerativeModel
+        prompt: Prompt text (should still describe the expected JSON)
+        schema_name: Key in utils.response_schemas.SCHEMAS
+        max_output_tokens: Output token cap
+        temperature: Sampling temperature
+        retries: Extra attempts after an invalid response
+        prefix: Static prompt prefix (see utils.prompt_prefixes)
+        hedge_key: Latency bucket for hedging and the concurrency limiter (agent key; defaults to schema_name)
+
+    Returns:
+        Parsed, validated JSON
+
+    Raises:
+        StructuredOutputError: Still invalid after retries
+    """
+    config = {'response_mime_type': 'application/json'}
+    schema = api_schema(schema_name)
+    if schema is not None:
+        config['response_schema'] = schema
+
+    key = hedge_key or schema_name
+
+    def attempt_call(attempt_prompt):
+        text = generate(model, attempt_prompt, max_output_tokens, temperature,
+                        prefix=prefix, key=key, **config).text
+        return (text,) + _parse_reply(schema_name, text)
+
+    attempt_prompt = prompt
+    errors, text = [], ''
+    for attempt in range(retries + 1):
+        deadlines.check_cancelled()
+        text, data, errors, repaired = HEDGER.run(
+            key,
+            lambda p=attempt_prompt: attempt_call(p),
+            accept=lambda reply: not reply[2]
+        )
+        if not errors:
+            if repaired:
+                print(f"  🩹 Salvaged malformed/truncated {schema_name} response")
+            return data
+
+        if attempt < retries:
+            print(f"  ⚠️ {schema_name} response invalid ({errors[0]}), retrying")
+            problems = '\n'.join(f"- {error}" for error in errors[:10])
+            attempt_prompt = f"""{prompt}
+
+**YOUR PREVIOUS RESPONSE WAS REJECTED:**
+{problems}
+
+Return ONLY valid JSON that fixes these problems."""
+
+    raise StructuredOutputError(schema_name, errors, text)
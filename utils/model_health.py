@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Model Health and Failover
+Moves calls off a rate-limited or degraded model and back once it recovers
+
+Every routed Gemini call goes through a FailoverModel holding the agent's
+ordered chain (primary first, then the route's fallbacks). A shared
+ModelHealth tracker watches each model:
+
+- 429 / quota errors put the model in cool-down immediately
+- Repeated 5xx / timeout errors, or repeated calls slower than the latency
+  threshold, put it in cool-down after a few in a row
+
+While a model cools down, calls skip to the next healthy model in the chain.
+When the window ends the model is tried again; a success clears its record.
+If every model in a chain is cooling down, the one that recovers first is used.
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+from utils import deadlines
+
+RATE_LIMIT_STATUS = {429}
+DEGRADED_STATUS = {500, 502, 503, 504}
+
+
+def error_status(error: Exception):
+    """HTTP-style status of an SDK error, if it has one"""
+    code = getattr(error, 'code', None)
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        pass
+    text = str(error)
+    for status in RATE_LIMIT_STATUS | DEGRADED_STATUS:
+        if text.startswith(str(status)):
+            return status
+    if 'quota' in text.lower() or 'resource exhausted' in text.lower():
+        return 429
+    return None
+
+
+class ModelHealth:
+    """Per-model error/latency record and cool-down windows"""
+
+    def __init__(self, cooldown_seconds: float = 60.0, latency_threshold_seconds: float = 45.0,
+                 slow_calls_to_trip: int = 3, errors_to_trip: int = 2):
+        self.cooldown_seconds = cooldown_seconds
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.slow_calls_to_trip = slow_calls_to_trip
+        self.errors_to_trip = errors_to_trip
+        self.lock = threading.Lock()
+        self.models: Dict[str, Dict[str, Any]] = {}
+
+    def configure(self, **settings):
+        """Update thresholds (keys match the constructor arguments)"""
+        with self.lock:
+            for key, value in settings.items():
+                if hasattr(self, key) and value is not None:
+                    setattr(self, key, value)
+
+    def _state(self, model: str) -> Dict[str, Any]:
+        if model not in self.models:
+            self.models[model] = {
+                'calls': 0, 'failures': 0, 'rate_limited': 0, 'trips': 0,
+                'consecutive_errors': 0, 'consecutive_slow': 0, 'cooldown_until': 0.0
+            }
+        return self.models[model]
+
+    def _trip(self, model: str, state: Dict[str, Any], reason: str):
+        state['cooldown_until'] = time.monotonic() + self.cooldown_seconds
+        state['trips'] += 1
+        state['consecutive_errors'] = 0
+        state['consecutive_slow'] = 0
+        print(f"  🚦 {model} {reason}, routing to fallbacks for {self.cooldown_seconds:.0f}s")
+
+    def order(self, chain: List[str]) -> List[str]:
+        """Chain reordered: healthy models in chain order, then cooling ones by recovery time"""
+        now = time.monotonic()
+        with self.lock:
+            cooling = {model: self._state(model)['cooldown_until'] for model in chain}
+        healthy = [model for model in chain if cooling[model] <= now]
+        waiting = sorted((model for model in chain if cooling[model] > now), key=cooling.get)
+        return healthy + waiting
+
+    def record_success(self, model: str, latency: float):
+        with self.lock:
+            state = self._state(model)
+            state['calls'] += 1
+            state['consecutive_errors'] = 0
+            if latency > self.latency_threshold_seconds:
+                state['consecutive_slow'] += 1
+                if state['consecutive_slow'] >= self.slow_calls_to_trip:
+                    self._trip(model, state, f"slow ({latency:.0f}s per call)")
+            else:
+                state['consecutive_slow'] = 0
+
+    def record_failure(self, model: str, error: Exception) -> bool:
+        """
+        Record a failed call
+
+        Returns:
+            True if the error is one to fail over on (rate limit / degraded service)
+        """
+        status = error_status(error)
+        if status not in RATE_LIMIT_STATUS | DEGRADED_STATUS:
+            return False
+        with self.lock:
+            state = self._state(model)
+            state['calls'] += 1
+            state['failures'] += 1
+            if status in RATE_LIMIT_STATUS:
+                state['rate_limited'] += 1
+                self._trip(model, state, "rate-limited (429)")
+            else:
+                state['consecutive_errors'] += 1
+                if state['consecutive_errors'] >= self.errors_to_trip:
+                    self._trip(model, state, f"degraded ({status})")
+        return True
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Counters per model (for run summaries)"""
+        with self.lock:
+            return {
+                model: {key: state[key] for key in ('calls', 'failures', 'rate_limited', 'trips')}
+                for model, state in self.models.items()
+            }
+
+
+HEALTH = ModelHealth()
+
+
+class FailoverModel:
+    """generate_content() over an ordered model chain, guided by ModelHealth"""
+
+    def __init__(self, chain: List[Tuple[str, Any]], health: ModelHealth = None,
+                 on_failover: Callable[[Exception], None] = None):
+        self.chain = dict(chain)
+        self.names = [name for name, _ in chain]
+        self.health = health or HEALTH
+        # Called with each error that was failed over (e.g. to back off the concurrency limit)
+        self.on_failover = on_failover
+
+    def generate_content(self, prompt, **kwargs):
+        last_error = None
+        for name in self.health.order(self.names):
+            if last_error is not None:
+                deadlines.check_cancelled()
+            start = time.time()
+            try:
+                response = self.chain[name].generate_content(prompt, **kwargs)
+            except Exception as e:
+                if not self.health.record_failure(name, e):
+                    raise
+                if self.on_failover:
+                    self.on_failover(e)
+                last_error = e
+                continue
+            self.health.record_success(name, time.time() - start)
+            try:
+                response.served_model = name  # For token accounting / pricing
+            except AttributeError:
+                pass
+            return response
+        raise last_error
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Model Router
+Picks the Gemini model, output cap and temperature for each agent call
+
+Routes come from config/model_routing.json: a default, per-agent entries and
+per-pattern overrides. Each route may list fallback models, used by
+utils.model_health when the primary is rate-limited or degraded; the
+'failover', 'hedging', 'concurrency' and 'key_pool' blocks configure
+utils.model_health, utils.hedging, utils.concurrency and utils.api_key_pool;
+'agent_limits' and 'deadlines' are read by AgentManager (utils.call_scheduler,
+utils.deadlines). AgentManager builds each agent with its agent-level
+model and activates the (agent, pattern) route around every task, so
+BaseAgent.generate_json() can switch model or adjust parameters per page
+without the agents knowing about patterns.
+
+The active route lives in a contextvar. Work an agent hands to a thread pool
+must be submitted through contextvars.copy_context().run to keep its route.
+"""
+
+import os
+import json
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import google.generativeai as genai
+
+from utils.api_key_pool import KEY_POOL
+
+DEFAULT_MODEL = 'gemini-2.0-flash-exp'
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'config', 'model_routing.json')
+
+
+@dataclass(frozen=True)
+class Route:
+    """Model choice for one agent on one pattern"""
+    agent: str
+    model: str
+    max_output_tokens: Optional[int] = None  # Cap on the agent's own per-call value
+    temperature: Optional[float] = None      # Overrides the agent's own per-call value
+    fallbacks: Tuple[str, ...] = ()          # Failover order after the primary model
+    timeout_seconds: Optional[float] = None  # Request timeout for each call (utils.deadlines)
+
+    def apply(self, max_output_tokens: int, temperature: float):
+        """(max_output_tokens, temperature) for a call after routing overrides"""
+        if self.max_output_tokens is not None:
+            max_output_tokens = min(max_output_tokens, self.max_output_tokens)
+        if self.temperature is not None:
+            temperature = self.temperature
+        return max_output_tokens, temperature
+
+
+_active_route: ContextVar[Optional[Route]] = ContextVar('active_route', default=None)
+
+
+def active_route() -> Optional[Route]:
+    """Route of the agent task running in this context (None outside AgentManager)"""
+    return _active_route.get()
+
+
+def activate(route: Optional[Route]):
+    """Set the active route; returns a token for deactivate()"""
+    return _active_route.set(route)
+
+
+def deactivate(token):
+    _active_route.reset(token)
+
+
+_models: Dict[str, genai.GenerativeModel] = {}
+_models_lock = threading.Lock()
+
+
+def shared_model(model_name: str) -> genai.GenerativeModel:
+    """One GenerativeModel per model name, shared by every agent routed to it (spread over the key pool)"""
+    with _models_lock:
+        if model_name not in _models:
+            _models[model_name] = KEY_POOL.wrap(genai.GenerativeModel(model_name))
+        return _models[model_name]
+
+
+class ModelRouter:
+    """Resolves routes from the routing table"""
+
+    def __init__(self, config: Dict = None):
+        config = config or {}
+        self.default = config.get('default', {})
+        self.agents = config.get('agents', {})
+        self.patterns = {str(k): v for k, v in config.get('patterns', {}).items()}
+        self.failover = config.get('failover', {})
+        self.hedging = config.get('hedging', {})
+        self.concurrency = config.get('concurrency', {})
+        self.key_pool = config.get('key_pool', {})
+        self.agent_limits = config.get('agent_limits', {})
+        self.deadlines = config.get('deadlines', {})
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CONFIG_PATH) -> 'ModelRouter':
+        """Router from config/model_routing.json (every agent on the default model if missing)"""
+        try:
+            with open(path, 'r') as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            print(f"  ⚠️ Could not load model routing from {path}: {e}")
+            return cls()
+
+    def route(self, agent: str, pattern_id: str = None) -> Route:
+        """Route for an agent, with the pattern's overrides applied"""
+        settings = dict(self.default)
+        settings.update(self.agents.get(agent, {}))
+        if pattern_id is not None:
+            settings.update(self.patterns.get(str(pattern_id), {}).get(agent, {}))
+        model = settings.get('model', DEFAULT_MODEL)
+        return Route(
+            agent=agent,
+            model=model,
+            max_output_tokens=settings.get('max_output_tokens'),
+            temperature=settings.get('temperature'),
+            fallbacks=tuple(name for name in settings.get('fallbacks', []) if name != model),
+            timeout_seconds=settings.get('timeout_seconds')
+        )
+
+    def describe(self, agents: List[str], pattern_id: str = None) -> str:
+        """Compact summary of models used for a page, e.g. 'gemini-2.0-flash: copywriting; ...'"""
+        by_model: Dict[str, List[str]] = {}
+        for agent in agents:
+            by_model.setdefault(self.route(agent, pattern_id).model, []).append(agent)
+        return '; '.join(f"{model}: {', '.join(names)}" for model, names in by_model.items())
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Prompt Prefixes
+Static brand context placed at the start of every prompt that uses it
+
+Agents declare their static blocks (brand differentiators, Content Crisis
+framing, FAQ guidelines, SEO rules) as PromptPrefix objects and pass one with
+each Gemini call; llm_client.generate() puts the prefix text ahead of the
+per-page prompt. Calls that share a prefix therefore start with identical
+tokens, which is what Gemini's implicit caching keys on: on models that
+support it, a repeated leading span above the model's minimum cacheable size
+is billed at the cached-input rate and reported as cached_content_token_count
+(the 'cached' column of the token usage report, utils.token_accounting).
+
+There is no explicit context cache. Each block is well below the minimum size
+Gemini accepts for cached content, and cached content is bound to one model
+and one API key's project, which the failover and key-pool wrappers switch
+between per call.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    """Named static prompt block"""
+    name: str
+    text: str
+
+    def apply(self, prompt: str) -> str:
+        """Prompt with this block in front"""
+        return f"{self.text}\n\n{prompt}"
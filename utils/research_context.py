@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Research Context Builder
+Fits research agent output into a prompt under an explicit token budget
+
+Research data is split into facts (one list item or field each), serialized
+compactly once per page, then for every prompt the facts are ranked by
+relevance to that prompt's focus (pattern angle, section brief) and packed
+greedily until the budget is spent. Nothing is cut mid-object: a fact is
+either included whole or left out.
+"""
+
+import re
+import json
+import math
+from typing import Any, Dict, List, Union
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+_KEYWORD = re.compile(r"[a-z0-9]{4,}")
+
+# Fields that carry the facts copy is built from, ranked ahead of descriptive fields
+FIELD_PRIORITY = {
+    'pain_points': 3.0,
+    'key_statistics': 3.0,
+    'objections': 2.0,
+    'desires': 2.0,
+    'features': 2.0,
+    'pricing': 2.0,
+    'weaknesses': 2.0,
+    'emotional_triggers': 1.5,
+    'current_solutions': 1.5,
+    'key_insights': 1.5,
+    'market_trends': 1.0,
+    'setup': 1.0,
+    'strengths': 1.0
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local token estimate (no API call)
+
+    Counts punctuation as one token and words as one token per ~4 characters,
+    which tracks Gemini's tokenizer closely enough for budgeting.
+    """
+    return sum(math.ceil(len(piece) / 4) for piece in _WORD.findall(text))
+
+
+def _compact(value: Any) -> str:
+    """Compact JSON without indentation; plain strings stay unquoted"""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def _keywords(text: str) -> set:
+    return set(_KEYWORD.findall(text.lower()))
+
+
+class ResearchContext:
+    """Research data for one page, pre-serialized for repeated prompt rendering"""
+
+    def __init__(self, research_data: Dict[str, Any]):
+        self.research_data = research_data or {}
+        self.facts = []
+
+        for agent_name, data in self.research_data.items():
+            if not isinstance(data, dict):
+                data = {'data': data}
+            for field, value in data.items():
+                if isinstance(value, list):
+                    parts = [(field, i, item) for i, item in enumerate(value)]
+                elif isinstance(value, dict):
+                    parts = [(f"{field}.{key}", 0, item) for key, item in value.items()]
+                else:
+                    parts = [(field, 0, value)]
+
+                for label, position, item in parts:
+                    if item in (None, '', [], {}):
+                        continue
+                    text = _compact(item)
+                    self.facts.append({
+                        'order': len(self.facts),
+                        'agent': agent_name,
+                        'label': label,
+                        'text': text,
+                        'tokens': estimate_tokens(text) + 1,  # + ' | ' separator
+                        'keywords': _keywords(text),
+                        'priority': FIELD_PRIORITY.get(field, 0.5) - 0.1 * position
+                    })
+
+    @classmethod
+    def ensure(cls, research: Union['ResearchContext', Dict[str, Any]]) -> 'ResearchContext':
+        """Accept either raw research data or an already-built context"""
+        return research if isinstance(research, cls) else cls(research)
+
+    def render(self, budget_tokens: int, focus: str = '') -> str:
+        """
+        Research block for a prompt
+
+        Args:
+            budget_tokens: Maximum estimated tokens for the block
+            focus: Prompt text the research should support (angle, section brief)
+
+        Returns:
+            Markdown block grouped by agent and field, in original order
+        """
+        if not self.facts:
+            return "No research data available"
+
+        focus_keywords = _keywords(focus)
+
+        def score(fact):
+            overlap = len(fact['keywords'] & focus_keywords)
+            return fact['priority'] + overlap / math.sqrt(len(fact['keywords']) or 1)
+
+        selected = []
+        agents, fields = set(), set()
+        remaining = budget_tokens
+        for fact in sorted(self.facts, key=score, reverse=True):
+            # First fact of an agent/field also pays for its header
+            cost = fact['tokens']
+            if fact['agent'] not in agents:
+                cost += estimate_tokens(f"**From {fact['agent']}:**")
+            if (fact['agent'], fact['label']) not in fields:
+                cost += estimate_tokens(f"- {fact['label']}:")
+            if cost <= remaining:
+                selected.append(fact)
+                agents.add(fact['agent'])
+                fields.add((fact['agent'], fact['label']))
+                remaining -= cost
+
+        grouped: Dict[str, Dict[str, List[str]]] = {}
+        for fact in sorted(selected, key=lambda f: f['order']):
+            grouped.setdefault(fact['agent'], {}).setdefault(fact['label'], []).append(fact['text'])
+
+        lines = []
+        for agent_name, fields in grouped.items():
+            lines.append(f"\n**From {agent_name}:**")
+            for label, texts in fields.items():
+                lines.append(f"- {label}: {' | '.join(texts)}")
+
+        return '\n'.join(lines) if lines else "No research data available"
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Agent Response Schemas
+Declares the JSON shape each agent expects back from Gemini
+
+Schemas use the OpenAPI subset Gemini accepts for response_schema (type,
+properties, required, items, enum, nullable), plus two local-only keys:
+
+- additionalProperties: schema for objects keyed by dynamic IDs (page_1, item_3, ...)
+- min_items / max_items: array bounds
+
+Validators are compiled once at import; validate() returns a list of
+path-qualified problems so a retry prompt can name exactly what was wrong.
+Schemas that use local-only keys, or untyped fields, are validated locally
+and requested with JSON mime type only.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _string(**extra) -> Dict:
+    return dict({'type': 'string'}, **extra)
+
+
+def _array(items: Dict, **extra) -> Dict:
+    return dict({'type': 'array', 'items': items}, **extra)
+
+
+def _object(properties: Dict, required: List[str] = None, **extra) -> Dict:
+    schema = {'type': 'object', 'properties': properties}
+    if required:
+        schema['required'] = required
+    schema.update(extra)
+    return schema
+
+
+FAQ_ITEMS = _array(
+    _object({'question': _string(), 'answer': _string()}, required=['question', 'answer']),
+    min_items=1
+)
+
+SEO_METADATA = _object(
+    {'meta_title': _string(), 'meta_description': _string(), 'focus_keyword': _string()},
+    required=['meta_title', 'meta_description', 'focus_keyword']
+)
+
+COMPARISON_ROWS = _array(
+    _object(
+        {'feature': _string(), 'sozee': _string(), 'competitor': _string(), 'sozee_advantage': {'type': 'boolean'}},
+        required=['feature', 'sozee', 'competitor']
+    ),
+    min_items=1
+)
+
+PATTERN_SECTION = _object(
+    {
+        'heading': _string(),
+        'subheading': _string(nullable=True),
+        'content': _array(_object(
+            {
+                'item_heading': _string(nullable=True),
+                'item_body': _string(),
+                'icon_suggestion': _string(nullable=True)
+            },
+            required=['item_body']
+        )),
+        'visual_style': _string(),
+        'cta_text': _string(nullable=True)
+    },
+    required=['heading', 'content']
+)
+
+COPY_PROPERTIES = {
+    'hero': _object(
+        {
+            'h1': _string(),
+            'eyebrow': _string(),
+            'subtitle': _string(),
+            'primary_cta': _string(),
+            'secondary_cta': _string()
+        },
+        required=['h1']
+    ),
+    'problem': _string(),
+    'solution': _string(),
+    'features': _array(_object({'title': _string(), 'content': _string()}, required=['title', 'content'])),
+    'comparison_table': _array(_object(
+        {'feature': _string(), 'sozee': _string(), 'competitor': _string()},
+        required=['feature', 'sozee', 'competitor']
+    )),
+    'final_cta': _string()
+}
+COPY_REQUIRED = ['hero', 'problem', 'solution', 'features', 'final_cta']
+
+
+def _insight_list(fields: List[str]) -> Dict:
+    return _array(_object({field: _string() for field in fields}, required=fields[:1]))
+
+
+SCHEMAS = {
+    'audience_insights': _object(
+        {
+            'audience_segment': _string(),
+            'pain_points': _insight_list(['pain', 'intensity', 'frequency']),
+            'desires': _insight_list(['desire', 'motivation', 'priority']),
+            'objections': _insight_list(['objection', 'severity', 'response']),
+            'current_solutions': _insight_list(['solution', 'limitations', 'replacement_opportunity']),
+            'emotional_triggers': _insight_list(['emotion', 'trigger', 'messaging']),
+            'content_preferences': _object({'platforms': _array(_string()), 'format': _string(), 'tone': _string()}),
+            'key_insights': _array(_string())
+        },
+        required=['pain_points', 'desires', 'objections']
+    ),
+
+    # nsfw_support etc. may be boolean or a qualifier string, so fields stay untyped
+    'competitor_profile': _object(
+        {
+            'category': _string(),
+            'target_audience': _string(),
+            'positioning': _string(),
+            'setup': {'type': 'object'},
+            'features': {'type': 'object'},
+            'pricing': {'type': 'object'},
+            'strengths': _array(_string()),
+            'weaknesses': _array(_string())
+        },
+        required=['category', 'setup', 'features', 'pricing']
+    ),
+
+    'statistics': _object(
+        {
+            'key_statistics': _array(_object(
+                {
+                    'stat': _string(),
+                    'context': _string(),
+                    'source_type': _string(),
+                    'year': _string(),
+                    'relevance': _string(),
+                    'credibility': _string(enum=['high', 'medium', 'low'])
+                },
+                required=['stat', 'credibility']
+            )),
+            'market_trends': _array(_object({'trend': _string(), 'impact': _string()}, required=['trend'])),
+            'supporting_facts': _array(_string())
+        },
+        required=['key_statistics']
+    ),
+
+    'comparison_table': COMPARISON_ROWS,
+    'page_copy': _object(COPY_PROPERTIES, required=COPY_REQUIRED),
+    'combined_copy': _object(
+        dict(COPY_PROPERTIES, pattern_sections={'type': 'object', 'additionalProperties': {'type': 'object'}}),
+        required=COPY_REQUIRED
+    ),
+    'pattern_section': PATTERN_SECTION,
+    'faqs': FAQ_ITEMS,
+    'faq_batch': {'type': 'object', 'additionalProperties': {}},
+    'seo_metadata': SEO_METADATA,
+    'seo_metadata_batch': {'type': 'object', 'additionalProperties': {}}
+}
+
+
+_TYPE_CHECKS = {
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'string': lambda v: isinstance(v, str),
+    'boolean': lambda v: isinstance(v, bool),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool)
+}
+
+
+def _compile(schema: Dict) -> Callable[[Any, str, List[str]], None]:
+    """Turn a schema into a checker closure (walks the schema once, not per response)"""
+    type_name = schema.get('type')
+    type_check = _TYPE_CHECKS.get(type_name)
+    nullable = schema.get('nullable', False)
+    enum = set(schema['enum']) if 'enum' in schema else None
+    min_items = schema.get('min_items')
+    max_items = schema.get('max_items')
+    required = schema.get('required', [])
+    properties = {name: _compile(sub) for name, sub in schema.get('properties', {}).items()}
+    additional = _compile(schema['additionalProperties']) if 'additionalProperties' in schema else None
+    items = _compile(schema['items']) if 'items' in schema else None
+
+    def check(value: Any, path: str, errors: List[str]):
+        if value is None and nullable:
+            return
+        if type_check and not type_check(value):
+            errors.append(f"{path}: expected {type_name}, got {type(value).__name__}")
+            return
+        if enum is not None and value not in enum:
+            errors.append(f"{path}: {value!r} not one of {sorted(enum)}")
+
+        if type_name == 'object':
+            for name in required:
+                if name not in value:
+                    errors.append(f"{path}.{name}: missing required field")
+            for name, sub_value in value.items():
+                if name in properties:
+                    properties[name](sub_value, f"{path}.{name}", errors)
+                elif additional is not None:
+                    additional(sub_value, f"{path}.{name}", errors)
+
+        elif type_name == 'array':
+            if min_items is not None and len(value) < min_items:
+                errors.append(f"{path}: expected at least {min_items} items, got {len(value)}")
+            if max_items is not None and len(value) > max_items:
+                errors.append(f"{path}: expected at most {max_items} items, got {len(value)}")
+            if items is not None:
+                for i, item in enumerate(value):
+                    items(item, f"{path}[{i}]", errors)
+
+    return check
+
+
+def _to_api_schema(schema: Dict) -> Optional[Dict]:
+    """Gemini response_schema form, or None if the schema needs local-only features"""
+    if 'additionalProperties' in schema or 'type' not in schema:
+        return None
+    if schema['type'] == 'object' and not schema.get('properties'):
+        return None
+
+    api = {key: value for key, value in schema.items()
+           if key in ('type', 'nullable', 'enum', 'required', 'description')}
+    if 'items' in schema:
+        api['items'] = _to_api_schema(schema['items'])
+        if api['items'] is None:
+            return None
+    if 'properties' in schema:
+        api['properties'] = {}
+        for name, sub in schema['properties'].items():
+            api['properties'][name] = _to_api_schema(sub)
+            if api['properties'][name] is None:
+                return None
+    return api
+
+
+VALIDATORS = {name: _compile(schema) for name, schema in SCHEMAS.items()}
+API_SCHEMAS = {name: _to_api_schema(schema) for name, schema in SCHEMAS.items()}
+
+
+def validate(schema_name: str, data: Any) -> List[str]:
+    """
+    Validate parsed JSON against a named schema
+
+    Returns:
+        List of problems (empty if valid)
+    """
+    errors = []
+    VALIDATORS[schema_name](data, '$', errors)
+    return errors
+
+
+def api_schema(schema_name: str) -> Optional[Dict]:
+    """response_schema to send to Gemini for this schema (None = JSON mime type only)"""
+    return API_SCHEMAS[schema_name]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Sitemap Generator
+Maintains sharded XML sitemaps and a sitemap index for generated pages
+
+A manifest (sitemap_manifest.json) records which shard every url_slug lives in
+and its last generated_at. Each run only takes the pages produced by that run,
+so only the shards containing new or changed pages are rewritten, and the full
+page store never has to be re-scanned.
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+
+# Sitemap protocol limit (https://www.sitemaps.org/protocol.html)
+MAX_URLS_PER_SITEMAP = 50000
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+class SitemapGenerator:
+    """Incremental, sharded sitemap writer keyed by url_slug"""
+
+    def __init__(self, sitemap_dir: str, base_url: str = 'https://sozee.ai',
+                 max_urls: int = MAX_URLS_PER_SITEMAP):
+        """
+        Initialize generator and load the shard manifest if one exists
+
+        Args:
+            sitemap_dir: Directory for sitemap.xml and shard files
+            base_url: Public site URL prefixed to every url_slug
+            max_urls: URLs per shard (protocol limit is 50,000)
+        """
+        if max_urls < 1 or max_urls > MAX_URLS_PER_SITEMAP:
+            raise ValueError(f"max_urls must be between 1 and {MAX_URLS_PER_SITEMAP}")
+
+        self.sitemap_dir = sitemap_dir
+        self.base_url = base_url.rstrip('/')
+        self.max_urls = max_urls
+        self.manifest_path = os.path.join(sitemap_dir, 'sitemap_manifest.json')
+
+        os.makedirs(sitemap_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        """Load shard manifest from disk"""
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Could not read sitemap manifest, rebuilding: {e}")
+
+        return {'urls': {}, 'shards': []}
+
+    def update(self, pages: List[Dict]) -> List[str]:
+        """
+        Add or refresh pages and rewrite only the affected shards
+
+        Args:
+            pages: Page dicts containing at least url_slug and generated_at
+
+        Returns:
+            List of shard file paths that were rewritten
+        """
+        urls = self.manifest['urls']
+        shards = self.manifest['shards']
+        dirty_shards = set()
+
+        for page in pages:
+            slug = page.get('url_slug', '')
+            if not slug:
+                continue
+            slug = '/' + slug.strip('/')
+            lastmod = page.get('generated_at') or datetime.now().isoformat()
+
+            entry = urls.get(slug)
+            if entry:
+                if entry['lastmod'] != lastmod:
+                    entry['lastmod'] = lastmod
+                    dirty_shards.add(entry['shard'])
+                continue
+
+            # New URL: append to the last shard, opening a new one when full
+            if not shards or shards[-1]['count'] >= self.max_urls:
+                shards.append({'file': f"sitemap-{len(shards) + 1}.xml", 'count': 0})
+            shard_index = len(shards) - 1
+            shards[shard_index]['count'] += 1
+            urls[slug] = {'lastmod': lastmod, 'shard': shard_index}
+            dirty_shards.add(shard_index)
+
+        if not dirty_shards:
+            print("  ✓ Sitemap up to date (no shards changed)")
+            return []
+
+        # Group URLs by shard once, then rewrite only dirty shards
+        shard_urls = {index: [] for index in dirty_shards}
+        for slug, entry in urls.items():
+            if entry['shard'] in shard_urls:
+                shard_urls[entry['shard']].append((slug, entry['lastmod']))
+
+        written = []
+        for index in sorted(dirty_shards):
+            shard = shards[index]
+            shard['lastmod'] = max(lastmod for _, lastmod in shard_urls[index])
+            path = os.path.join(self.sitemap_dir, shard['file'])
+            self._write_atomic(path, self._render_urlset(sorted(shard_urls[index])))
+            written.append(path)
+
+        self._write_atomic(os.path.join(self.sitemap_dir, 'sitemap.xml'), self._render_index())
+        self._write_atomic(self.manifest_path, json.dumps(self.manifest))
+
+        print(f"  ✓ Sitemap updated: {len(written)}/{len(shards)} shards rewritten, {len(urls)} URLs total")
+        return written
+
+    def _render_urlset(self, entries: List[tuple]) -> str:
+        """Render one sitemap shard"""
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{SITEMAP_NS}">']
+        for slug, lastmod in entries:
+            lines.append(
+                f"<url><loc>{escape(self.base_url + slug)}</loc>"
+                f"<lastmod>{self._w3c_date(lastmod)}</lastmod></url>"
+            )
+        lines.append('</urlset>')
+        return '\n'.join(lines) + '\n'
+
+    def _render_index(self) -> str:
+        """Render the sitemap index pointing at every shard"""
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{SITEMAP_NS}">']
+        for shard in self.manifest['shards']:
+            lines.append(
+                f"<sitemap><loc>{escape(self.base_url + '/' + shard['file'])}</loc>"
+                f"<lastmod>{self._w3c_date(shard.get('lastmod', ''))}</lastmod></sitemap>"
+            )
+        lines.append('</sitemapindex>')
+        return '\n'.join(lines) + '\n'
+
+    def _w3c_date(self, timestamp: Optional[str]) -> str:
+        """Reduce an ISO timestamp (generated_at) to a W3C date"""
+        return (timestamp or datetime.now().isoformat())[:10]
+
+    def _write_atomic(self, path: str, content: str):
+        """Write file via temp file + rename so readers never see partial sitemaps"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Speed Profiles
+Trade page depth for throughput: which agents run, how many pattern sections
+are written and which fallbacks are acceptable (config/speed_profiles.json)
+
+The PSEO Strategist's agent_task_list names every agent a page needs;
+PSEOOrchestrator runs the tasks the active profile keeps for the page's
+funnel stage. Copywriting (and the strategist) always run. A skipped agent
+whose fallback the profile accepts still contributes its fallback output
+(no Gemini call); other skipped agents are left out of the page.
+
+Fallbacks also decide deadlines (utils.deadlines): only agents whose
+fallback the profile accepts are cut off at their deadline, the rest are
+treated as critical.
+"""
+
+import os
+import json
+from typing import Dict, List, Optional
+
+DEFAULT_PROFILES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'config', 'speed_profiles.json')
+
+# Agents a profile cannot skip
+ALWAYS_RUN = ('pseo_strategist', 'copywriting')
+
+
+class SpeedProfile:
+    """Agents, pattern sections and fallbacks for each funnel stage"""
+
+    def __init__(self, name: str = 'quality', config: Dict = None):
+        config = config or {}
+        self.name = name
+        self.description = config.get('description', '')
+        # Funnel stage → agent keys that run ("all" or missing = every agent in the task list)
+        self.agents: Dict[str, object] = config.get('agents', {})
+        # Funnel stage → pattern sections written by copywriting (null or missing = all)
+        self.max_pattern_sections: Dict[str, Optional[int]] = config.get('max_pattern_sections', {})
+        # Agent keys whose fallback output is acceptable (None = every agent with a fallback)
+        fallbacks = config.get('fallbacks')
+        self.fallbacks = set(fallbacks) if fallbacks is not None else None
+
+    def runs(self, agent: str, funnel_stage: str) -> bool:
+        """Whether the agent runs on pages of this funnel stage"""
+        if agent in ALWAYS_RUN:
+            return True
+        agents = self.agents.get(funnel_stage, 'all')
+        return agents == 'all' or agent in agents
+
+    def max_sections(self, funnel_stage: str) -> Optional[int]:
+        """Pattern sections to write (None = all)"""
+        return self.max_pattern_sections.get(funnel_stage)
+
+    def accepts_fallback(self, agent: str) -> bool:
+        return self.fallbacks is None or agent in self.fallbacks
+
+    def describe(self) -> List[str]:
+        """One line per funnel stage (for run headers)"""
+        lines = []
+        for stage in ('top', 'mid', 'bottom'):
+            agents = self.agents.get(stage, 'all')
+            sections = self.max_sections(stage)
+            lines.append(f"{stage}: {'all agents' if agents == 'all' else ', '.join(agents) or 'copywriting only'}; "
+                         f"{'all' if sections is None else sections} pattern sections")
+        return lines
+
+    @classmethod
+    def load(cls, name: str = None, path: str = DEFAULT_PROFILES_PATH) -> 'SpeedProfile':
+        """
+        A profile from config/speed_profiles.json (the file's default when name is None)
+
+        Without the file every agent runs, as before profiles existed.
+
+        Raises:
+            ValueError: Unknown profile name
+        """
+        try:
+            with open(path, 'r') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            return cls(name or 'quality')
+        name = name or config.get('default', 'quality')
+        profiles = config.get('profiles', {})
+        if name not in profiles:
+            raise ValueError(f"Unknown speed profile '{name}' (available: {', '.join(profiles)})")
+        return cls(name, profiles[name])
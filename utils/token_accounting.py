@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Token Accounting
+Records prompt/output tokens of every Gemini call from response usage metadata
+
+llm_client.generate() passes each response to record(), tagged with the
+calling agent, the model that served it and the call latency. PSEOOrchestrator.generate_page()
+opens a PageUsage for the page (through a contextvar, so agent worker threads
+started with copy_context keep it); its totals are stored on
+PageOutput.token_usage. The shared USAGE ledger aggregates every call of the
+run by agent, pattern and model, and PriceTable (config/model_pricing.json)
+turns token counts into cost for the batch summary.
+"""
+
+import os
+import json
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PRICING_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'config', 'model_pricing.json')
+
+COUNTERS = ('calls', 'prompt_tokens', 'output_tokens', 'cached_tokens', 'seconds')
+
+
+def _empty() -> Dict[str, int]:
+    return {counter: 0 for counter in COUNTERS}
+
+
+def _add(totals: Dict[str, int], usage: Dict[str, int]):
+    for counter in COUNTERS:
+        totals[counter] += usage.get(counter, 0)
+
+
+def usage_from_response(response) -> Dict[str, int]:
+    """Token counts from a response's usage_metadata (zeros if the SDK did not report them)"""
+    metadata = getattr(response, 'usage_metadata', None)
+    return {
+        'calls': 1,
+        'prompt_tokens': int(getattr(metadata, 'prompt_token_count', 0) or 0),
+        'output_tokens': int(getattr(metadata, 'candidates_token_count', 0) or 0),
+        'cached_tokens': int(getattr(metadata, 'cached_content_token_count', 0) or 0)
+    }
+
+
+class PageUsage:
+    """Token totals for one page, by agent"""
+
+    def __init__(self, pattern_id: str = None, page_id: str = None):
+        self.pattern_id = pattern_id
+        self.page_id = page_id
+        self.lock = threading.Lock()
+        self.by_agent: Dict[str, Dict[str, int]] = {}
+
+    def add(self, agent: str, usage: Dict[str, int]):
+        with self.lock:
+            _add(self.by_agent.setdefault(agent, _empty()), usage)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """{'total': {...}, 'by_agent': {...}}"""
+        with self.lock:
+            by_agent = {agent: dict(totals) for agent, totals in self.by_agent.items()}
+        total = _empty()
+        for totals in by_agent.values():
+            _add(total, totals)
+        return {'total': total, 'by_agent': by_agent}
+
+
+_page_usage: ContextVar[Optional[PageUsage]] = ContextVar('page_usage', default=None)
+
+
+def begin_page(usage: PageUsage):
+    """Attribute calls in this context to a page; returns a token for end_page()"""
+    return _page_usage.set(usage)
+
+
+def end_page(token):
+    _page_usage.reset(token)
+
+
+def current_page() -> Optional[PageUsage]:
+    return _page_usage.get()
+
+
+class UsageLedger:
+    """Every call of the run, aggregated by agent, pattern and model"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records: List[Dict[str, Any]] = []
+        self.by_page: Dict[str, List[Dict[str, Any]]] = {}
+        # Running totals by model, kept up to date so budget checks don't rescan the run
+        self.by_model: Dict[str, Dict[str, int]] = {}
+
+    def record(self, response, agent: str, model: str, seconds: float = 0.0) -> Dict[str, int]:
+        """Record one response's usage (and call latency) against the current page (if any)"""
+        usage = usage_from_response(response)
+        usage['seconds'] = round(seconds, 3)
+        page = current_page()
+        if page is not None:
+            page.add(agent, usage)
+        record = {
+            'agent': agent,
+            'model': model,
+            'pattern_id': page.pattern_id if page else None,
+            'page_id': page.page_id if page else None,
+            **usage
+        }
+        with self.lock:
+            self.records.append(record)
+            if record['page_id'] is not None:
+                self.by_page.setdefault(record['page_id'], []).append(record)
+            _add(self.by_model.setdefault(str(model), _empty()), usage)
+        return usage
+
+    def totals(self, by: str) -> Dict[str, Dict[str, int]]:
+        """Token totals grouped by 'agent', 'model', 'pattern_id' or 'page_id'"""
+        grouped: Dict[str, Dict[str, int]] = {}
+        with self.lock:
+            for record in self.records:
+                _add(grouped.setdefault(str(record[by]), _empty()), record)
+        return grouped
+
+    def model_totals(self) -> Dict[str, Dict[str, int]]:
+        """Token totals by model from the running totals (same as totals('model'), without a scan)"""
+        with self.lock:
+            return {model: dict(totals) for model, totals in self.by_model.items()}
+
+    def cost(self, prices: 'PriceTable', by: str) -> Dict[str, float]:
+        """Cost in USD grouped like totals() (each call priced at the model that served it)"""
+        grouped: Dict[str, float] = {}
+        with self.lock:
+            for record in self.records:
+                key = str(record[by])
+                grouped[key] = grouped.get(key, 0.0) + prices.cost(record['model'], record)
+        return grouped
+
+    def cost_for(self, prices: 'PriceTable', page_id: str) -> float:
+        """Cost in USD of one page's calls (indexed by page, not a scan of the run)"""
+        with self.lock:
+            records = list(self.by_page.get(page_id, ()))
+        return sum(prices.cost(record['model'], record) for record in records)
+
+    def reset(self):
+        with self.lock:
+            self.records = []
+            self.by_page = {}
+            self.by_model = {}
+
+
+USAGE = UsageLedger()
+
+
+class PriceTable:
+    """USD per million tokens per model (input, output, cached input)"""
+
+    def __init__(self, config: Dict = None):
+        config = config or {}
+        self.models = config.get('models', {})
+        self.default = config.get('default', {})
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PRICING_PATH) -> 'PriceTable':
+        """Prices from config/model_pricing.json (every call priced at zero if missing)"""
+        try:
+            with open(path, 'r') as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            print(f"  ⚠️ Could not load model pricing from {path}: {e}")
+            return cls()
+
+    def cost(self, model: str, usage: Dict[str, int]) -> float:
+        rates = self.models.get(model, self.default)
+        cached = usage.get('cached_tokens', 0)
+        uncached = max(usage.get('prompt_tokens', 0) - cached, 0)
+        return (
+            uncached * rates.get('input_per_million', 0.0)
+            + cached * rates.get('cached_input_per_million', rates.get('input_per_million', 0.0))
+            + usage.get('output_tokens', 0) * rates.get('output_per_million', 0.0)
+        ) / 1_000_000
+
+
+def print_summary(ledger: UsageLedger = None, prices: PriceTable = None, pages: int = 0):
+    """Token and cost table by agent (highest cost first), plus totals per page"""
+    ledger = ledger or USAGE
+    prices = prices or PriceTable.load()
+    totals = ledger.totals('agent')
+    if not totals:
+        return
+    costs = ledger.cost(prices, 'agent')
+    print("\n💰 Token usage by agent:")
+    for agent in sorted(totals, key=lambda a: (costs.get(a, 0.0), totals[a]['prompt_tokens']), reverse=True):
+        t = totals[agent]
+        print(f"  {agent:<20} {t['calls']:>5} calls  {t['prompt_tokens']:>10,} in  "
+              f"{t['output_tokens']:>9,} out  {t['cached_tokens']:>9,} cached  ${costs.get(agent, 0.0):.4f}")
+    grand = _empty()
+    for t in totals.values():
+        _add(grand, t)
+    total_cost = sum(costs.values())
+    print(f"  {'TOTAL':<20} {grand['calls']:>5} calls  {grand['prompt_tokens']:>10,} in  "
+          f"{grand['output_tokens']:>9,} out  {grand['cached_tokens']:>9,} cached  ${total_cost:.4f}")
+    if pages:
+        print(f"  Per page: {(grand['prompt_tokens'] + grand['output_tokens']) / pages:,.0f} tokens, "
+              f"${total_cost / pages:.4f}")
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+WordPress Publisher
+Streams generated pages to the WordPress REST API
+
+Pages (PageOutput.to_dict_public()) are queued as they finish generating and
+sent in batches through the WordPress batch endpoint (/wp-json/batch/v1) over a
+pooled keep-alive session. Upserts are idempotent: each attempt looks up
+existing posts by slug (derived from url_slug) and updates them instead of
+creating duplicates. 429 and 5xx responses are retried with backoff (or the
+server's Retry-After, whichever is longer).
+
+Authentication uses a WordPress Application Password.
+
+Schema markup is sent as the pseo_json_ld post meta (a ready-to-print
+<script type="application/ld+json"> block), not in the post content:
+WordPress strips <script> from content unless the user has the
+unfiltered_html capability. Like the other pseo_* keys, the meta must be
+registered with show_in_rest, and the theme prints it in wp_head.
+"""
+
+import time
+import threading
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.html_renderer import StaticSiteRenderer
+
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# WordPress default limit for /batch/v1 requests
+MAX_BATCH_SIZE = 25
+
+
+class WordPressPublisher:
+    """Publishes pages to WordPress with pooled connections and batched upserts"""
+
+    def __init__(self, base_url: str, username: str, app_password: str,
+                 renderer: StaticSiteRenderer, post_type: str = 'pages',
+                 status: str = 'draft', batch_size: int = 10,
+                 max_concurrency: int = 4, max_retries: int = 5,
+                 backoff_seconds: float = 1.0, timeout: float = 30.0,
+                 use_batch_api: bool = True):
+        """
+        Initialize publisher
+
+        Args:
+            base_url: WordPress site URL (e.g. https://sozee.ai)
+            username: WordPress user for the application password
+            app_password: WordPress Application Password
+            renderer: StaticSiteRenderer used to build post content
+            post_type: REST collection to publish into ('pages' or 'posts')
+            status: Post status for published pages (draft, publish, ...)
+            batch_size: Pages per batch request (max 25)
+            max_concurrency: Batch requests in flight at once
+            max_retries: Attempts per batch for 429/5xx responses
+            backoff_seconds: Base delay for exponential backoff
+            timeout: Per-request timeout in seconds
+            use_batch_api: Use /batch/v1 (WordPress 5.6+); otherwise one request per page
+        """
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+
+        self.api_root = f"{base_url.rstrip('/')}/wp-json"
+        self.renderer = renderer
+        self.post_type = post_type
+        self.status = status
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+        self.use_batch_api = use_batch_api
+
+        # One keep-alive pool shared by all worker threads
+        self.session = requests.Session()
+        self.session.auth = (username, app_password)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='wp-publish')
+        # Bounds queued batches so a fast generator can't buffer unbounded work
+        self.slots = threading.BoundedSemaphore(max_concurrency * 2)
+
+        # Longest Retry-After seen by this worker thread during the current attempt
+        self.local = threading.local()
+
+        self.pending = []
+        self.futures = []
+        self.lock = threading.Lock()
+        self.results = {'created': 0, 'updated': 0, 'failed': []}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, page: Dict):
+        """
+        Queue a page for publishing; sends a batch once batch_size pages are pending
+
+        Args:
+            page: Page dict from PageOutput.to_dict_public()
+        """
+        with self.lock:
+            self.pending.append(page)
+            if len(self.pending) < self.batch_size:
+                return
+            batch, self.pending = self.pending, []
+
+        self._dispatch(batch)
+
+    def flush(self):
+        """Send any partially filled batch"""
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if batch:
+            self._dispatch(batch)
+
+    def close(self) -> Dict:
+        """
+        Flush, wait for all in-flight batches and release connections
+
+        Returns:
+            Summary dict: {'created': int, 'updated': int, 'failed': [...]}
+        """
+        self.flush()
+        for future in self.futures:
+            future.result()
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+        print(f"  ✓ WordPress publish: {self.results['created']} created, "
+              f"{self.results['updated']} updated, {len(self.results['failed'])} failed")
+        return self.results
+
+    def publish(self, pages: List[Dict]) -> Dict:
+        """Publish a list of pages and wait for completion"""
+        for page in pages:
+            self.submit(page)
+        return self.close()
+
+    def _dispatch(self, batch: List[Dict]):
+        """Hand a batch to the worker pool (blocks when too many batches are queued)"""
+        self.slots.acquire()
+        future = self.executor.submit(self._publish_batch_safely, batch)
+        future.add_done_callback(lambda _: self.slots.release())
+        self.futures.append(future)
+
+    def _publish_batch_safely(self, batch: List[Dict]):
+        try:
+            self._publish_batch(batch)
+        except Exception as e:
+            print(f"  ❌ WordPress batch failed: {e}")
+            self._record_failures(batch, str(e))
+
+    def _publish_batch(self, batch: List[Dict]):
+        """Upsert a batch, retrying only the pages that hit 429/5xx"""
+        remaining = {self._wp_slug(page): page for page in batch}
+
+        for attempt in range(self.max_retries):
+            self.local.retry_after = 0.0
+            # Re-resolve IDs every attempt so a create that landed before a
+            # failed response is updated, not duplicated
+            existing_ids = self._lookup_ids(list(remaining))
+
+            if existing_ids is None:
+                outcomes = {slug: (503, 'Slug lookup unavailable') for slug in remaining}
+            elif self.use_batch_api:
+                outcomes = self._send_batch(remaining, existing_ids)
+            else:
+                outcomes = {slug: self._send_single(page, existing_ids.get(slug))
+                            for slug, page in remaining.items()}
+
+            retry = {}
+            for slug, (status_code, error) in outcomes.items():
+                if status_code in (200, 201):
+                    with self.lock:
+                        self.results['updated' if slug in existing_ids else 'created'] += 1
+                elif status_code in RETRYABLE_STATUS:
+                    retry[slug] = remaining[slug]
+                else:
+                    self._record_failures([remaining[slug]], f"HTTP {status_code}: {error}")
+
+            if not retry:
+                return
+
+            remaining = retry
+            if attempt < self.max_retries - 1:
+                delay = max(self.local.retry_after, self.backoff_seconds * (2 ** attempt))
+                print(f"  ⚠️ WordPress returned 429/5xx for {len(retry)} pages, retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        self._record_failures(list(remaining.values()), "Retries exhausted")
+
+    def _lookup_ids(self, slugs: List[str]) -> Optional[Dict[str, int]]:
+        """Find existing post IDs for slugs (any status); None if WordPress is throttling"""
+        response = self._request('GET', f"{self.api_root}/wp/v2/{self.post_type}", params={
+            'slug': ','.join(slugs),
+            'status': 'any',
+            'per_page': 100,
+            '_fields': 'id,slug'
+        })
+        if response.status_code in RETRYABLE_STATUS:
+            return None
+        response.raise_for_status()
+        return {item['slug']: item['id'] for item in response.json()}
+
+    def _send_batch(self, pages: Dict[str, Dict], existing_ids: Dict[str, int]) -> Dict[str, tuple]:
+        """Send one /batch/v1 request; returns slug → (status_code, error)"""
+        slugs = list(pages)
+        requests_payload = []
+        for slug in slugs:
+            post_id = existing_ids.get(slug)
+            path = f"/wp/v2/{self.post_type}/{post_id}" if post_id else f"/wp/v2/{self.post_type}"
+            requests_payload.append({'method': 'POST', 'path': path, 'body': self._build_post(pages[slug])})
+
+        response = self._request('POST', f"{self.api_root}/batch/v1", json={'requests': requests_payload})
+        if response.status_code in RETRYABLE_STATUS:
+            return {slug: (response.status_code, response.text[:200]) for slug in slugs}
+        response.raise_for_status()
+
+        outcomes = {}
+        for slug, item in zip(slugs, response.json().get('responses', [])):
+            body = item.get('body', {})
+            error = body.get('message', '') if isinstance(body, dict) else ''
+            outcomes[slug] = (item.get('status'), error)
+        return outcomes
+
+    def _send_single(self, page: Dict, post_id: Optional[int]) -> tuple:
+        """Create or update one post; returns (status_code, error)"""
+        url = f"{self.api_root}/wp/v2/{self.post_type}"
+        if post_id:
+            url = f"{url}/{post_id}"
+
+        response = self._request('POST', url, json=self._build_post(page))
+        return response.status_code, '' if response.ok else response.text[:200]
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Issue a request on the pooled session, noting Retry-After on 429/503 for the retry delay"""
+        response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        retry_after = response.headers.get('Retry-After')
+        if response.status_code in (429, 503) and retry_after and retry_after.isdigit():
+            self.local.retry_after = max(getattr(self.local, 'retry_after', 0.0), min(int(retry_after), 60))
+        return response
+
+    def _build_post(self, page: Dict) -> Dict:
+        """Map a page dict to a WordPress post body"""
+        return {
+            'title': page.get('post_title', ''),
+            'slug': self._wp_slug(page),
+            'status': self.status,
+            'content': self.renderer.render_content(page),
+            'excerpt': page.get('meta_description', ''),
+            'meta': {
+                'pseo_page_id': page.get('page_id', ''),
+                'pseo_meta_title': page.get('meta_title', ''),
+                'pseo_meta_description': page.get('meta_description', ''),
+                'pseo_json_ld': self.renderer.render_json_ld(page)
+            }
+        }
+
+    def _wp_slug(self, page: Dict) -> str:
+        """WordPress slugs are single path segments"""
+        return page.get('url_slug', '').strip('/').replace('/', '-')
+
+    def _record_failures(self, pages: List[Dict], error: str):
+        with self.lock:
+            for page in pages:
+                self.results['failed'].append({
+                    'page_id': page.get('page_id'),
+                    'url_slug': page.get('url_slug'),
+                    'error': error
+                })